@@ -0,0 +1,248 @@
+"""Ingest benchmark for the Torque OBD-II integration.
+
+Drives synthetic Torque sessions through ``TorqueView._handle_request`` and
+reports throughput, per-request latency and state writes per push.  Each
+vehicle starts with the name/unit burst Torque sends when logging starts
+(see tests/example-payload-data.md) followed by value pushes carrying every
+PID of the session.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_ingest
+    python -m benchmarks.bench_ingest --pids 100 --vehicles 10 --pushes 20
+    python -m benchmarks.bench_ingest --output bench_output.txt
+
+One JSON object is printed per matrix cell.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Iterator
+import itertools
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+from typing import Any
+
+from custom_components.torque_obd import TorqueView, async_register_pid_listener
+from custom_components.torque_obd.const import DOMAIN, SENSOR_DEFINITIONS
+from custom_components.torque_obd.ingest import TorquePayloadWatermark
+from custom_components.torque_obd.metrics import TorqueIngestMetrics
+
+DEFAULT_PIDS = (10, 100, 1000)
+DEFAULT_VEHICLES = (1, 10, 100)
+DEFAULT_PUSHES = 20
+
+EMAIL = "user@example.com"
+SESSION = "1760720540354"
+
+
+class _BenchHass:
+    """The parts of HomeAssistant the ingest path touches."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+
+    async def async_add_executor_job(self, target: Any, *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+    def verify_event_loop_thread(self, what: str) -> None:
+        """Everything runs on the benchmark's own event loop."""
+
+
+class _ErrorCounter(logging.Handler):
+    """Count the errors the integration logs while a benchmark runs.
+
+    ``TorqueView`` answers Torque even when processing fails, so without
+    this a broken ingest path would be timed as if it worked.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(logging.ERROR)
+        self.errors: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.errors.append(record.getMessage())
+
+    def __enter__(self) -> _ErrorCounter:
+        logging.getLogger("custom_components.torque_obd").addHandler(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        logging.getLogger("custom_components.torque_obd").removeHandler(self)
+
+    def raise_for_errors(self) -> None:
+        """Fail the run if the ingest path logged any error."""
+        if self.errors:
+            raise RuntimeError(
+                f"Ingest logged {len(self.errors)} error(s), first: {self.errors[0]}"
+            )
+
+
+class _BenchRequest:
+    """The parts of an aiohttp POST request ``TorqueView`` reads."""
+
+    method = "POST"
+    content_length = None
+    query_string = ""
+
+    def __init__(self, path: str, payload: dict[str, Any]) -> None:
+        self.path = path
+        self._payload = payload
+
+    async def post(self) -> dict[str, Any]:
+        return self._payload
+
+
+def _pid_keys(count: int) -> list[str]:
+    """Return ``count`` distinct Torque PIDs (standard first, then ff12xx)."""
+    pids = [f"{pid:02x}" for pid in range(min(count, 256))]
+    pids.extend(f"ff{0x1200 + pid:04x}" for pid in range(count - len(pids)))
+    return pids
+
+
+def session_payloads(
+    vehicle: int, pid_count: int, pushes: int, seed: int = 0
+) -> Iterator[dict[str, Any]]:
+    """Yield the payloads of one synthetic Torque logging session."""
+    rng = random.Random(seed + vehicle)
+    pids = _pid_keys(pid_count)
+    device_id = f"{vehicle:032x}"
+    start = 1760720563501
+    base = {"eml": EMAIL, "v": "9", "session": SESSION, "id": device_id}
+
+    # Session start: default units, then user names and units
+    yield {**base, "time": str(start), **{f"defaultUnit{pid}": "km/h" for pid in pids}}
+    names: dict[str, Any] = {**base, "time": str(start)}
+    for pid in pids:
+        names[f"userUnit{pid}"] = "km/h"
+        names[f"userShortName{pid}"] = f"P{pid}"
+        names[f"userFullName{pid}"] = f"Synthetic PID {pid}"
+    yield names
+
+    # Value pushes: every PID of the session, drifting a little each time
+    values = {pid: rng.uniform(0, 100) for pid in pids}
+    for push in range(pushes):
+        payload: dict[str, Any] = {**base, "time": str(start + 1000 * (push + 1))}
+        for pid in pids:
+            values[pid] += rng.uniform(-1, 1)
+            payload[f"k{pid}"] = f"{values[pid]:.2f}"
+        yield payload
+
+
+def setup_vehicles(vehicles: int) -> tuple[TorqueView, dict[str, int]]:
+    """Create a view with ``vehicles`` entries whose sensors count writes."""
+    hass = _BenchHass()
+    domain_data: dict[str, Any] = {
+        "sensor_definitions": dict(SENSOR_DEFINITIONS),
+        "routes": {},
+    }
+    hass.data[DOMAIN] = domain_data
+    counters = {"writes": 0, "sensors": 0}
+
+    def _count_write() -> None:
+        counters["writes"] += 1
+
+    def _platform(entry_id: str) -> Any:
+        """Stand-in for the entity platform: attach and register listeners."""
+
+        def _add_entities(entities: list[Any], update_before_add: bool = False) -> None:
+            for entity in entities:
+                entity.async_write_ha_state = _count_write
+                entity._metrics = domain_data[entry_id]["metrics"]
+                async_register_pid_listener(
+                    hass, entry_id, entity._lookup_keys, entity._handle_update
+                )
+            counters["sensors"] += len(entities)
+
+        return _add_entities
+
+    for vehicle in range(vehicles):
+        entry_id = f"bench_{vehicle}"
+        domain_data["routes"][f"vehicle-{vehicle}"] = entry_id
+        domain_data[entry_id] = {
+            "email": EMAIL,
+            "vehicle_name": f"Vehicle {vehicle}",
+            "slug": f"vehicle-{vehicle}",
+            "api_path": f"/api/torque-vehicle-{vehicle}",
+            "metrics": TorqueIngestMetrics(),
+            "watermark": TorquePayloadWatermark(f"Vehicle {vehicle}"),
+            "data": {},
+            "added_sensors": set(),
+            "pid_listeners": {},
+            "replay_buffer": {},
+            "async_add_entities": _platform(entry_id),
+            # No GPS PIDs are generated, so the tracker platform is never needed
+            "async_add_tracker": None,
+        }
+    return TorqueView(hass), counters
+
+
+async def _run_cell(pid_count: int, vehicles: int, pushes: int) -> dict[str, Any]:
+    """Benchmark one (PIDs, vehicles) combination."""
+    view, counters = setup_vehicles(vehicles)
+    # Interleave the vehicles' sessions push by push
+    streams = [
+        [(f"vehicle-{vehicle}", payload) for payload in session_payloads(vehicle, pid_count, pushes)]
+        for vehicle in range(vehicles)
+    ]
+    requests = [
+        (slug, _BenchRequest(f"/api/torque-{slug}", payload))
+        for batch in itertools.zip_longest(*streams)
+        for slug, payload in filter(None, batch)
+    ]
+
+    latencies: list[float] = []
+    with _ErrorCounter() as error_counter:
+        started = time.perf_counter()
+        for slug, request in requests:
+            request_started = time.perf_counter()
+            await view._handle_request(request, slug)
+            latencies.append(time.perf_counter() - request_started)
+        elapsed = time.perf_counter() - started
+    error_counter.raise_for_errors()
+    if not counters["writes"]:
+        raise RuntimeError("No sensor state was written, the ingest path did not run")
+
+    value_pushes = vehicles * pushes
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "pids": pid_count,
+        "vehicles": vehicles,
+        "requests": len(requests),
+        "requests_per_s": round(len(requests) / elapsed, 1),
+        "latency_p50_ms": round(quantiles[49] * 1000, 3),
+        "latency_p99_ms": round(quantiles[98] * 1000, 3),
+        "sensors": counters["sensors"],
+        "state_writes_per_push": round(counters["writes"] / value_pushes, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--pids", type=int, nargs="+", default=list(DEFAULT_PIDS))
+    parser.add_argument("--vehicles", type=int, nargs="+", default=list(DEFAULT_VEHICLES))
+    parser.add_argument("--pushes", type=int, default=DEFAULT_PUSHES, help="value pushes per vehicle")
+    parser.add_argument("--output", help="also append the JSON lines to this file")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, "a", encoding="utf-8") if args.output else None
+    try:
+        for pid_count in args.pids:
+            for vehicles in args.vehicles:
+                line = json.dumps(asyncio.run(_run_cell(pid_count, vehicles, args.pushes)))
+                print(line, flush=True)
+                if output is not None:
+                    output.write(line + "\n")
+    finally:
+        if output is not None:
+            output.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,44 @@
+"""Replay a Torque capture through the ingest pipeline outside Home Assistant.
+
+Test-harness counterpart of the ``torque_obd.replay`` service: the payloads
+of a JSON-lines capture (or a ``.gz`` session log) are fed through the
+ingest path of one synthetic vehicle, and the throughput and entity state
+writes are printed as JSON.
+
+Run from the repository root::
+
+    python -m benchmarks.replay drive.jsonl            # as fast as possible
+    python -m benchmarks.replay drive.jsonl --speed 10  # 10x the original timing
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any
+
+from benchmarks.bench_ingest import setup_vehicles
+from custom_components.torque_obd.replay import async_replay_file
+
+
+async def async_replay(path: str, speed: float) -> dict[str, Any]:
+    """Replay ``path`` for one vehicle and return the result."""
+    view, counters = setup_vehicles(1)
+    result = await async_replay_file(view.hass, view, "bench_0", path, speed)
+    return {**result.as_dict(), "sensors": counters["sensors"]}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("file", help="JSON-lines capture or .gz session log")
+    parser.add_argument(
+        "--speed", type=float, default=0, help="1 = original timing, N = N times faster, 0 = as fast as possible"
+    )
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(async_replay(args.file, args.speed))))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,27 +1,91 @@
 """The Torque OBD-II integration."""
 from __future__ import annotations
 
+from collections import deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, partial
+from http import HTTPStatus
 import logging
+import time
+from types import MappingProxyType
 from typing import Any
 
 from aiohttp import web
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY, ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import config_validation as cv
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, discovery_flow
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.typing import ConfigType
 
 from .const import (
     ATTRIBUTE_FIELDS,
+    CONF_DEVICE_ID,
     CONF_EMAIL,
+    CONF_EXPRESSION,
+    CONF_FLEET_MODE,
+    CONF_MAX_FLUSH_RATE,
+    CONF_RECORD_SESSIONS,
+    CONF_STATE_FLUSH_INTERVAL,
+    CONF_STATISTICS_ONLY,
     CONF_VEHICLE_NAME,
+    DEFAULT_FLEET_MODE,
+    DEFAULT_MAX_FLUSH_RATE,
+    DEFAULT_RECORD_SESSIONS,
+    DEFAULT_STATE_FLUSH_INTERVAL,
+    DEFAULT_STATISTICS_ONLY,
+    DIAGNOSTICS_PAYLOAD_COUNT,
+    DISCOVERY_DEBOUNCE,
     DOMAIN,
+    HISTORY_SIZE,
+    HISTORY_WINDOW,
+    FLEET_API_PATH,
+    FLEET_PROVISION_INTERVAL,
+    GPS_ACCURACY_PID,
+    GPS_ALTITUDE_PID,
+    GPS_BEARING_PID,
     GPS_LATITUDE_PID,
     GPS_LONGITUDE_PID,
+    GPS_SPEED_PID,
+    INGEST_QUEUE_SIZE,
     METADATA_FIELD_PREFIXES,
+    METRICS_PUBLISH_INTERVAL,
+    SESSION_LOG_DIRECTORY,
+    SESSION_LOG_FLUSH_BATCH,
+    SESSION_LOG_FLUSH_INTERVAL,
+    SESSION_LOG_MAX_FILE_SIZE,
+    STATISTICS_PUSH_INTERVAL,
+    TRIP_CHECK_INTERVAL,
+    TRIP_IDLE_TIMEOUT,
+    TRACK_LOG_IMPORT_DIRECTORY,
+    TRACK_LOG_SCAN_INTERVAL,
     load_sensor_definitions,
 )
+from .derived import TorqueDerivedSensors
+from .fleet import TorqueFleetIndex, fleet_vehicle_name
+from .history import TorqueHistory
+from .ingest import TorqueIngestQueue, TorquePayloadWatermark
+from .long_term_statistics import (
+    TorqueStatisticsAggregator,
+    async_remove_statistics_store,
+)
+from .metrics import TorqueIngestMetrics
+from .services import async_setup_services
+from .session_log import TorqueSessionRecorder
+from .state_flush import TorqueStateFlusher, TorqueTimerWheel
+from .track_log import TorqueTrackLogImporter
+from .trip_summary import TorqueTripSummarizer
+from .value_types import TorqueValueParser, parse_value
+from .websocket import (
+    TorqueSubscription,
+    async_end_subscriptions,
+    async_setup_websocket,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,6 +96,51 @@ CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 # Standard OBD-II PIDs (0x00-0xFF) use 2 hex digits
 STANDARD_PID_HEX_LENGTH = 2
 
+# Payload key kinds returned by _classify_key
+KEY_KIND_DATA = "data"  # k{PID} sensor value
+KEY_KIND_GPS = "gps"  # k{PID} sensor value that also feeds the device tracker
+KEY_KIND_NAME = "name"  # userFullName{PID} / userShortName{PID}
+KEY_KIND_METADATA = "metadata"  # profile*, userUnit*, defaultUnit*
+KEY_KIND_ATTRIBUTE = "attribute"  # eml, time, session, id, v
+KEY_KIND_OTHER = "other"
+
+# Key kinds that carry a sensor value
+SENSOR_KEY_KINDS = frozenset({KEY_KIND_DATA, KEY_KIND_GPS})
+
+# Upper bound on remembered payload keys so junk keys cannot grow the cache
+KEY_CLASSIFIER_CACHE_SIZE = 4096
+
+# Payload contexts remembered by (session, device id, time), enough for the
+# latest upload of many vehicles pushing at once
+PAYLOAD_CONTEXT_CACHE_SIZE = 64
+
+# Upper bound on remembered payload key-sets per vehicle (oldest evicted first)
+MAX_KEY_SIGNATURES = 64
+
+# Upper bound on buffered values for sensors that are not added yet
+MAX_REPLAY_VALUES = 512
+
+# One shared view serves every vehicle; the slug is resolved through
+# hass.data[DOMAIN]["routes"] so unloading an entry never leaks a route.
+API_PATH_PREFIX = "/api/torque-"
+
+_GPS_PIDS = frozenset(
+    {
+        GPS_LATITUDE_PID,
+        GPS_LONGITUDE_PID,
+        GPS_ACCURACY_PID,
+        GPS_BEARING_PID,
+        GPS_ALTITUDE_PID,
+        GPS_SPEED_PID,
+    }
+)
+
+# Name prefixes mapped to the sensor_names field they populate
+_NAME_FIELD_PREFIXES = (
+    ("userFullName", "full_name"),
+    ("userShortName", "short_name"),
+)
+
 
 def _normalize_pid(pid: str) -> str:
     """Normalize PID format to ensure consistent format with leading zeros.
@@ -78,6 +187,127 @@ def _normalize_pid(pid: str) -> str:
     return f"k{hex_part}"
 
 
+@dataclass(frozen=True, slots=True)
+class PayloadKey:
+    """Precomputed classification of a raw Torque payload key."""
+
+    kind: str
+    pid: str | None = None
+    lookup_keys: tuple[str, ...] = ()
+    name_field: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class PayloadContext:
+    """Attributes shared by every sensor updated from one payload.
+
+    ``attributes`` is a read-only mapping that the sensors use as their
+    extra state attributes as-is, so a push with hundreds of PIDs builds a
+    single timestamp string and attributes mapping instead of one per sensor.
+    """
+
+    session: str | None
+    device_id: str | None
+    timestamp: datetime
+    attributes: Mapping[str, Any]
+
+
+def _build_payload_context(
+    session: str | None, device_id: str | None, timestamp: datetime
+) -> PayloadContext:
+    """Build the context of a payload."""
+    attributes: dict[str, Any] = {"last_update": timestamp.isoformat()}
+    if session is not None:
+        attributes["session"] = session
+    if device_id is not None:
+        attributes["device_id"] = device_id
+    return PayloadContext(session, device_id, timestamp, MappingProxyType(attributes))
+
+
+@lru_cache(maxsize=PAYLOAD_CONTEXT_CACHE_SIZE)
+def _timed_payload_context(
+    session: str | None, device_id: str | None, torque_time: str
+) -> PayloadContext | None:
+    """Build the context of a payload with a Torque ``time`` (ms since epoch)."""
+    # 14 digits reach far beyond any real clock but stay within datetime
+    if not torque_time.isdecimal() or len(torque_time) > 14:
+        return None
+    timestamp = datetime.fromtimestamp(int(torque_time) / 1000, timezone.utc)
+    return _build_payload_context(session, device_id, timestamp)
+
+
+def _payload_context(data_dict: Mapping[str, Any]) -> PayloadContext:
+    """Return the context of a payload.
+
+    ``_process_payload`` calls this once per payload and stores the result
+    as the entry's ``context``, which every sensor of the payload reads.
+    The timestamp is Torque's ``time`` field and contexts are cached by it,
+    so updates from outside the ingest stage reuse the payload's context;
+    payloads without a valid ``time`` are stamped with the current time.
+    """
+    session = data_dict.get("session")
+    device_id = data_dict.get("id")
+    torque_time = data_dict.get("time")
+    if isinstance(torque_time, str) and (
+        context := _timed_payload_context(session, device_id, torque_time)
+    ) is not None:
+        return context
+    return _build_payload_context(session, device_id, datetime.now(timezone.utc))
+
+
+def _pid_lookup_keys(key: str, normalized_key: str) -> tuple[str, ...]:
+    """Build the payload aliases of a PID (e.g. ``kd`` and ``k0d``)."""
+    lookup_keys = [key]
+
+    if normalized_key not in lookup_keys:
+        lookup_keys.append(normalized_key)
+
+    if normalized_key.startswith("k0") and len(normalized_key) == 3:
+        short_key = f"k{normalized_key[2:]}"
+        if short_key not in lookup_keys:
+            lookup_keys.append(short_key)
+
+    return tuple(lookup_keys)
+
+
+@lru_cache(maxsize=KEY_CLASSIFIER_CACHE_SIZE)
+def _classify_key(key: str) -> PayloadKey:
+    """Classify a payload key once and remember the result.
+
+    Torque sends the same few hundred keys on every push, so the prefix scans
+    and PID normalization are only paid the first time a key is seen.  The
+    LRU bound keeps junk keys from growing the cache without limit.
+    """
+    if key in ATTRIBUTE_FIELDS:
+        return PayloadKey(KEY_KIND_ATTRIBUTE, lookup_keys=(key,))
+
+    for prefix, name_field in _NAME_FIELD_PREFIXES:
+        if key.startswith(prefix):
+            pid = key[len(prefix):]
+            if not pid:
+                return PayloadKey(KEY_KIND_METADATA, lookup_keys=(key,))
+            return PayloadKey(
+                KEY_KIND_NAME,
+                pid=_normalize_pid("k" + pid),
+                lookup_keys=(key,),
+                name_field=name_field,
+            )
+
+    for prefix in METADATA_FIELD_PREFIXES:
+        if key.startswith(prefix):
+            return PayloadKey(KEY_KIND_METADATA, lookup_keys=(key,))
+
+    if key.startswith("k"):
+        normalized_key = _normalize_pid(key)
+        return PayloadKey(
+            KEY_KIND_GPS if normalized_key in _GPS_PIDS else KEY_KIND_DATA,
+            pid=normalized_key,
+            lookup_keys=_pid_lookup_keys(key, normalized_key),
+        )
+
+    return PayloadKey(KEY_KIND_OTHER, lookup_keys=(key,))
+
+
 def _extract_name_from_value(value: Any) -> str | None:
     """Extract name from value, handling arrays and strings.
     
@@ -94,6 +324,130 @@ def _extract_name_from_value(value: Any) -> str | None:
     return None
 
 
+@callback
+def async_register_pid_listener(
+    hass: HomeAssistant,
+    entry_id: str,
+    lookup_keys: tuple[str, ...],
+    listener: Callable[[dict[str, Any]], None],
+) -> CALLBACK_TYPE:
+    """Route pushes containing any of ``lookup_keys`` to ``listener``.
+
+    Every payload key a listener cares about is indexed in the entry's
+    ``pid_listeners`` dict, so a push only touches the listeners whose keys
+    are actually present instead of broadcasting to every sensor.
+
+    Returns a callback that removes the listener from the index again.
+    """
+    entry_data = hass.data.setdefault(DOMAIN, {}).setdefault(entry_id, {})
+    pid_listeners: dict[str, list[Callable[[dict[str, Any]], None]]] = (
+        entry_data.setdefault("pid_listeners", {})
+    )
+    for key in lookup_keys:
+        pid_listeners.setdefault(key, []).append(listener)
+
+    # Replay values that arrived before the listener's entity was added
+    replay_buffer: dict[str, Any] = entry_data.get("replay_buffer", {})
+    if replay_buffer:
+        replay = {key: replay_buffer.pop(key) for key in lookup_keys if key in replay_buffer}
+        if replay:
+            latest = entry_data.get("data", {})
+            payload = {field: latest[field] for field in ("session", "id", "time") if field in latest}
+            payload.update(replay)
+            _LOGGER.debug("Replaying buffered value(s) for payload key(s) %s", list(replay))
+            try:
+                listener(payload)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error replaying buffered values for %s", list(replay))
+
+    @callback
+    def _async_remove_listener() -> None:
+        """Remove the listener from the routing index."""
+        for key in lookup_keys:
+            listeners = pid_listeners.get(key)
+            if listeners is None or listener not in listeners:
+                continue
+            listeners.remove(listener)
+            if not listeners:
+                del pid_listeners[key]
+
+    return _async_remove_listener
+
+
+def _numeric_pid_values(data_dict: dict[str, Any]) -> dict[str, float]:
+    """Return the finite numeric PID values of a payload by normalized PID."""
+    values: dict[str, float] = {}
+    for key, value in data_dict.items():
+        record = _classify_key(key)
+        if record.kind != KEY_KIND_DATA:
+            continue
+        if type(number := parse_value(value)) is float:
+            values[record.pid] = number
+    return values
+
+
+def _parse_payload(
+    value_parser: TorqueValueParser, data_dict: dict[str, Any]
+) -> tuple[dict[str, Any], dict[str, float]]:
+    """Parse the PID values of a payload once, with each PID's converter.
+
+    Returns a copy of the payload with typed PID values (everything else is
+    left as sent) and its finite numeric PID values by normalized PID.
+    """
+    parsed = dict(data_dict)
+    values: dict[str, float] = {}
+    for key, value in data_dict.items():
+        record = _classify_key(key)
+        if record.kind not in SENSOR_KEY_KINDS:
+            continue
+        parsed[key] = typed = value_parser.parse(record.pid, value)
+        if record.kind == KEY_KIND_DATA and type(typed) is float:
+            values[record.pid] = typed
+    return parsed, values
+
+
+@callback
+def _dispatch_pid_updates(
+    pid_listeners: dict[str, list[Callable[[dict[str, Any]], None]]],
+    data_dict: dict[str, Any],
+    replay_buffer: dict[str, Any] | None = None,
+) -> int:
+    """Notify the listeners indexed for the keys present in the payload.
+
+    A listener registered under several aliases (e.g. ``kd`` and ``k0d``) is
+    only called once per push.  Sensor values nobody listens to yet are kept
+    in ``replay_buffer`` (latest value wins) so they can be replayed when the
+    sensor is added.  Returns the number of listeners notified.
+    """
+    notified: set[Callable[[dict[str, Any]], None]] = set()
+    for key in data_dict:
+        listeners = pid_listeners.get(key)
+        if not listeners:
+            if (
+                replay_buffer is not None
+                and _classify_key(key).kind in SENSOR_KEY_KINDS
+                and (key in replay_buffer or len(replay_buffer) < MAX_REPLAY_VALUES)
+            ):
+                replay_buffer[key] = data_dict[key]
+            continue
+        for listener in listeners:
+            if listener in notified:
+                continue
+            notified.add(listener)
+            try:
+                listener(data_dict)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error dispatching update for payload key '%s'", key)
+    return len(notified)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Torque OBD-II services and WebSocket commands."""
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Torque OBD-II from a config entry."""
     hass.data.setdefault(DOMAIN, {})
@@ -111,7 +465,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     url_safe_name = vehicle_name.lower().replace(' ', '-')
     url_safe_name = ''.join(c for c in url_safe_name if c.isalnum() or c in '-_')
-    api_path = f"/api/torque-{url_safe_name}"
+    api_path = f"{API_PATH_PREFIX}{url_safe_name}"
+
+    routes: dict[str, str] = hass.data[DOMAIN].setdefault("routes", {})
+    if routes.get(url_safe_name, entry.entry_id) != entry.entry_id:
+        _LOGGER.error(
+            "Cannot set up vehicle '%s': endpoint %s is already used by another vehicle",
+            vehicle_name,
+            api_path,
+        )
+        return False
     
     # --- RECUPERO SENSORI ESISTENTI AL RIAVVIO (AGGIUNTO PER LA PR) ---
     from homeassistant.helpers import entity_registry as er
@@ -139,17 +502,201 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "api_path": api_path,
         "data": {},
         "added_sensors": existing_pids, # Passiamo subito i PID storici invece di un set() vuoto
+        "pid_listeners": {},
+        "replay_buffer": {},
+        # (received timestamp, payload) references for the diagnostics download
+        "recent_payloads": deque(maxlen=DIAGNOSTICS_PAYLOAD_COUNT),
     }
 
-    hass.http.register_view(TorqueView(hass, entry.entry_id, api_path))
+    # aiohttp routes cannot be removed, so the view is registered only once
+    # and vehicles are added to / removed from its routing table instead.
+    view: TorqueView | None = hass.data[DOMAIN].get("view")
+    if view is None:
+        view = TorqueView(hass)
+        hass.http.register_view(view)
+        hass.data[DOMAIN]["view"] = view
+    routes[url_safe_name] = entry.entry_id
+    hass.data[DOMAIN][entry.entry_id]["slug"] = url_safe_name
     _LOGGER.info("Registered HTTP endpoint for '%s' at %s", vehicle_name, api_path)
 
+    # Index this vehicle's device id / email so its phone can move to the
+    # shared fleet endpoint once fleet mode is enabled.
+    fleet_index: TorqueFleetIndex | None = hass.data[DOMAIN].get("fleet_index")
+    if fleet_index is None:
+        fleet_index = TorqueFleetIndex(hass)
+        hass.data[DOMAIN]["fleet_index"] = fleet_index
+        await fleet_index.async_load()
+    fleet_index.async_learn(
+        entry.entry_id,
+        entry.data.get(CONF_DEVICE_ID),
+        entry.data.get(CONF_EMAIL) or None,
+    )
+
+    # Fleet mode is opt-in: the fleet endpoint is unauthenticated and creates
+    # vehicles for unknown phones, so it only answers while a vehicle enables it
+    if entry.options.get(CONF_FLEET_MODE, DEFAULT_FLEET_MODE):
+        fleet_entries: set[str] = hass.data[DOMAIN].setdefault("fleet_entries", set())
+        fleet_entries.add(entry.entry_id)
+        entry.async_on_unload(partial(fleet_entries.discard, entry.entry_id))
+        if hass.data[DOMAIN].get("fleet_view") is None:
+            fleet_view = TorqueFleetView(hass)
+            hass.http.register_view(fleet_view)
+            hass.data[DOMAIN]["fleet_view"] = fleet_view
+            _LOGGER.info("Registered fleet HTTP endpoint at %s", FLEET_API_PATH)
+
+    # Uploads are queued by the view and processed by one worker per vehicle
+    ingest_queue = TorqueIngestQueue(
+        vehicle_name,
+        partial(view._process_payload, entry.entry_id),
+        entry.options.get(CONF_MAX_FLUSH_RATE, DEFAULT_MAX_FLUSH_RATE),
+        INGEST_QUEUE_SIZE,
+    )
+    hass.data[DOMAIN][entry.entry_id]["ingest_queue"] = ingest_queue
+
+    # Late, out-of-order and retried uploads are dropped before they are queued
+    hass.data[DOMAIN][entry.entry_id]["watermark"] = TorquePayloadWatermark(vehicle_name)
+
+    # New sensors are discovered in the background, batched per vehicle
+    discovery_debouncer = Debouncer(
+        hass,
+        _LOGGER,
+        cooldown=DISCOVERY_DEBOUNCE,
+        immediate=False,
+        function=partial(view._async_run_discovery, entry.entry_id),
+    )
+    hass.data[DOMAIN][entry.entry_id]["discovery_debouncer"] = discovery_debouncer
+    entry.async_on_unload(discovery_debouncer.async_cancel)
+
+    # Ingest metrics are counted per request and published on a fixed timer
+    metrics = TorqueIngestMetrics()
+    hass.data[DOMAIN][entry.entry_id]["metrics"] = metrics
+
+    # Sensors mark themselves dirty and are written in one pass per batch
+    state_flusher = TorqueStateFlusher(
+        hass.loop,
+        vehicle_name,
+        entry.options.get(CONF_STATE_FLUSH_INTERVAL, DEFAULT_STATE_FLUSH_INTERVAL),
+        metrics,
+    )
+    hass.data[DOMAIN][entry.entry_id]["state_flusher"] = state_flusher
+    entry.async_on_unload(state_flusher.async_cancel)
+
+    # Values held back by a sensor's min_interval are written from one timer
+    timer_wheel = TorqueTimerWheel(hass.loop)
+    hass.data[DOMAIN][entry.entry_id]["timer_wheel"] = timer_wheel
+    entry.async_on_unload(timer_wheel.async_stop)
+
+    # PID values are parsed once per upload with a converter learned per PID
+    hass.data[DOMAIN][entry.entry_id]["value_parser"] = TorqueValueParser(metrics)
+
+    @callback
+    def _async_publish_metrics(now: datetime) -> None:
+        """Publish the ingest metrics to the diagnostic sensors."""
+        async_dispatcher_send(hass, f"{DOMAIN}_{entry.entry_id}_metrics", metrics.snapshot())
+
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, _async_publish_metrics, timedelta(seconds=METRICS_PUBLISH_INTERVAL)
+        )
+    )
+    entry.async_create_background_task(
+        hass, ingest_queue.async_run(), f"{DOMAIN} ingest {entry.entry_id}"
+    )
+
+    # Opt-in raw upload recorder, flushed from the executor on a timer
+    if entry.options.get(CONF_RECORD_SESSIONS, DEFAULT_RECORD_SESSIONS):
+        session_recorder = TorqueSessionRecorder(
+            hass,
+            hass.config.path(SESSION_LOG_DIRECTORY, url_safe_name),
+            SESSION_LOG_MAX_FILE_SIZE,
+            SESSION_LOG_FLUSH_BATCH,
+        )
+        hass.data[DOMAIN][entry.entry_id]["session_recorder"] = session_recorder
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass,
+                session_recorder.async_flush,
+                timedelta(seconds=SESSION_LOG_FLUSH_INTERVAL),
+            )
+        )
+        entry.async_on_unload(session_recorder.async_flush)
+        _LOGGER.info("Recording Torque sessions for '%s' to %s", vehicle_name, hass.config.path(SESSION_LOG_DIRECTORY, url_safe_name))
+
+    # Statistics-only mode: measurements are aggregated in memory and pushed
+    # as long-term statistics, while sensor states are written sparingly
+    if entry.options.get(CONF_STATISTICS_ONLY, DEFAULT_STATISTICS_ONLY):
+        statistics_aggregator = TorqueStatisticsAggregator(
+            hass, entry.entry_id, url_safe_name, vehicle_name
+        )
+        await statistics_aggregator.async_load()
+        hass.data[DOMAIN][entry.entry_id]["statistics_aggregator"] = statistics_aggregator
+        # Runs last on unload, after the final push
+        entry.async_on_unload(statistics_aggregator.async_save)
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass,
+                statistics_aggregator.async_push,
+                timedelta(seconds=STATISTICS_PUSH_INTERVAL),
+            )
+        )
+        entry.async_on_unload(statistics_aggregator.async_push)
+        _LOGGER.info("Writing long-term statistics only for '%s'", vehicle_name)
+
+    # Derived sensors are evaluated from each processed payload
+    derived_expressions = {
+        key: definition[CONF_EXPRESSION]
+        for key, definition in hass.data[DOMAIN]["sensor_definitions"].items()
+        if CONF_EXPRESSION in definition
+    }
+    if derived_expressions:
+        hass.data[DOMAIN][entry.entry_id]["derived_sensors"] = TorqueDerivedSensors(
+            derived_expressions, lambda pid: _classify_key(pid).lookup_keys
+        )
+
+    # Recent values of every numeric PID for the torque_obd/history command
+    hass.data[DOMAIN][entry.entry_id]["history"] = TorqueHistory(HISTORY_WINDOW, HISTORY_SIZE)
+    # torque_obd/subscribe streams, fed with the same values and ended on unload
+    subscriptions: dict[TorqueSubscription, CALLBACK_TYPE] = {}
+    hass.data[DOMAIN][entry.entry_id]["subscriptions"] = subscriptions
+    entry.async_on_unload(partial(async_end_subscriptions, subscriptions))
+
+    # Trips end on a new session or after Torque has been idle for a while
+    trip_summarizer = TorqueTripSummarizer(hass, entry.entry_id, vehicle_name, TRIP_IDLE_TIMEOUT)
+    hass.data[DOMAIN][entry.entry_id]["trip_summarizer"] = trip_summarizer
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            trip_summarizer.async_check_idle,
+            timedelta(seconds=TRIP_CHECK_INTERVAL),
+        )
+    )
+
+    # Track logs dropped into the vehicle's import folder become statistics
+    track_log_importer = TorqueTrackLogImporter(
+        hass, entry.entry_id, hass.config.path(TRACK_LOG_IMPORT_DIRECTORY, url_safe_name)
+    )
+    hass.data[DOMAIN][entry.entry_id]["track_log_importer"] = track_log_importer
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            track_log_importer.async_scan,
+            timedelta(seconds=TRACK_LOG_SCAN_INTERVAL),
+        )
+    )
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     _LOGGER.debug("Completed setup for Torque OBD-II entry '%s'", vehicle_name)
 
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     vehicle_name = entry.data.get(CONF_VEHICLE_NAME, "Unknown")
@@ -158,7 +705,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        routes = hass.data[DOMAIN].get("routes", {})
+        if routes.get(entry_data.get("slug")) == entry.entry_id:
+            del routes[entry_data["slug"]]
         _LOGGER.debug("Successfully unloaded Torque OBD-II entry '%s'", vehicle_name)
     else:
         _LOGGER.warning("Failed to unload platforms for Torque OBD-II entry '%s'", vehicle_name)
@@ -166,46 +716,57 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget a removed vehicle in the fleet index and its stored statistics."""
+    fleet_index: TorqueFleetIndex | None = hass.data.get(DOMAIN, {}).get("fleet_index")
+    if fleet_index is not None:
+        fleet_index.async_remove_entry(entry.entry_id)
+    await async_remove_statistics_store(hass, entry.entry_id)
+
+
 class TorqueView(HomeAssistantView):
-    """Handle data from Torque requests."""
+    """Handle data from Torque requests for all vehicles."""
 
     requires_auth = False
+    url = f"{API_PATH_PREFIX}{{slug}}"
+    name = f"api:{DOMAIN}"
 
-    def __init__(self, hass: HomeAssistant, entry_id: str, api_path: str) -> None:
+    def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the Torque view."""
         self.hass = hass
-        self.entry_id = entry_id
-        self.url = api_path
-        self.name = f"api:torque_{entry_id}"
-        _LOGGER.debug("Initialized TorqueView for entry %s with path %s", entry_id, api_path)
+        _LOGGER.debug("Initialized TorqueView with path %s", self.url)
 
     @callback
-    async def get(self, request: web.Request) -> web.Response:
+    async def get(self, request: web.Request, slug: str) -> web.Response:
         """Handle Torque data via GET request."""
-        return await self._handle_request(request)
+        return await self._handle_request(request, slug)
 
     @callback
-    async def post(self, request: web.Request) -> web.Response:
+    async def post(self, request: web.Request, slug: str) -> web.Response:
         """Handle Torque data via POST request."""
-        return await self._handle_request(request)
+        return await self._handle_request(request, slug)
+
+    async def _create_sensors_for_new_data(self, entry_id: str, data_dict: dict[str, Any]) -> bool:
+        """Create sensors dynamically for new data keys.
 
-    async def _create_sensors_for_new_data(self, data_dict: dict[str, Any]) -> None:
-        """Create sensors dynamically for new data keys."""
+        Returns True when discovery ran to completion, i.e. every key in the
+        payload has been handled and the same key-set need not be scanned again.
+        """
         # Import here to avoid circular dependency between __init__ and sensor modules
         from .sensor import TorqueSensor
         
         # Check if entry still exists (may have been unloaded during request)
-        if self.entry_id not in self.hass.data.get(DOMAIN, {}):
-            _LOGGER.debug("Entry %s not found when creating sensors, integration may be unloading", self.entry_id)
-            return
+        if entry_id not in self.hass.data.get(DOMAIN, {}):
+            _LOGGER.debug("Entry %s not found when creating sensors, integration may be unloading", entry_id)
+            return False
         
-        entry_data = self.hass.data[DOMAIN][self.entry_id]
+        entry_data = self.hass.data[DOMAIN][entry_id]
         added_sensors = entry_data.get("added_sensors", set())
         async_add_entities = entry_data.get("async_add_entities")
         
         if async_add_entities is None:
-            _LOGGER.warning("async_add_entities not available for entry %s", self.entry_id)
-            return
+            _LOGGER.warning("async_add_entities not available for entry %s", entry_id)
+            return False
         
         # Get sensor definitions (loaded at setup time)
         sensor_definitions = self.hass.data[DOMAIN].get("sensor_definitions", {})
@@ -218,65 +779,34 @@ class TorqueView(HomeAssistantView):
         # First pass: Extract and store sensor names from payload
         # userFullName{PID} and userShortName{PID} come before k{PID} values
         for key, value in data_dict.items():
-            if key.startswith("userFullName"):
-                # Extract PID from userFullNameXXXX
-                pid = key[12:]  # Remove "userFullName" prefix
-                # Normalize the PID format
-                normalized_pid = _normalize_pid("k" + pid)
-                name_value = _extract_name_from_value(value)
-                if pid and name_value:
-                    if normalized_pid not in sensor_names:
-                        sensor_names[normalized_pid] = {
-                            "full_name": name_value,
-                            "short_name": None
-                        }
-                    else:
-                        sensor_names[normalized_pid]["full_name"] = name_value
-                    _LOGGER.debug("Stored full name for PID %s: %s", normalized_pid, name_value)
-            elif key.startswith("userShortName"):
-                # Extract PID from userShortNameXXXX
-                pid = key[13:]  # Remove "userShortName" prefix
-                # Normalize the PID format
-                normalized_pid = _normalize_pid("k" + pid)
-                name_value = _extract_name_from_value(value)
-                if pid and name_value:
-                    if normalized_pid not in sensor_names:
-                        sensor_names[normalized_pid] = {
-                            "full_name": None,
-                            "short_name": name_value
-                        }
-                    else:
-                        sensor_names[normalized_pid]["short_name"] = name_value
-                    _LOGGER.debug("Stored short name for PID %s: %s", normalized_pid, name_value)
+            record = _classify_key(key)
+            if record.kind != KEY_KIND_NAME:
+                continue
+            name_value = _extract_name_from_value(value)
+            if not name_value:
+                continue
+            names = sensor_names.setdefault(
+                record.pid, {"full_name": None, "short_name": None}
+            )
+            names[record.name_field] = name_value
+            _LOGGER.debug("Stored %s for PID %s: %s", record.name_field, record.pid, name_value)
         
         new_sensors = []
         
         # Second pass: Check each key in the incoming data for actual sensor values (k{PID})
-        for key in data_dict.keys():
-            # Only process data keys (k{PID})
-            if not key.startswith("k"):
+        for key in data_dict:
+            record = _classify_key(key)
+            # Only process data keys (k{PID}); metadata and attributes never create sensors
+            if record.kind not in SENSOR_KEY_KINDS:
                 continue
             
-            # Normalize the PID format for consistent lookups
-            normalized_key = _normalize_pid(key)
+            # Normalized PID format for consistent lookups
+            normalized_key = record.pid
             
             # Skip if sensor already exists (check both original and normalized)
             if key in added_sensors or normalized_key in added_sensors:
                 continue
             
-            # Skip metadata fields
-            if key in ATTRIBUTE_FIELDS:
-                continue
-            
-            # Skip fields that match metadata prefixes
-            is_metadata = False
-            for prefix in METADATA_FIELD_PREFIXES:
-                if key.startswith(prefix):
-                    is_metadata = True
-                    break
-            if is_metadata:
-                continue
-            
             # Determine sensor name from payload or definitions
             sensor_name = None
             if normalized_key in sensor_names:
@@ -307,11 +837,12 @@ class TorqueView(HomeAssistantView):
             # Use original key for data lookup - data_dict contains non-normalized PIDs from Torque
             sensor = TorqueSensor(
                 self.hass,
-                self.entry_id,
+                entry_id,
                 entry_data.get("email", ""),
                 entry_data.get("vehicle_name", "Unknown"),
                 key,  # Original key (e.g., "kd") matches data_dict keys from Torque
                 definition,
+                statistics=entry_data.get("statistics_aggregator"),
             )
             new_sensors.append(sensor)
             # Track both keys to prevent duplicate sensors (e.g., if both "kd" and "k0d" appear)
@@ -332,13 +863,16 @@ class TorqueView(HomeAssistantView):
             GPS_LATITUDE_PID in data_dict
             and GPS_LONGITUDE_PID in data_dict
             and not entry_data.get("tracker_added", False)
-            and entry_data.get("async_add_tracker") is not None
         ):
+            if entry_data.get("async_add_tracker") is None:
+                # Tracker platform not ready yet; retry on the next push
+                return False
+
             from .device_tracker import TorqueDeviceTracker
 
             tracker = TorqueDeviceTracker(
                 self.hass,
-                self.entry_id,
+                entry_id,
                 entry_data.get("vehicle_name", "Unknown"),
             )
             entry_data["tracker_added"] = True
@@ -348,51 +882,318 @@ class TorqueView(HomeAssistantView):
                 entry_data.get("vehicle_name", "Unknown"),
             )
 
-    async def _handle_request(self, request: web.Request) -> web.Response:
-        """Process the Torque request."""
-        try:
-            # Get data from query parameters (GET) or form data (POST)
+        return True
+
+    async def _async_run_discovery(self, entry_id: str) -> None:
+        """Discover sensors for the payloads collected since the last run."""
+        entry_data = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        if entry_data is None or not entry_data.get("discovery_buffer"):
+            return
+
+        data_dict = entry_data["discovery_buffer"]
+        signatures = entry_data.get("discovery_signatures", set())
+        entry_data["discovery_buffer"] = {}
+        entry_data["discovery_signatures"] = set()
+        _LOGGER.debug(
+            "Running sensor discovery for '%s' over %d key-set(s)",
+            entry_data.get("vehicle_name", "Unknown"),
+            len(signatures),
+        )
+
+        # Key-sets are only remembered once discovery completed; otherwise
+        # they are collected again on the next push.
+        started = time.perf_counter()
+        completed = await self._create_sensors_for_new_data(entry_id, data_dict)
+        if (metrics := entry_data.get("metrics")) is not None:
+            metrics.record_discovery(time.perf_counter() - started)
+        if not completed:
+            return
+        # Insertion-ordered, so the oldest key-set is forgotten first
+        key_signatures = entry_data.setdefault("key_signatures", {})
+        for key_signature in signatures:
+            if len(key_signatures) >= MAX_KEY_SIGNATURES:
+                del key_signatures[next(iter(key_signatures))]
+            key_signatures[key_signature] = None
+
+    async def _async_read_payload(self, request: web.Request) -> dict[str, Any]:
+        """Read the Torque payload from a request."""
+        # Get data from query parameters (GET) or form data (POST)
+        if request.method == "POST":
+            data = await request.post()
+        else:
+            data = request.query
+
+        # Convert to regular dict for easier processing
+        return dict(data)
+
+    async def _async_ingest(
+        self,
+        entry_id: str,
+        data_dict: dict[str, Any],
+        request: web.Request,
+        parse_time: float,
+    ) -> None:
+        """Hand a payload to a vehicle's ingest worker."""
+        entry_data = self.hass.data[DOMAIN][entry_id]
+        vehicle_name = entry_data.get("vehicle_name", "Unknown")
+        _LOGGER.debug("Received %s request for '%s' with %d parameters", request.method, vehicle_name, len(data_dict))
+
+        if (metrics := entry_data.get("metrics")) is not None:
+            metrics.record_parse(parse_time)
             if request.method == "POST":
-                data = await request.post()
+                metrics.bytes_received += request.content_length or 0
             else:
-                data = request.query
+                metrics.bytes_received += len(request.query_string)
+
+        if (recent_payloads := entry_data.get("recent_payloads")) is not None:
+            recent_payloads.append((time.time(), data_dict))
+
+        if (session_recorder := entry_data.get("session_recorder")) is not None:
+            session_recorder.async_record(data_dict)
+
+        # Drop uploads older than (or repeating) what the vehicle already has
+        watermark = entry_data.get("watermark")
+        if watermark is not None and not watermark.async_accept(data_dict):
+            return
 
-            # Convert to regular dict for easier processing
-            data_dict = dict(data)
+        await self._async_ingest_payload(entry_id, data_dict)
+
+    async def _async_ingest_payload(self, entry_id: str, data_dict: dict[str, Any]) -> None:
+        """Parse an accepted payload and hand it to the vehicle's ingest worker.
+
+        Replays enter here with their own watermark, so they are neither
+        recorded nor ordered against the phone's live uploads.
+        """
+        entry_data = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        if entry_data is None:
+            _LOGGER.debug("Entry %s not found when ingesting data, integration may be unloading", entry_id)
+            return
+
+        # Parse the PID values once; everything downstream gets typed values
+        values: dict[str, float] | None = None
+        if (value_parser := entry_data.get("value_parser")) is not None:
+            data_dict, values = _parse_payload(value_parser, data_dict)
+
+        # Trips, the PID history and WebSocket subscribers see every upload,
+        # before uploads are merged
+        trip_summarizer = entry_data.get("trip_summarizer")
+        history = entry_data.get("history")
+        subscriptions = entry_data.get("subscriptions")
+        if trip_summarizer is not None or history is not None or subscriptions:
+            if values is None:
+                values = _numeric_pid_values(data_dict)
+            if trip_summarizer is not None:
+                trip_summarizer.async_record(data_dict, values)
+            if values:
+                if history is not None:
+                    history.record(values)
+                for subscription in subscriptions or ():
+                    subscription.async_update(values)
+
+        # Hand the payload to the vehicle's ingest worker and answer Torque
+        # right away; the worker coalesces and processes queued payloads.
+        ingest_queue = entry_data.get("ingest_queue")
+        if ingest_queue is not None:
+            ingest_queue.async_enqueue(data_dict)
+        else:
+            await self._process_payload(entry_id, data_dict)
+
+    async def _handle_request(self, request: web.Request, slug: str) -> web.Response:
+        """Process the Torque request."""
+        try:
+            parse_started = time.perf_counter()
+            data_dict = await self._async_read_payload(request)
+            parse_time = time.perf_counter() - parse_started
             
-            # Check if entry still exists in hass.data (it may have been unloaded)
-            if self.entry_id not in self.hass.data.get(DOMAIN, {}):
+            # Resolve the vehicle; it may have been unloaded or never configured
+            domain_data = self.hass.data.get(DOMAIN, {})
+            entry_id = domain_data.get("routes", {}).get(slug)
+            if entry_id is None or entry_id not in domain_data:
                 _LOGGER.warning(
-                    "Received %s request on %s but entry_id %s not found. Integration may have been unloaded.",
+                    "Received %s request on %s but no vehicle is configured for it. Integration may have been unloaded.",
                     request.method,
-                    self.url,
-                    self.entry_id,
+                    request.path,
                 )
                 return web.Response(text="OK!")
-            
-            entry_data = self.hass.data[DOMAIN][self.entry_id]
-            vehicle_name = entry_data.get("vehicle_name", "Unknown")
-            _LOGGER.debug("Received %s request for '%s' with %d parameters", request.method, vehicle_name, len(data_dict))
 
-            # Store the latest data
-            entry_data["data"] = data_dict
-            _LOGGER.debug("Stored data for '%s': %d keys", vehicle_name, len(data_dict))
+            # Remember the phone's device id so it can also use the fleet endpoint
+            device_id = data_dict.get("id")
+            fleet_index: TorqueFleetIndex | None = domain_data.get("fleet_index")
+            if device_id and fleet_index is not None and fleet_index.device_ids.get(device_id) != entry_id:
+                fleet_index.async_learn(entry_id, device_id)
 
-            # Check for new sensors and create them dynamically
-            await self._create_sensors_for_new_data(data_dict)
+            await self._async_ingest(entry_id, data_dict, request, parse_time)
+            return web.Response(text="OK!")
 
-            # Notify sensors about new data
-            signal = f"{DOMAIN}_{self.entry_id}_update"
-            async_dispatcher_send(
-                self.hass,
-                signal,
-                data_dict,
-            )
-            _LOGGER.debug("Dispatched update signal '%s' for '%s'", signal, vehicle_name)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.error("Error processing Torque data on %s: %s", request.path, err, exc_info=True)
+            # Return OK to Torque even on error to prevent retries and user-facing errors
+            return web.Response(text="OK!")
+
+    async def _process_payload(self, entry_id: str, data_dict: dict[str, Any]) -> None:
+        """Process a (possibly coalesced) Torque payload for a vehicle."""
+        # Check if entry still exists in hass.data (it may have been unloaded)
+        if entry_id not in self.hass.data.get(DOMAIN, {}):
+            _LOGGER.debug("Entry %s not found when processing data, integration may be unloading", entry_id)
+            return
+
+        entry_data = self.hass.data[DOMAIN][entry_id]
+        vehicle_name = entry_data.get("vehicle_name", "Unknown")
+
+        # Store the latest data and its context, built once for every sensor
+        entry_data["data"] = data_dict
+        entry_data["context"] = _payload_context(data_dict)
+        _LOGGER.debug("Stored data for '%s': %d keys", vehicle_name, len(data_dict))
+
+        # Check for new sensors and create them dynamically, but only for
+        # key-sets not seen before: after the first few pushes of a session
+        # Torque repeats the same keys and discovery has nothing to do.
+        key_signature = frozenset(data_dict)
+        key_signatures = entry_data.setdefault("key_signatures", {})
+        if key_signature not in key_signatures:
+            # Discovery runs batched in the background; values for sensors it
+            # creates are buffered below and replayed once they are added.
+            entry_data.setdefault("discovery_buffer", {}).update(data_dict)
+            entry_data.setdefault("discovery_signatures", set()).add(key_signature)
+            discovery_debouncer = entry_data.get("discovery_debouncer")
+            if discovery_debouncer is not None:
+                await discovery_debouncer.async_call()
+            else:
+                await self._async_run_discovery(entry_id)
+        else:
+            _LOGGER.debug("Skipping sensor discovery for '%s': key-set already seen", vehicle_name)
+
+        dispatch_started = time.perf_counter()
+
+        # Notify per-vehicle listeners (last update sensor, device tracker)
+        signal = f"{DOMAIN}_{entry_id}_update"
+        async_dispatcher_send(
+            self.hass,
+            signal,
+            data_dict,
+        )
+        _LOGGER.debug("Dispatched update signal '%s' for '%s'", signal, vehicle_name)
+
+        # Route PID values only to the sensors whose keys are in this payload
+        notified = _dispatch_pid_updates(
+            entry_data.setdefault("pid_listeners", {}),
+            data_dict,
+            entry_data.setdefault("replay_buffer", {}),
+        )
+        # Derived sensors get a payload of the derived values that changed
+        if (derived_sensors := entry_data.get("derived_sensors")) is not None and (
+            derived_values := derived_sensors.async_process(data_dict)
+        ):
+            for key in ("session", "id", "time"):
+                if key in data_dict:
+                    derived_values[key] = data_dict[key]
+            notified += _dispatch_pid_updates(entry_data["pid_listeners"], derived_values)
+        _LOGGER.debug("Routed update to %d sensor(s) for '%s'", notified, vehicle_name)
+
+        if (metrics := entry_data.get("metrics")) is not None:
+            metrics.record_dispatch(time.perf_counter() - dispatch_started)
+
+
+class TorqueFleetView(TorqueView):
+    """Handle data from many phones on one shared fleet endpoint.
+
+    Payloads are routed by the Torque ``id`` device hash, falling back to the
+    ``eml`` field.  Devices not in the fleet index are offered as new
+    vehicles through a discovery flow, at most one every
+    FLEET_PROVISION_INTERVAL seconds since the endpoint is unauthenticated.
+    The view is only registered once a vehicle enables fleet mode and, as
+    aiohttp routes cannot be removed, answers 404 again once none has it.
+    """
 
+    url = FLEET_API_PATH
+    name = f"api:{DOMAIN}:fleet"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the fleet view."""
+        super().__init__(hass)
+        self._last_provision: float | None = None
+
+    @callback
+    async def get(self, request: web.Request) -> web.Response:  # type: ignore[override]
+        """Handle fleet Torque data via GET request."""
+        return await self._handle_fleet_request(request)
+
+    @callback
+    async def post(self, request: web.Request) -> web.Response:  # type: ignore[override]
+        """Handle fleet Torque data via POST request."""
+        return await self._handle_fleet_request(request)
+
+    async def _handle_fleet_request(self, request: web.Request) -> web.Response:
+        """Route a fleet request to its vehicle."""
+        try:
+            parse_started = time.perf_counter()
+            data_dict = await self._async_read_payload(request)
+            parse_time = time.perf_counter() - parse_started
+            device_id = data_dict.get("id") or None
+            email = data_dict.get("eml") or None
+
+            domain_data = self.hass.data.get(DOMAIN, {})
+            if not domain_data.get("fleet_entries"):
+                _LOGGER.debug("Received fleet request on %s but fleet mode is disabled", request.path)
+                return web.Response(status=HTTPStatus.NOT_FOUND)
+
+            fleet_index: TorqueFleetIndex | None = domain_data.get("fleet_index")
+            if fleet_index is None:
+                _LOGGER.warning("Received fleet request on %s but the integration is not loaded", request.path)
+                return web.Response(text="OK!")
+
+            entry_id = fleet_index.resolve(device_id, email)
+            if entry_id is not None and self.hass.config_entries.async_get_entry(entry_id) is None:
+                # Vehicle was removed while the integration was not loaded
+                _LOGGER.debug("Dropping stale fleet index entry %s", entry_id)
+                fleet_index.async_remove_entry(entry_id)
+                entry_id = None
+
+            if entry_id is None:
+                self._async_provision_device(data_dict, device_id, email)
+                return web.Response(text="OK!")
+
+            if entry_id not in domain_data:
+                _LOGGER.debug("Fleet vehicle %s is not loaded, dropping payload", entry_id)
+                return web.Response(text="OK!")
+
+            await self._async_ingest(entry_id, data_dict, request, parse_time)
             return web.Response(text="OK!")
 
         except Exception as err:  # pylint: disable=broad-except
-            _LOGGER.error("Error processing Torque data on %s: %s", self.url, err, exc_info=True)
+            _LOGGER.error("Error processing Torque data on %s: %s", request.path, err, exc_info=True)
             # Return OK to Torque even on error to prevent retries and user-facing errors
             return web.Response(text="OK!")
+
+    @callback
+    def _async_provision_device(
+        self, data_dict: dict[str, Any], device_id: str | None, email: str | None
+    ) -> None:
+        """Start a discovery flow offering a vehicle for an unknown device."""
+        if device_id is None and email is None:
+            _LOGGER.warning("Received fleet payload without device id or email, ignoring")
+            return
+
+        now = time.monotonic()
+        if self._last_provision is not None and now - self._last_provision < FLEET_PROVISION_INTERVAL:
+            _LOGGER.debug("Fleet provisioning rate limited, ignoring unknown device %s", device_id or email)
+            return
+        self._last_provision = now
+
+        taken_unique_ids = {
+            entry.unique_id
+            for entry in self.hass.config_entries.async_entries(DOMAIN)
+            if entry.unique_id
+        }
+        vehicle_name = fleet_vehicle_name(data_dict, taken_unique_ids)
+        _LOGGER.info("Provisioning fleet vehicle '%s' for unknown device %s", vehicle_name, device_id or email)
+        discovery_flow.async_create_flow(
+            self.hass,
+            DOMAIN,
+            context={"source": SOURCE_INTEGRATION_DISCOVERY},
+            data={
+                CONF_VEHICLE_NAME: vehicle_name,
+                CONF_DEVICE_ID: device_id,
+                CONF_EMAIL: email or "",
+            },
+        )
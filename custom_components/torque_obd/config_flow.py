@@ -8,11 +8,26 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
 
-from .const import CONF_EMAIL, CONF_VEHICLE_NAME, DOMAIN
+from .const import (
+    CONF_DEVICE_ID,
+    CONF_EMAIL,
+    CONF_FLEET_MODE,
+    CONF_MAX_FLUSH_RATE,
+    CONF_RECORD_SESSIONS,
+    CONF_STATE_FLUSH_INTERVAL,
+    CONF_STATISTICS_ONLY,
+    CONF_VEHICLE_NAME,
+    DEFAULT_FLEET_MODE,
+    DEFAULT_MAX_FLUSH_RATE,
+    DEFAULT_RECORD_SESSIONS,
+    DEFAULT_STATE_FLUSH_INTERVAL,
+    DEFAULT_STATISTICS_ONLY,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,6 +39,34 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 )
 
 
+def _options_schema(options: dict[str, Any]) -> vol.Schema:
+    """Build the options schema using the current options as defaults."""
+    return vol.Schema(
+        {
+            vol.Optional(
+                CONF_MAX_FLUSH_RATE,
+                default=options.get(CONF_MAX_FLUSH_RATE, DEFAULT_MAX_FLUSH_RATE),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=50)),
+            vol.Optional(
+                CONF_RECORD_SESSIONS,
+                default=options.get(CONF_RECORD_SESSIONS, DEFAULT_RECORD_SESSIONS),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_STATISTICS_ONLY,
+                default=options.get(CONF_STATISTICS_ONLY, DEFAULT_STATISTICS_ONLY),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_STATE_FLUSH_INTERVAL,
+                default=options.get(CONF_STATE_FLUSH_INTERVAL, DEFAULT_STATE_FLUSH_INTERVAL),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+            vol.Optional(
+                CONF_FLEET_MODE,
+                default=options.get(CONF_FLEET_MODE, DEFAULT_FLEET_MODE),
+            ): cv.boolean,
+        }
+    )
+
+
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect.
     
@@ -80,6 +123,10 @@ class TorqueConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovery_info: dict[str, Any] = {}
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -120,3 +167,75 @@ class TorqueConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
+
+    async def async_step_integration_discovery(
+        self, discovery_info: dict[str, Any]
+    ) -> FlowResult:
+        """Handle an unknown phone discovered on the fleet endpoint."""
+        vehicle_name = discovery_info[CONF_VEHICLE_NAME]
+        _LOGGER.debug(
+            "Starting Torque OBD-II config flow for fleet device %s",
+            discovery_info.get(CONF_DEVICE_ID) or discovery_info.get(CONF_EMAIL),
+        )
+
+        normalized_name = vehicle_name.lower().replace(' ', '-')
+        await self.async_set_unique_id(normalized_name)
+        self._abort_if_unique_id_configured()
+
+        self._discovery_info = discovery_info
+        self.context["title_placeholders"] = {"name": vehicle_name}
+        return await self.async_step_confirm()
+
+    async def async_step_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Let the user confirm adding a discovered fleet vehicle."""
+        vehicle_name = self._discovery_info[CONF_VEHICLE_NAME]
+        if user_input is None:
+            self._set_confirm_only()
+            return self.async_show_form(
+                step_id="confirm",
+                description_placeholders={
+                    "name": vehicle_name,
+                    "device": self._discovery_info.get(CONF_DEVICE_ID)
+                    or self._discovery_info.get(CONF_EMAIL)
+                    or "",
+                },
+            )
+
+        _LOGGER.info("Creating config entry for fleet vehicle '%s'", vehicle_name)
+        return self.async_create_entry(
+            title=vehicle_name,
+            data={
+                CONF_VEHICLE_NAME: vehicle_name,
+                CONF_EMAIL: self._discovery_info.get(CONF_EMAIL, ""),
+                CONF_DEVICE_ID: self._discovery_info.get(CONF_DEVICE_ID),
+            },
+        )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> TorqueOptionsFlow:
+        """Get the options flow for this handler."""
+        return TorqueOptionsFlow()
+
+
+class TorqueOptionsFlow(config_entries.OptionsFlow):
+    """Handle Torque OBD-II options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the vehicle options."""
+        if user_input is not None:
+            _LOGGER.debug("Updating Torque OBD-II options: %s", user_input)
+            return self.async_create_entry(title="", data=user_input)
+
+        config_entry = self.hass.config_entries.async_get_entry(self.handler)
+        options = dict(config_entry.options) if config_entry is not None else {}
+        return self.async_show_form(
+            step_id="init",
+            data_schema=_options_schema(options),
+        )
@@ -16,6 +16,8 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant
 
+from .derived import DerivedExpression
+
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN: Final = "torque_obd"
@@ -26,6 +28,98 @@ SENSOR_DEFINITIONS_FILE: Final = "torque_sensor_definitions.yaml"
 # Configuration
 CONF_EMAIL: Final = "email"
 CONF_VEHICLE_NAME: Final = "vehicle_name"
+CONF_DEVICE_ID: Final = "device_id"
+
+# Options
+# Maximum number of times per second queued uploads are flushed to the sensors
+# (0 = flush as fast as uploads arrive)
+CONF_MAX_FLUSH_RATE: Final = "max_flush_rate"
+DEFAULT_MAX_FLUSH_RATE: Final = 2.0
+
+# Append every upload to compressed per-session logs in the config directory
+CONF_RECORD_SESSIONS: Final = "record_sessions"
+DEFAULT_RECORD_SESSIONS: Final = False
+
+# Aggregate measurements into long-term statistics in memory and only write
+# sensor states every STATISTICS_STATE_INTERVAL seconds
+CONF_STATISTICS_ONLY: Final = "statistics_only"
+DEFAULT_STATISTICS_ONLY: Final = False
+
+# Minimum seconds between batched sensor state writes (0 = write each batch
+# as soon as the payload that changed it has been processed)
+CONF_STATE_FLUSH_INTERVAL: Final = "state_flush_interval"
+DEFAULT_STATE_FLUSH_INTERVAL: Final = 0.0
+
+# Serve the unauthenticated fleet endpoint, which also provisions vehicles
+# for unknown phones; it is served while any vehicle has this enabled
+CONF_FLEET_MODE: Final = "fleet_mode"
+DEFAULT_FLEET_MODE: Final = False
+
+# Uploads waiting in a vehicle's ingest queue before the oldest is dropped
+INGEST_QUEUE_SIZE: Final = 100
+
+# Seconds new payload keys are collected before sensor discovery runs
+DISCOVERY_DEBOUNCE: Final = 0.5
+
+# Seconds between publishing the ingest metrics diagnostic sensors
+METRICS_PUBLISH_INTERVAL: Final = 60
+
+# Raw uploads kept per vehicle for the diagnostics download
+DIAGNOSTICS_PAYLOAD_COUNT: Final = 50
+
+# Session logs: <config>/torque_obd_sessions/<vehicle slug>/<session>.<part>.gz
+SESSION_LOG_DIRECTORY: Final = "torque_obd_sessions"
+SESSION_LOG_MAX_FILE_SIZE: Final = 5 * 1024 * 1024
+SESSION_LOG_FLUSH_INTERVAL: Final = 10
+SESSION_LOG_FLUSH_BATCH: Final = 200
+
+# Statistics-only mode: seconds between statistics pushes / sensor state writes
+STATISTICS_PUSH_INTERVAL: Final = 300
+STATISTICS_STATE_INTERVAL: Final = 60
+# The current hour's aggregates are stored so restarts and reloads keep them
+STATISTICS_STORAGE_KEY: Final = f"{DOMAIN}.statistics"
+STATISTICS_STORAGE_VERSION: Final = 1
+STATISTICS_SAVE_DELAY: Final = 10
+
+# Trip summaries: a trip ends on a new session or after TRIP_IDLE_TIMEOUT
+# seconds without uploads, checked every TRIP_CHECK_INTERVAL seconds
+TRIP_IDLE_TIMEOUT: Final = 300
+TRIP_CHECK_INTERVAL: Final = 60
+
+# Seconds of values kept per PID for the torque_obd/history WebSocket command
+HISTORY_WINDOW: Final = 1800
+# Preallocated samples per PID: the whole window at Torque's fastest 1 s
+# logging interval, fewer seconds only if uploads arrive faster than that
+HISTORY_SIZE: Final = 1800
+
+# Frames per second sent to torque_obd/subscribe clients unless they ask otherwise
+DEFAULT_SUBSCRIBE_MAX_RATE: Final = 5.0
+
+# Track log drop folder: <config>/torque_obd_import/<vehicle slug>/*.csv
+TRACK_LOG_IMPORT_DIRECTORY: Final = "torque_obd_import"
+TRACK_LOG_SCAN_INTERVAL: Final = 60
+
+# Services
+SERVICE_PROFILE: Final = "profile"
+SERVICE_REPLAY: Final = "replay"
+SERVICE_IMPORT_TRACK_LOG: Final = "import_track_log"
+ATTR_ENTRY_ID: Final = "entry_id"
+ATTR_FILE: Final = "file"
+ATTR_MAX_DURATION: Final = "max_duration"
+ATTR_REQUESTS: Final = "requests"
+ATTR_SPEED: Final = "speed"
+DEFAULT_PROFILE_REQUESTS: Final = 100
+DEFAULT_PROFILE_MAX_DURATION: Final = 300
+DEFAULT_REPLAY_SPEED: Final = 1.0
+
+# Fleet mode: one shared endpoint for many phones, routed by the Torque
+# device id (``id``) or email (``eml``).  Unknown devices are provisioned
+# as new vehicles, at most one every FLEET_PROVISION_INTERVAL seconds.
+FLEET_API_PATH: Final = "/api/torque_obd/fleet"
+FLEET_PROVISION_INTERVAL: Final = 60
+FLEET_STORAGE_KEY: Final = f"{DOMAIN}.fleet_index"
+FLEET_STORAGE_VERSION: Final = 1
+FLEET_SAVE_DELAY: Final = 10
 
 # GPS PIDs used by the device tracker platform
 # kff1006 = GPS Latitude, kff1005 = GPS Longitude (verified from Torque payload examples)
@@ -36,6 +130,43 @@ GPS_BEARING_PID: Final = "kff1007"
 GPS_ALTITUDE_PID: Final = "kff1010"
 GPS_SPEED_PID: Final = "kff1001"
 
+# Change suppression (optional per-PID fields in torque_sensor_definitions.yaml)
+# A new value is only written to the state machine when it moves further than
+# max(deadband, |last value| * deadband_percent / 100) from the last written
+# value. A suppressed value is still written once the sensor has been silent
+# for max_silence seconds, whether or not Torque keeps uploading.
+CONF_DEADBAND: Final = "deadband"
+CONF_DEADBAND_PERCENT: Final = "deadband_percent"
+CONF_MAX_SILENCE: Final = "max_silence"
+
+DEFAULT_MAX_SILENCE: Final = 300
+
+# Absolute deadbands applied when a definition does not set its own
+DEFAULT_DEADBANDS: Final = {
+    SensorDeviceClass.TEMPERATURE: 0.1,
+    SensorDeviceClass.PRESSURE: 0.1,
+    SensorDeviceClass.SPEED: 0.1,
+    SensorDeviceClass.VOLTAGE: 0.01,
+    SensorDeviceClass.DISTANCE: 0.01,
+}
+
+# Minimum seconds between state writes of a sensor (optional per-PID field in
+# torque_sensor_definitions.yaml). The newest value arriving sooner is held
+# and written when the interval has passed.
+CONF_MIN_INTERVAL: Final = "min_interval"
+
+# Minimum intervals applied when a definition does not set its own; slow
+# moving quantities do not need a state write per upload
+DEFAULT_MIN_INTERVALS: Final = {
+    SensorDeviceClass.TEMPERATURE: 30,
+    SensorDeviceClass.ATMOSPHERIC_PRESSURE: 60,
+    SensorDeviceClass.VOLUME: 30,
+    SensorDeviceClass.VOLTAGE: 5,
+}
+
+# Seconds per slot of the per-vehicle timer wheel running held-value writes
+TIMER_WHEEL_RESOLUTION: Final = 0.5
+
 # Sensor definitions
 # Maps Torque parameter names to Home Assistant sensor attributes
 # NOTE: These are FALLBACK definitions. Sensor names should preferably come from
@@ -322,6 +453,7 @@ SENSOR_DEFINITIONS: Final = {
         "icon": "mdi:fuel",
         "device_class": None,
         "state_class": SensorStateClass.MEASUREMENT,
+        CONF_MIN_INTERVAL: 30,
     },
     "k31": {
         "name": "Distance travelled since codes cleared",
@@ -1491,6 +1623,9 @@ SENSOR_DEFINITIONS: Final = {
     },
 }
 
+# Derived sensors: definitions computed from other PIDs (e.g. "k0b - k33")
+CONF_EXPRESSION: Final = "expression"
+
 # Additional attributes to store but not create sensors for
 ATTRIBUTE_FIELDS: Final = [
     "eml",  # Email address (vehicle identifier)
@@ -1610,6 +1745,40 @@ def load_sensor_definitions(hass: HomeAssistant) -> dict[str, dict[str, Any]]:
                         )
                         definition_copy["state_class"] = None
             
+            # Validate optional change-suppression fields
+            for field in (CONF_DEADBAND, CONF_DEADBAND_PERCENT, CONF_MAX_SILENCE, CONF_MIN_INTERVAL):
+                if field not in definition_copy:
+                    continue
+                try:
+                    field_value = float(definition_copy[field])
+                except (ValueError, TypeError):
+                    field_value = -1.0
+                if field_value < 0:
+                    _LOGGER.warning(
+                        "Invalid %s '%s' for PID '%s'. Must be a non-negative number. Ignoring.",
+                        field,
+                        definition_copy[field],
+                        pid
+                    )
+                    del definition_copy[field]
+                else:
+                    definition_copy[field] = field_value
+            
+            # Derived sensors are parsed and compiled once, here
+            if CONF_EXPRESSION in definition_copy:
+                try:
+                    definition_copy[CONF_EXPRESSION] = DerivedExpression(
+                        str(definition_copy[CONF_EXPRESSION])
+                    )
+                except ValueError as err:
+                    _LOGGER.warning(
+                        "Invalid expression '%s' for derived sensor '%s': %s. Skipping.",
+                        definition_copy[CONF_EXPRESSION],
+                        pid,
+                        err
+                    )
+                    continue
+            
             # Add defaults for optional fields if not present
             definition_copy.setdefault("unit", None)
             definition_copy.setdefault("icon", "mdi:car-info")
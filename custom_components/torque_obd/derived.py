@@ -0,0 +1,149 @@
+"""Derived sensors computed from other PIDs.
+
+A sensor definition with an ``expression`` (e.g. ``k0b - k33``) is a
+derived sensor.  Expressions are parsed once with ``ast``, checked against
+a small allow-list (numbers, PID names, arithmetic and a few functions)
+and compiled, so evaluating one never goes through the parser again and
+cannot reach anything but the PID values.  A dependency index maps each
+input PID to the derived sensors using it; a derived value is only
+recomputed when one of its inputs changed.
+"""
+from __future__ import annotations
+
+import ast
+from collections.abc import Callable, Mapping
+import math
+from typing import Any
+
+from homeassistant.core import callback
+
+from .value_types import parse_value
+
+_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": round,
+    "sqrt": math.sqrt,
+}
+_GLOBALS: dict[str, Any] = {"__builtins__": {}, **_FUNCTIONS}
+
+# Exponentiation is left out on purpose: 9**9**9 would stall the event loop
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Name,
+    ast.Load,
+    ast.Call,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.UAdd,
+    ast.USub,
+)
+
+
+class DerivedExpression:
+    """A validated and compiled derived sensor expression."""
+
+    __slots__ = ("text", "inputs", "_code")
+
+    def __init__(self, text: str) -> None:
+        """Parse, validate and compile an expression.
+
+        Raises ValueError if the expression is not allowed.
+        """
+        try:
+            tree = ast.parse(text, mode="eval")
+        except SyntaxError as err:
+            raise ValueError(f"invalid syntax: {err.msg}") from err
+
+        callees = {
+            id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)
+        }
+        inputs: set[str] = set()
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise ValueError(f"'{type(node).__name__}' is not allowed")
+            if isinstance(node, ast.Constant) and (
+                isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+            ):
+                raise ValueError(f"constant {node.value!r} is not a number")
+            if isinstance(node, ast.Call) and (
+                not isinstance(node.func, ast.Name)
+                or node.func.id not in _FUNCTIONS
+                or node.keywords
+            ):
+                raise ValueError(f"only {', '.join(_FUNCTIONS)} can be called")
+            if isinstance(node, ast.Name) and id(node) not in callees:
+                if node.id in _FUNCTIONS or node.id.startswith("_"):
+                    raise ValueError(f"'{node.id}' cannot be used as a value")
+                inputs.add(node.id)
+        if not inputs:
+            raise ValueError("expression does not use any PID")
+
+        self.text = text
+        self.inputs = frozenset(inputs)
+        self._code = compile(tree, f"<expression {text}>", "eval")
+
+    def evaluate(self, values: Mapping[str, float]) -> float | None:
+        """Evaluate with the given input values; None if undefined."""
+        try:
+            result = eval(self._code, _GLOBALS, values)  # noqa: S307 - validated AST
+        except (ArithmeticError, TypeError, ValueError):
+            return None
+        result = float(result)
+        return result if math.isfinite(result) else None
+
+
+class TorqueDerivedSensors:
+    """Compute a vehicle's derived sensor values from its payloads."""
+
+    def __init__(
+        self,
+        expressions: dict[str, DerivedExpression],
+        lookup_keys: Callable[[str], tuple[str, ...]],
+    ) -> None:
+        """Index the expressions by the payload keys of their inputs."""
+        self._expressions = expressions
+        # Input PID -> derived sensors using it
+        self._dependents: dict[str, list[str]] = {}
+        # Payload key (every alias of an input PID) -> input PID
+        self._payload_keys: dict[str, str] = {}
+        for key, expression in expressions.items():
+            for pid in expression.inputs:
+                self._dependents.setdefault(pid, []).append(key)
+                for payload_key in lookup_keys(pid):
+                    self._payload_keys.setdefault(payload_key, pid)
+        self._inputs: dict[str, float] = {}
+        self._results: dict[str, float] = {}
+
+    @callback
+    def async_process(self, data_dict: dict[str, Any]) -> dict[str, float]:
+        """Return the derived values that changed with this payload."""
+        changed: set[str] = set()
+        inputs = self._inputs
+        for payload_key, pid in self._payload_keys.items():
+            if (raw_value := data_dict.get(payload_key)) is None:
+                continue
+            value = raw_value if type(raw_value) is float else parse_value(raw_value)
+            if type(value) is not float or inputs.get(pid) == value:
+                continue
+            inputs[pid] = value
+            changed.update(self._dependents[pid])
+
+        results: dict[str, float] = {}
+        for key in changed:
+            expression = self._expressions[key]
+            if not expression.inputs <= inputs.keys():
+                continue
+            result = expression.evaluate(inputs)
+            if result is None or result == self._results.get(key):
+                continue
+            self._results[key] = results[key] = result
+        return results
@@ -0,0 +1,130 @@
+"""Diagnostics support for Torque OBD-II."""
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import SENSOR_KEY_KINDS, _classify_key
+from .const import (
+    CONF_DEVICE_ID,
+    CONF_EMAIL,
+    DOMAIN,
+    GPS_ACCURACY_PID,
+    GPS_ALTITUDE_PID,
+    GPS_BEARING_PID,
+    GPS_LATITUDE_PID,
+    GPS_LONGITUDE_PID,
+    GPS_SPEED_PID,
+)
+from .metrics import LATENCY_BUCKETS_MS
+
+TO_REDACT = {CONF_EMAIL, CONF_DEVICE_ID, "eml", "id"}
+
+# Location and track data of the vehicle, by normalized PID
+GPS_PIDS_TO_REDACT = frozenset(
+    {
+        GPS_LATITUDE_PID,
+        GPS_LONGITUDE_PID,
+        GPS_ALTITUDE_PID,
+        GPS_SPEED_PID,
+        GPS_BEARING_PID,
+        GPS_ACCURACY_PID,
+    }
+)
+
+
+def _redact_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of a payload without identifiers and GPS data."""
+    redacted = async_redact_data(payload, TO_REDACT)
+    for key in redacted:
+        if _classify_key(key).pid in GPS_PIDS_TO_REDACT:
+            redacted[key] = REDACTED
+    return redacted
+
+
+def _pid_update_rates(
+    recent_payloads: list[tuple[float, dict[str, Any]]],
+) -> dict[str, float]:
+    """Return updates per minute for each PID seen in the recent payloads."""
+    if len(recent_payloads) < 2:
+        return {}
+    window = recent_payloads[-1][0] - recent_payloads[0][0]
+    if window <= 0:
+        return {}
+
+    counts: Counter[str] = Counter()
+    for _, payload in recent_payloads:
+        for key in payload:
+            record = _classify_key(key)
+            if record.kind in SENSOR_KEY_KINDS:
+                counts[record.pid] += 1
+    return {pid: round(count * 60 / window, 1) for pid, count in sorted(counts.items())}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data: dict[str, Any] = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    recent_payloads = list(entry_data.get("recent_payloads", ()))
+
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "sensors": {
+            "added_sensors": len(entry_data.get("added_sensors", ())),
+            "sensor_names": len(entry_data.get("sensor_names", {})),
+            "pid_listeners": len(entry_data.get("pid_listeners", {})),
+            "replay_buffer": len(entry_data.get("replay_buffer", {})),
+        },
+        "pid_update_rates": _pid_update_rates(recent_payloads),
+        "recent_payloads": [
+            {
+                "received": datetime.fromtimestamp(received, timezone.utc).isoformat(),
+                "payload": _redact_payload(payload),
+            }
+            for received, payload in recent_payloads
+        ],
+    }
+
+    if (ingest_queue := entry_data.get("ingest_queue")) is not None:
+        diagnostics["ingest_queue"] = {
+            "enqueued": ingest_queue.enqueued,
+            "dropped": ingest_queue.dropped,
+            "flushes": ingest_queue.flushes,
+            "pending": ingest_queue.pending,
+        }
+
+    if (watermark := entry_data.get("watermark")) is not None:
+        session, payload_time = watermark.watermark
+        diagnostics["watermark"] = {
+            "session": session,
+            "time": payload_time,
+            "stale": watermark.stale,
+            "duplicates": watermark.duplicates,
+        }
+
+    if (value_parser := entry_data.get("value_parser")) is not None:
+        diagnostics["value_types"] = value_parser.types
+
+    if (metrics := entry_data.get("metrics")) is not None:
+        diagnostics["latency_histograms"] = {
+            "buckets_ms": [*LATENCY_BUCKETS_MS, "+Inf"],
+            "parse": list(metrics.parse_histogram),
+            "discovery": list(metrics.discovery_histogram),
+            "dispatch": list(metrics.dispatch_histogram),
+        }
+        diagnostics["totals"] = {
+            "bytes_received": metrics.bytes_received,
+            "malformed_values": metrics.malformed_values,
+        }
+
+    return diagnostics
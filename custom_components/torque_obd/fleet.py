@@ -0,0 +1,125 @@
+"""Fleet mode support for Torque OBD-II.
+
+In fleet mode many phones upload to one shared endpoint.  Each payload is
+routed to its vehicle by the Torque ``id`` device hash, falling back to the
+``eml`` field when only one vehicle uses that Torque account.  The index is
+persisted so it is available right at startup.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import FLEET_SAVE_DELAY, FLEET_STORAGE_KEY, FLEET_STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+# Characters allowed in vehicle names (see config_flow.validate_input)
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9 _-]+")
+
+
+class TorqueFleetIndex:
+    """Persisted device id -> config entry and email -> config entries index."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the fleet index."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, FLEET_STORAGE_VERSION, FLEET_STORAGE_KEY
+        )
+        self.device_ids: dict[str, str] = {}
+        # One Torque account often uploads for several vehicles
+        self.emails: dict[str, set[str]] = {}
+
+    async def async_load(self) -> None:
+        """Load the index from storage.
+
+        Entries learned while the load was pending take precedence.
+        """
+        data = await self._store.async_load()
+        if not data:
+            return
+        self.device_ids = {**data.get("device_ids", {}), **self.device_ids}
+        for email, entry_ids in data.get("emails", {}).items():
+            self.emails.setdefault(email, set()).update(entry_ids)
+        _LOGGER.debug(
+            "Loaded fleet index with %d device id(s) and %d email(s)",
+            len(self.device_ids),
+            len(self.emails),
+        )
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        """Return the data to persist."""
+        return {
+            "device_ids": self.device_ids,
+            "emails": {email: sorted(entry_ids) for email, entry_ids in self.emails.items()},
+        }
+
+    @callback
+    def resolve(self, device_id: str | None, email: str | None) -> str | None:
+        """Return the entry id for a payload's device id or email.
+
+        The email is only used when exactly one vehicle is known for it;
+        otherwise the payload cannot be routed and the device is unknown.
+        """
+        if device_id and (entry_id := self.device_ids.get(device_id)) is not None:
+            return entry_id
+        if email and len(entry_ids := self.emails.get(email, ())) == 1:
+            return next(iter(entry_ids))
+        return None
+
+    @callback
+    def async_learn(
+        self,
+        entry_id: str,
+        device_id: str | None = None,
+        email: str | None = None,
+    ) -> None:
+        """Index a device id and/or email for an entry."""
+        changed = False
+        if device_id and self.device_ids.get(device_id) != entry_id:
+            self.device_ids[device_id] = entry_id
+            changed = True
+        if email and entry_id not in (entry_ids := self.emails.setdefault(email, set())):
+            entry_ids.add(entry_id)
+            changed = True
+        if changed:
+            self._store.async_delay_save(self._data_to_save, FLEET_SAVE_DELAY)
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> None:
+        """Drop every index entry pointing at a removed config entry."""
+        device_ids = {k: v for k, v in self.device_ids.items() if v != entry_id}
+        emails = {k: v - {entry_id} for k, v in self.emails.items()}
+        emails = {k: v for k, v in emails.items() if v}
+        if device_ids == self.device_ids and emails == self.emails:
+            return
+        self.device_ids = device_ids
+        self.emails = emails
+        self._store.async_delay_save(self._data_to_save, FLEET_SAVE_DELAY)
+
+
+def fleet_vehicle_name(data: dict[str, Any], taken_unique_ids: set[str]) -> str:
+    """Build a vehicle name for an auto-provisioned fleet device.
+
+    Uses the Torque profile name when the payload carries one, otherwise a
+    name derived from the device id.  A device suffix is appended when the
+    name would collide with an already configured vehicle.
+    """
+    device_id = str(data.get("id") or data.get("eml") or "unknown")
+    device_suffix = _INVALID_NAME_CHARS.sub("", device_id)[:8] or "unknown"
+
+    profile_name = data.get("profileName")
+    if isinstance(profile_name, list):
+        profile_name = profile_name[0] if profile_name else None
+    name = " ".join(_INVALID_NAME_CHARS.sub(" ", str(profile_name or "")).split())
+    if not name:
+        name = f"Torque {device_suffix}"
+
+    if name.lower().replace(" ", "-") in taken_unique_ids:
+        name = f"{name} {device_suffix}"
+    return name
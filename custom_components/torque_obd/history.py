@@ -0,0 +1,148 @@
+"""Short in-memory time series of a vehicle's PIDs.
+
+Each PID keeps the values of the last ``window`` seconds in a preallocated
+ring of two ``array('d')`` buffers (timestamps and values), so a vehicle's
+history costs 16 bytes per sample and never grows or allocates once a PID's
+ring exists.  Samples are pruned by age; the ring's capacity only bounds
+the memory when Torque uploads faster than expected.  Every sample is
+stamped with the time Home Assistant received the upload, so the series
+stay in order whatever the phone's clock says.  The ``torque_obd/history``
+WebSocket command reads it.
+"""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+import math
+import time
+
+
+class PidRingBuffer:
+    """Fixed-size ring of (timestamp, value) samples, oldest first."""
+
+    __slots__ = ("_times", "_values", "_next", "_size")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the ring."""
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._size
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        index = self._next
+        self._times[index] = timestamp
+        self._values[index] = value
+        capacity = len(self._times)
+        self._next = (index + 1) % capacity
+        if self._size < capacity:
+            self._size += 1
+
+    def prune(self, cutoff: float) -> None:
+        """Drop the samples older than ``cutoff``."""
+        times = self._times
+        capacity = len(times)
+        index = (self._next - self._size) % capacity
+        while self._size and times[index] < cutoff:
+            self._size -= 1
+            index = (index + 1) % capacity
+
+    @property
+    def latest(self) -> float:
+        """Return the newest value."""
+        return self._values[self._next - 1]
+
+    def ordered(self) -> tuple[array, array]:
+        """Return copies of the timestamps and values, oldest first."""
+        start = (self._next - self._size) % len(self._times)
+        end = start + self._size
+        if end <= len(self._times):
+            return self._times[start:end], self._values[start:end]
+        index = self._next
+        return (
+            self._times[start:] + self._times[:index],
+            self._values[start:] + self._values[:index],
+        )
+
+    def series(
+        self, since: float | None = None, max_points: int | None = None
+    ) -> list[list[float]]:
+        """Return ``[timestamp, value]`` pairs, optionally downsampled.
+
+        Downsampling averages runs of consecutive samples so at most
+        ``max_points`` pairs are returned.
+        """
+        times, values = self.ordered()
+        start = bisect_left(times, since) if since is not None else 0
+        count = len(times) - start
+        if max_points is None or count <= max_points:
+            return [[times[index], values[index]] for index in range(start, len(times))]
+
+        step = math.ceil(count / max_points)
+        points = []
+        for index in range(start, len(times), step):
+            end = min(index + step, len(times))
+            points.append(
+                [
+                    sum(times[index:end]) / (end - index),
+                    sum(values[index:end]) / (end - index),
+                ]
+            )
+        return points
+
+
+class TorqueHistory:
+    """Ring buffers of the last ``window`` seconds of a vehicle's numeric PIDs."""
+
+    def __init__(self, window: float, capacity: int) -> None:
+        """Initialize the history."""
+        self._window = window
+        self._capacity = capacity
+        self._buffers: dict[str, PidRingBuffer] = {}
+
+    def record(self, values: dict[str, float]) -> None:
+        """Add the numeric PID values of an upload received now."""
+        now = time.time()
+        cutoff = now - self._window
+        buffers = self._buffers
+        for pid, value in values.items():
+            if (buffer := buffers.get(pid)) is None:
+                buffer = buffers[pid] = PidRingBuffer(self._capacity)
+            buffer.append(now, value)
+            buffer.prune(cutoff)
+
+    @property
+    def pids(self) -> list[str]:
+        """Return the PIDs with a history."""
+        return sorted(self._buffers)
+
+    def latest(self) -> dict[str, float]:
+        """Return the newest value of every PID."""
+        return {
+            pid: buffer.latest
+            for pid, buffer in self._buffers.items()
+            if len(buffer)
+        }
+
+    def series(
+        self,
+        pids: list[str] | None = None,
+        since: float | None = None,
+        max_points: int | None = None,
+    ) -> dict[str, list[list[float]]]:
+        """Return the series of the requested (or all) PIDs."""
+        if pids is None:
+            pids = self.pids
+        # PIDs Torque stopped sending are only pruned when they are read
+        cutoff = time.time() - self._window
+        series = {}
+        for pid in pids:
+            if (buffer := self._buffers.get(pid)) is not None:
+                buffer.prune(cutoff)
+                series[pid] = buffer.series(since, max_points)
+        return series
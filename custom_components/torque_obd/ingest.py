@@ -0,0 +1,188 @@
+"""Per-vehicle ingest queue for Torque OBD-II uploads."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TorqueIngestQueue:
+    """Coalesce queued Torque payloads and process them at a bounded rate.
+
+    ``TorqueView`` enqueues each upload and answers Torque immediately.  A
+    single worker per vehicle drains the queue, merges everything that piled
+    up since the last flush (latest value wins per key) and hands the merged
+    payload to the processor, at most ``max_flush_rate`` times per second.
+    When the queue is full the oldest payload is dropped and counted.
+    """
+
+    def __init__(
+        self,
+        vehicle_name: str,
+        process: Callable[[dict[str, Any]], Awaitable[None]],
+        max_flush_rate: float,
+        max_size: int,
+    ) -> None:
+        """Initialize the ingest queue."""
+        self._vehicle_name = vehicle_name
+        # Public so it can be wrapped at runtime (e.g. by the profiler)
+        self.process = process
+        self._min_flush_interval = 1 / max_flush_rate if max_flush_rate > 0 else 0.0
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(max_size)
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.flushes = 0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of payloads waiting to be flushed."""
+        return self._queue.qsize()
+
+    @callback
+    def async_enqueue(self, payload: dict[str, Any]) -> None:
+        """Queue a payload, dropping the oldest one when the queue is full."""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.dropped += 1
+            _LOGGER.debug(
+                "Ingest queue for '%s' is full, dropped oldest payload (%d dropped so far)",
+                self._vehicle_name,
+                self.dropped,
+            )
+        self._queue.put_nowait(payload)
+        self.enqueued += 1
+
+    async def async_drain(self) -> None:
+        """Wait until every queued payload has been processed."""
+        await self._queue.join()
+
+    async def async_run(self) -> None:
+        """Flush queued payloads until the task is cancelled."""
+        _LOGGER.debug("Started ingest worker for '%s'", self._vehicle_name)
+        while True:
+            merged = await self._queue.get()
+            started = time.monotonic()
+
+            # Queued payloads may still be referenced elsewhere (diagnostics),
+            # so they are merged into a new dict instead of updated in place.
+            coalesced = 1
+            if not self._queue.empty():
+                merged = dict(merged)
+            while not self._queue.empty():
+                merged.update(self._queue.get_nowait())
+                coalesced += 1
+            if coalesced > 1:
+                _LOGGER.debug(
+                    "Coalesced %d queued payloads for '%s'",
+                    coalesced,
+                    self._vehicle_name,
+                )
+
+            try:
+                await self.process(merged)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error processing Torque data for '%s'", self._vehicle_name
+                )
+            self.flushes += 1
+            for _ in range(coalesced):
+                self._queue.task_done()
+
+            if self._min_flush_interval:
+                delay = started + self._min_flush_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+
+class TorquePayloadWatermark:
+    """Reject Torque uploads that are older than, or repeat, earlier ones.
+
+    Mobile networks deliver uploads late, out of order and retried.  The
+    watermark is the newest ``(session, time)`` accepted for a vehicle;
+    Torque's session is the session start in milliseconds, so both order
+    numerically.  An upload from an older session or with an older time is
+    stale.  Torque sends several different uploads with the same ``time``
+    (values, names, units), so one with the watermark's time is only a
+    duplicate when its key-set was already accepted for that time.
+    Uploads without a usable ``time`` cannot be ordered and are accepted.
+    """
+
+    def __init__(self, vehicle_name: str) -> None:
+        """Initialize the watermark."""
+        self._vehicle_name = vehicle_name
+        self._session: int | None = None
+        self._time: int | None = None
+        self._signatures: set[int] = set()
+
+        self.stale = 0
+        self.duplicates = 0
+
+    @property
+    def watermark(self) -> tuple[int | None, int | None]:
+        """Return the newest accepted (session, time)."""
+        return self._session, self._time
+
+    @callback
+    def async_accept(self, payload: dict[str, Any]) -> bool:
+        """Return whether a payload is newer than the watermark, and advance it."""
+        torque_time = payload.get("time")
+        if not isinstance(torque_time, str) or not torque_time.isdecimal():
+            return True
+        payload_time = int(torque_time)
+        session = payload.get("session")
+        payload_session = (
+            int(session) if isinstance(session, str) and session.isdecimal() else None
+        )
+
+        if (
+            payload_session is not None
+            and self._session is not None
+            and payload_session != self._session
+        ):
+            if payload_session < self._session:
+                return self._reject_stale(payload_session, payload_time)
+            # A new session starts its own timeline
+            self._time = None
+
+        signature = hash(frozenset(payload))
+        if self._time is not None:
+            if payload_time < self._time:
+                return self._reject_stale(payload_session, payload_time)
+            if payload_time == self._time:
+                if signature in self._signatures:
+                    self.duplicates += 1
+                    _LOGGER.debug(
+                        "Dropped duplicate upload for '%s' (session %s, time %s)",
+                        self._vehicle_name,
+                        payload_session,
+                        payload_time,
+                    )
+                    return False
+                self._signatures.add(signature)
+                return True
+
+        if payload_session is not None:
+            self._session = payload_session
+        self._time = payload_time
+        self._signatures = {signature}
+        return True
+
+    def _reject_stale(self, session: int | None, payload_time: int) -> bool:
+        """Count and log a stale upload."""
+        self.stale += 1
+        _LOGGER.debug(
+            "Dropped stale upload for '%s' (session %s, time %s) behind watermark %s",
+            self._vehicle_name,
+            session,
+            payload_time,
+            self.watermark,
+        )
+        return False
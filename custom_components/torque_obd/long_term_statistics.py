@@ -0,0 +1,244 @@
+"""Long-term statistics written by the Torque OBD-II integration.
+
+Statistics are external statistics of the integration, one per vehicle and
+PID (``torque_obd:<vehicle>_<pid>``), holding an hourly mean/min/max.  Both
+imported track logs and the statistics-only mode write to the same ids, so
+an imported drive fills the gaps of the live series.  Hours the recorder
+already has are never replaced by an import; the hour statistics-only mode
+is aggregating is merged with the imported values instead.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+import re
+import time
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticMeanType
+from homeassistant.components.recorder.statistics import (
+    STATISTIC_UNIT_TO_UNIT_CONVERTER,
+    async_add_external_statistics,
+    statistics_during_period,
+)
+from homeassistant.components.sensor import UNIT_CONVERTERS
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    STATISTICS_SAVE_DELAY,
+    STATISTICS_STORAGE_KEY,
+    STATISTICS_STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Home Assistant only accepts statistics for whole hours
+STATISTICS_PERIOD = 3600
+
+_UNSAFE_OBJECT_ID_CHARS = re.compile(r"[^a-z0-9]+")
+
+
+def statistic_id(slug: str, key: str) -> str:
+    """Return the external statistic id of a vehicle's PID or column."""
+    object_id = _UNSAFE_OBJECT_ID_CHARS.sub("_", f"{slug}_{key}".lower()).strip("_")
+    return f"{DOMAIN}:{object_id}"
+
+
+def _unit_class(device_class: str | None, unit: str | None) -> str | None:
+    """Return the unit class of a unit, as the sensor recorder platform does."""
+    if (
+        device_class
+        and (converter := UNIT_CONVERTERS.get(device_class)) is not None
+        and unit in converter.VALID_UNITS
+    ):
+        return converter.UNIT_CLASS
+    if (converter := STATISTIC_UNIT_TO_UNIT_CONVERTER.get(unit)) is not None:
+        return converter.UNIT_CLASS
+    return None
+
+
+def statistic_metadata(
+    statistic: str, name: str, unit: str | None, device_class: str | None = None
+) -> dict[str, Any]:
+    """Return the metadata of a mean/min/max statistic."""
+    return {
+        "source": DOMAIN,
+        "statistic_id": statistic,
+        "name": name,
+        "unit_of_measurement": unit,
+        "unit_class": _unit_class(device_class, unit),
+        "mean_type": StatisticMeanType.ARITHMETIC,
+        "has_sum": False,
+    }
+
+
+@callback
+def async_add_statistics(
+    hass: HomeAssistant, metadata: dict[str, Any], statistics: list[dict[str, Any]]
+) -> None:
+    """Hand statistics to the recorder, replacing rows of the same hours."""
+    async_add_external_statistics(hass, metadata, statistics)
+
+
+async def async_recorded_hours(
+    hass: HomeAssistant, statistic: str, start: datetime, end: datetime
+) -> set[datetime]:
+    """Return the start of the hours in [start, end) the recorder has a row for."""
+    rows = await get_instance(hass).async_add_executor_job(
+        statistics_during_period, hass, start, end, {statistic}, "hour", None, {"mean"}
+    )
+    return {
+        datetime.fromtimestamp(row["start"], timezone.utc)
+        for row in rows.get(statistic, [])
+    }
+
+
+def _statistics_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of a vehicle's current statistics hour."""
+    return Store(hass, STATISTICS_STORAGE_VERSION, f"{STATISTICS_STORAGE_KEY}.{entry_id}")
+
+
+async def async_remove_statistics_store(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the stored statistics hour of a removed vehicle."""
+    await _statistics_store(hass, entry_id).async_remove()
+
+
+class TorqueStatisticsAggregator:
+    """Aggregate a vehicle's sensor values into hourly statistics.
+
+    Sensors feed every value to ``async_record``, which only updates a
+    running sum/count/min/max per PID.  ``async_push`` writes the running
+    aggregate of the current hour for the PIDs that changed since the last
+    push; the recorder replaces the hour's row each time, so the statistics
+    are exact once the hour is over, without any per-push state rows.  The
+    running aggregates are stored with each push and on unload, so a restart
+    or reload in the middle of an hour continues the hour instead of
+    replacing its row with the values received since.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, slug: str, vehicle_name: str
+    ) -> None:
+        """Initialize the aggregator."""
+        self._hass = hass
+        self._store = _statistics_store(hass, entry_id)
+        self._slug = slug
+        self._vehicle_name = vehicle_name
+        self._metadata: dict[str, dict[str, Any]] = {}
+        # PID -> [sum, count, min, max] of the current hour
+        self._buckets: dict[str, list[float]] = {}
+        self._dirty: set[str] = set()
+        self._hour_start = 0.0
+
+        self.pushed = 0
+
+    async def async_load(self) -> None:
+        """Continue the hour stored by the previous run."""
+        data = await self._store.async_load()
+        if not data or self._buckets:
+            return
+        self._hour_start = data["hour_start"]
+        self._buckets = {key: list(bucket) for key, bucket in data["buckets"].items()}
+        # Written again in case the previous run stopped before its last push
+        self._dirty.update(self._buckets)
+        _LOGGER.debug(
+            "Restored statistics of %d PID(s) for '%s'", len(self._buckets), self._vehicle_name
+        )
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"hour_start": self._hour_start, "buckets": self._buckets}
+
+    async def async_save(self) -> None:
+        """Store the current hour right away."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_register(
+        self, key: str, name: str, unit: str | None, device_class: str | None = None
+    ) -> None:
+        """Describe the statistic a sensor's values are aggregated into."""
+        self._metadata[key] = statistic_metadata(
+            statistic_id(self._slug, key), f"{self._vehicle_name} {name}", unit, device_class
+        )
+
+    @callback
+    def async_record(self, key: str, value: float) -> None:
+        """Add a sensor value to the current hour."""
+        now = time.time()
+        if now >= self._hour_start + STATISTICS_PERIOD:
+            self._async_start_hour(now)
+
+        self._dirty.add(key)
+        if (bucket := self._buckets.get(key)) is None:
+            self._buckets[key] = [value, 1, value, value]
+            return
+        bucket[0] += value
+        bucket[1] += 1
+        if value < bucket[2]:
+            bucket[2] = value
+        elif value > bucket[3]:
+            bucket[3] = value
+
+    @callback
+    def async_merge(self, key: str, start: float, bucket: list[float]) -> bool:
+        """Add imported [sum, count, min, max] values to the current hour.
+
+        Returns False unless ``start`` is the hour being aggregated (or the
+        current hour, which is then started) and ``key`` is aggregated here.
+        """
+        now = time.time()
+        if (
+            start == now - now % STATISTICS_PERIOD
+            and now >= self._hour_start + STATISTICS_PERIOD
+        ):
+            self._async_start_hour(now)
+        if start != self._hour_start or key not in self._metadata:
+            return False
+
+        self._dirty.add(key)
+        if (current := self._buckets.get(key)) is None:
+            self._buckets[key] = list(bucket)
+            return True
+        current[0] += bucket[0]
+        current[1] += bucket[1]
+        current[2] = min(current[2], bucket[2])
+        current[3] = max(current[3], bucket[3])
+        return True
+
+    @callback
+    def _async_start_hour(self, now: float) -> None:
+        """Write out the finished hour and start aggregating the next one."""
+        self.async_push()
+        self._buckets = {}
+        self._dirty.clear()
+        self._hour_start = now - now % STATISTICS_PERIOD
+
+    @callback
+    def async_push(self, now: datetime | None = None) -> None:
+        """Write the current hour's aggregates of the changed PIDs."""
+        if not self._dirty:
+            return
+        self._store.async_delay_save(self._data_to_save, STATISTICS_SAVE_DELAY)
+        if "recorder" not in self._hass.config.components:
+            return
+
+        start = datetime.fromtimestamp(self._hour_start, timezone.utc)
+        for key in self._dirty:
+            if (metadata := self._metadata.get(key)) is None:
+                continue
+            total, count, minimum, maximum = self._buckets[key]
+            async_add_statistics(
+                self._hass,
+                metadata,
+                [{"start": start, "mean": total / count, "min": minimum, "max": maximum}],
+            )
+            self.pushed += 1
+        _LOGGER.debug(
+            "Pushed statistics of %d PID(s) for '%s'", len(self._dirty), self._vehicle_name
+        )
+        self._dirty.clear()
@@ -0,0 +1,111 @@
+"""Per-vehicle ingest metrics for Torque OBD-II."""
+from __future__ import annotations
+
+from bisect import bisect_left
+import time
+
+# Keys of the published metrics snapshot (also the diagnostic sensor keys)
+METRIC_REQUESTS_PER_MINUTE = "requests_per_minute"
+METRIC_PARSE_TIME = "parse_time"
+METRIC_DISCOVERY_TIME = "discovery_time"
+METRIC_DISPATCH_TIME = "dispatch_time"
+METRIC_STATE_WRITES_PER_PUSH = "state_writes_per_push"
+METRIC_BYTES_RECEIVED = "bytes_received"
+METRIC_MALFORMED_VALUES = "malformed_values"
+
+# Upper bounds (ms) of the fixed latency histogram buckets; one more bucket
+# counts everything slower than the last bound.
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+_LATENCY_BUCKETS_S = tuple(bound / 1000 for bound in LATENCY_BUCKETS_MS)
+
+
+class TorqueIngestMetrics:
+    """Ingest counters and timers for one vehicle.
+
+    The hot path only updates counters of this preallocated slot object.
+    ``snapshot`` is called on a fixed timer and turns the counters of the
+    elapsed window into rates and averages.  State writes, bytes received,
+    malformed values and the latency histograms are running totals.
+    """
+
+    __slots__ = (
+        "requests",
+        "pushes",
+        "discovery_runs",
+        "state_writes",
+        "parse_time",
+        "discovery_time",
+        "dispatch_time",
+        "bytes_received",
+        "malformed_values",
+        "parse_histogram",
+        "discovery_histogram",
+        "dispatch_histogram",
+        "_window_start",
+        "_window_state_writes",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.state_writes = 0
+        self.bytes_received = 0
+        self.malformed_values = 0
+        self.parse_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.discovery_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.dispatch_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._reset_window(time.monotonic())
+
+    def record_parse(self, seconds: float) -> None:
+        """Record one received request and the time spent reading it."""
+        self.requests += 1
+        self.parse_time += seconds
+        self.parse_histogram[bisect_left(_LATENCY_BUCKETS_S, seconds)] += 1
+
+    def record_discovery(self, seconds: float) -> None:
+        """Record one sensor discovery run."""
+        self.discovery_runs += 1
+        self.discovery_time += seconds
+        self.discovery_histogram[bisect_left(_LATENCY_BUCKETS_S, seconds)] += 1
+
+    def record_dispatch(self, seconds: float) -> None:
+        """Record one processed push and the time spent dispatching it."""
+        self.pushes += 1
+        self.dispatch_time += seconds
+        self.dispatch_histogram[bisect_left(_LATENCY_BUCKETS_S, seconds)] += 1
+
+    def _reset_window(self, now: float) -> None:
+        """Start a new measurement window."""
+        self.requests = 0
+        self.pushes = 0
+        self.discovery_runs = 0
+        self.parse_time = 0.0
+        self.discovery_time = 0.0
+        self.dispatch_time = 0.0
+        self._window_start = now
+        self._window_state_writes = self.state_writes
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the metrics of the window since the last snapshot and reset it.
+
+        Times are averages in milliseconds: parse time per request, dispatch
+        time per push and discovery time per discovery run.
+        """
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        state_writes = self.state_writes - self._window_state_writes
+        snapshot = {
+            METRIC_REQUESTS_PER_MINUTE: round(self.requests * 60 / elapsed, 1) if elapsed > 0 else 0.0,
+            METRIC_PARSE_TIME: _average_ms(self.parse_time, self.requests),
+            METRIC_DISCOVERY_TIME: _average_ms(self.discovery_time, self.discovery_runs),
+            METRIC_DISPATCH_TIME: _average_ms(self.dispatch_time, self.pushes),
+            METRIC_STATE_WRITES_PER_PUSH: round(state_writes / self.pushes, 2) if self.pushes else 0.0,
+            METRIC_BYTES_RECEIVED: self.bytes_received,
+            METRIC_MALFORMED_VALUES: self.malformed_values,
+        }
+        self._reset_window(now)
+        return snapshot
+
+
+def _average_ms(total_seconds: float, count: int) -> float:
+    """Return the average duration in milliseconds."""
+    return round(total_seconds * 1000 / count, 3) if count else 0.0
@@ -0,0 +1,190 @@
+"""On-demand profiler for the Torque OBD-II ingest path."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import cProfile
+import io
+import logging
+import pstats
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Request handlers of the shared views that count towards the profile
+_REQUEST_HANDLERS = ("_handle_request", "_handle_fleet_request")
+
+
+class TorqueProfiler:
+    """Profile the next ``requests`` Torque uploads with cProfile.
+
+    While running, the views' request handlers, every vehicle's ingest
+    worker and its state flusher are wrapped in a profiler that is enabled
+    only for the duration of each call, so entity ``_handle_update``
+    callbacks and the batched state writes are captured.  Values held back
+    by a sensor's ``min_interval`` are written from the timer wheel and are
+    not part of the profile.  Nothing is wrapped while no profile runs,
+    keeping the ingest path free of any profiling cost.  A profile stops
+    after ``max_duration`` seconds even if fewer requests arrived.
+    """
+
+    def __init__(self, hass: HomeAssistant, requests: int, max_duration: float) -> None:
+        """Initialize the profiler."""
+        self._hass = hass
+        self._profile = cProfile.Profile()
+        self._restore: list[Callable[[], None]] = []
+        self._depth = 0
+        self._max_duration = max_duration
+        self._timeout: asyncio.TimerHandle | None = None
+        self._running = False
+        self.remaining = requests
+
+    @callback
+    def async_start(self) -> None:
+        """Wrap the request handlers, ingest workers and state flushers."""
+        domain_data = self._hass.data[DOMAIN]
+        if domain_data.get("profiler") is not None:
+            raise HomeAssistantError("A Torque OBD-II profile is already running")
+
+        for view in (domain_data.get("view"), domain_data.get("fleet_view")):
+            if view is None:
+                continue
+            for name in _REQUEST_HANDLERS:
+                if hasattr(view, name):
+                    self._wrap(view, name, counted=True)
+
+        for entry_data in domain_data.values():
+            if not isinstance(entry_data, dict):
+                continue
+            if entry_data.get("ingest_queue") is not None:
+                self._wrap(entry_data["ingest_queue"], "process", counted=False)
+            if entry_data.get("state_flusher") is not None:
+                self._wrap_callback(entry_data["state_flusher"], "async_flush")
+
+        domain_data["profiler"] = self
+        self._running = True
+        self._timeout = self._hass.loop.call_later(self._max_duration, self._async_timeout)
+        _LOGGER.info(
+            "Profiling the next %d Torque request(s) for at most %d s",
+            self.remaining,
+            self._max_duration,
+        )
+
+    def _async_enter(self) -> None:
+        """Enable the profiler for the first wrapped call in flight."""
+        # Requests, ingest workers and flushes interleave on the event loop;
+        # the profiler stays enabled while any wrapped call is in flight.
+        if self._depth == 0:
+            self._profile.enable()
+        self._depth += 1
+
+    def _async_exit(self) -> None:
+        """Disable the profiler once no wrapped call is in flight."""
+        self._depth -= 1
+        if self._depth == 0:
+            self._profile.disable()
+
+    def _wrap(self, target: Any, name: str, counted: bool) -> None:
+        """Replace ``target.name`` with a profiled version until the profile ends."""
+        original: Callable[..., Awaitable[Any]] = getattr(target, name)
+
+        async def _profiled(*args: Any, **kwargs: Any) -> Any:
+            if not self._running:
+                return await original(*args, **kwargs)
+            self._async_enter()
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                self._async_exit()
+                if counted:
+                    self._async_request_done()
+
+        self._replace(target, name, _profiled)
+
+    def _wrap_callback(self, target: Any, name: str) -> None:
+        """Replace the callback ``target.name`` with a profiled version."""
+        original: Callable[..., Any] = getattr(target, name)
+
+        def _profiled(*args: Any, **kwargs: Any) -> Any:
+            # Flushes scheduled while profiling may run after the profile ended
+            if not self._running:
+                return original(*args, **kwargs)
+            self._async_enter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self._async_exit()
+
+        self._replace(target, name, _profiled)
+
+    def _replace(self, target: Any, name: str, profiled: Callable[..., Any]) -> None:
+        """Set ``target.name`` to ``profiled`` and remember how to restore it."""
+        original = getattr(target, name)
+        shadowed = name in vars(target)
+
+        def _restore() -> None:
+            if shadowed:
+                setattr(target, name, original)
+            else:
+                delattr(target, name)
+
+        setattr(target, name, profiled)
+        self._restore.append(_restore)
+
+    @callback
+    def _async_request_done(self) -> None:
+        """Count a profiled request and finish after the last one."""
+        self.remaining -= 1
+        if self.remaining == 0:
+            self.async_stop()
+
+    @callback
+    def _async_timeout(self) -> None:
+        """Stop a profile that did not see enough requests in time."""
+        self._timeout = None
+        _LOGGER.info(
+            "Stopping the Torque profile after %d s with %d request(s) left",
+            self._max_duration,
+            self.remaining,
+        )
+        self.async_stop()
+
+    @callback
+    def async_stop(self) -> None:
+        """Unwrap everything and write the collected stats."""
+        if not self._running:
+            return
+        self._running = False
+        if self._timeout is not None:
+            self._timeout.cancel()
+            self._timeout = None
+        for restore in self._restore:
+            restore()
+        self._restore.clear()
+        # Calls still in flight must not keep profiling while stats are written
+        if self._depth:
+            self._profile.disable()
+        if self._hass.data.get(DOMAIN, {}).get("profiler") is self:
+            del self._hass.data[DOMAIN]["profiler"]
+
+        base_path = self._hass.config.path(
+            f"{DOMAIN}_profile_{dt_util.now().strftime('%Y%m%d_%H%M%S')}"
+        )
+        self._hass.async_add_executor_job(self._write_stats, base_path)
+
+    def _write_stats(self, base_path: str) -> None:
+        """Write the pstats dump and a text summary (runs in the executor)."""
+        self._profile.dump_stats(f"{base_path}.prof")
+        summary = io.StringIO()
+        pstats.Stats(self._profile, stream=summary).sort_stats(
+            pstats.SortKey.CUMULATIVE
+        ).print_stats(50)
+        with open(f"{base_path}.txt", "w", encoding="utf-8") as file:
+            file.write(summary.getvalue())
+        _LOGGER.info("Wrote Torque ingest profile to %s.prof and %s.txt", base_path, base_path)
@@ -3,13 +3,24 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import partial
 import logging
 import math
+import time
 from typing import Any
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.const import (
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfInformation,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er, network
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
@@ -18,26 +29,115 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util import dt as dt_util, slugify
 
-from . import _normalize_pid
-from .const import CONF_EMAIL, CONF_VEHICLE_NAME, DOMAIN
+from . import (
+    PayloadContext,
+    _classify_key,
+    _normalize_pid,
+    _payload_context,
+    async_register_pid_listener,
+)
+from .const import (
+    CONF_DEADBAND,
+    CONF_DEADBAND_PERCENT,
+    CONF_EMAIL,
+    CONF_EXPRESSION,
+    CONF_MAX_SILENCE,
+    CONF_MIN_INTERVAL,
+    CONF_VEHICLE_NAME,
+    DEFAULT_DEADBANDS,
+    DEFAULT_MAX_SILENCE,
+    DEFAULT_MIN_INTERVALS,
+    DOMAIN,
+    STATISTICS_STATE_INTERVAL,
+)
+from .long_term_statistics import TorqueStatisticsAggregator
+from .metrics import (
+    METRIC_BYTES_RECEIVED,
+    METRIC_DISCOVERY_TIME,
+    METRIC_DISPATCH_TIME,
+    METRIC_MALFORMED_VALUES,
+    METRIC_PARSE_TIME,
+    METRIC_REQUESTS_PER_MINUTE,
+    METRIC_STATE_WRITES_PER_PUSH,
+    TorqueIngestMetrics,
+)
+from .state_flush import TorqueStateFlusher, TorqueTimerWheel
 
 _LOGGER = logging.getLogger(__name__)
 
+# Attributes of the last trip sensor, restored after a restart
+TRIP_SUMMARY_ATTRIBUTES = ("session", "start", "end", "payloads", "pids")
+
+# Ingest metrics diagnostic sensors, published by the metrics timer
+METRIC_SENSOR_DEFINITIONS: dict[str, dict[str, Any]] = {
+    METRIC_REQUESTS_PER_MINUTE: {
+        "name": "Requests per Minute",
+        "unit": "requests/min",
+        "icon": "mdi:upload-network",
+        "state_class": SensorStateClass.MEASUREMENT,
+    },
+    METRIC_PARSE_TIME: {
+        "name": "Parse Time",
+        "unit": UnitOfTime.MILLISECONDS,
+        "icon": "mdi:timer-outline",
+        "state_class": SensorStateClass.MEASUREMENT,
+    },
+    METRIC_DISCOVERY_TIME: {
+        "name": "Discovery Time",
+        "unit": UnitOfTime.MILLISECONDS,
+        "icon": "mdi:timer-search-outline",
+        "state_class": SensorStateClass.MEASUREMENT,
+    },
+    METRIC_DISPATCH_TIME: {
+        "name": "Dispatch Time",
+        "unit": UnitOfTime.MILLISECONDS,
+        "icon": "mdi:timer-play-outline",
+        "state_class": SensorStateClass.MEASUREMENT,
+    },
+    METRIC_STATE_WRITES_PER_PUSH: {
+        "name": "State Writes per Push",
+        "unit": None,
+        "icon": "mdi:database-edit-outline",
+        "state_class": SensorStateClass.MEASUREMENT,
+    },
+    METRIC_BYTES_RECEIVED: {
+        "name": "Bytes Received",
+        "unit": UnitOfInformation.BYTES,
+        "icon": "mdi:download-network",
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+    },
+    METRIC_MALFORMED_VALUES: {
+        "name": "Malformed Values",
+        "unit": None,
+        "icon": "mdi:alert-circle-outline",
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+    },
+}
+
 
 def _build_lookup_keys(key: str) -> tuple[str, ...]:
     """Build supported payload keys for a sensor."""
-    normalized_key = _normalize_pid(key)
-    lookup_keys = [key]
+    return _classify_key(key).lookup_keys
 
-    if normalized_key not in lookup_keys:
-        lookup_keys.append(normalized_key)
 
-    if normalized_key.startswith("k0") and len(normalized_key) == 3:
-        short_key = f"k{normalized_key[2:]}"
-        if short_key not in lookup_keys:
-            lookup_keys.append(short_key)
+def _exceeds_deadband(
+    old_value: Any,
+    new_value: Any,
+    deadband: float,
+    deadband_percent: float,
+) -> bool:
+    """Return True if a new value differs enough from the last written one.
 
-    return tuple(lookup_keys)
+    Numeric values are compared against the larger of the absolute deadband
+    and the relative deadband (a percentage of the last written value).  Any
+    other value (strings, None, numeric <-> string transitions) is compared
+    for plain equality.
+    """
+    if not isinstance(old_value, float) or not isinstance(new_value, float):
+        return old_value != new_value
+
+    threshold = max(deadband, abs(old_value) * deadband_percent / 100)
+    return abs(new_value - old_value) > threshold
 
 
 def _build_sensor_definition(
@@ -204,6 +304,11 @@ async def async_setup_entry(
             vehicle_name,
         ),
     ]
+    sensors.extend(
+        TorqueMetricSensor(hass, config_entry.entry_id, vehicle_name, metric)
+        for metric in METRIC_SENSOR_DEFINITIONS
+    )
+    sensors.append(TorqueTripSummarySensor(hass, config_entry.entry_id, vehicle_name))
 
     unique_id_prefix = f"{DOMAIN}_{config_entry.entry_id}_"
     # These unique IDs belong to static sensors that are added above and must be
@@ -212,6 +317,8 @@ async def async_setup_entry(
     skipped_unique_ids = {
         f"{unique_id_prefix}api_endpoint",
         f"{unique_id_prefix}last_torque_update",
+        *(f"{unique_id_prefix}metric_{metric}" for metric in METRIC_SENSOR_DEFINITIONS),
+        f"{unique_id_prefix}trip_summary",
     }
     entity_registry = er.async_get(hass)
     registry_entries = er.async_entries_for_config_entry(
@@ -280,6 +387,7 @@ async def async_setup_entry(
                 vehicle_name,
                 key,
                 definition,
+                statistics=entry_data.get("statistics_aggregator"),
             )
         )
         added_sensors.update({key, normalized_key})
@@ -295,6 +403,23 @@ async def async_setup_entry(
 
     added_sensors.update(disabled_sensor_keys)
 
+    # Derived sensors are added up front; their values follow their inputs
+    for key, definition in sensor_definitions.items():
+        if CONF_EXPRESSION not in definition or key in added_sensors:
+            continue
+        sensors.append(
+            TorqueSensor(
+                hass,
+                config_entry.entry_id,
+                email,
+                vehicle_name,
+                key,
+                definition.copy(),
+                statistics=entry_data.get("statistics_aggregator"),
+            )
+        )
+        added_sensors.add(key)
+
     if restored_sensor_count:
         _LOGGER.info(
             "Restored %d Torque sensor(s) from the entity registry for vehicle '%s'",
@@ -324,6 +449,8 @@ class TorqueSensor(RestoreEntity, SensorEntity):
         vehicle_name: str,
         key: str,
         definition: dict[str, Any],
+        *,
+        statistics: TorqueStatisticsAggregator | None = None,
     ) -> None:
         """Initialize the sensor."""
         self.hass = hass
@@ -348,7 +475,10 @@ class TorqueSensor(RestoreEntity, SensorEntity):
         if definition.get("device_class"):
             self._attr_device_class = definition["device_class"]
 
-        if definition.get("state_class"):
+        # In statistics-only mode measurements are aggregated into the
+        # vehicle's statistics instead of being compiled from their states
+        self._statistics = statistics if definition.get("state_class") else None
+        if definition.get("state_class") and self._statistics is None:
             self._attr_state_class = definition["state_class"]
 
         self._attr_suggested_display_precision = 2
@@ -356,6 +486,30 @@ class TorqueSensor(RestoreEntity, SensorEntity):
         self._attr_native_value = None
         self._attr_extra_state_attributes = {}
 
+        # Change suppression: unchanged values within the deadband are not
+        # written until max_silence seconds have passed since the last write;
+        # the newest suppressed value is then written by the timer wheel.
+        deadband = definition.get(CONF_DEADBAND)
+        if deadband is None:
+            deadband = DEFAULT_DEADBANDS.get(definition.get("device_class"), 0.0)
+        self._deadband: float = deadband
+        self._deadband_percent: float = definition.get(CONF_DEADBAND_PERCENT) or 0.0
+        self._max_silence: float = definition.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE)
+        self._last_write: float | None = None
+        self._suppressed: tuple[Any, PayloadContext] | None = None
+        self._entry_data: dict[str, Any] = {}
+        self._metrics: TorqueIngestMetrics | None = None
+        self._flusher: TorqueStateFlusher | None = None
+
+        # Rate limiting: values within min_interval seconds of the last write
+        # are held and the newest one is written when the interval has passed
+        min_interval = definition.get(CONF_MIN_INTERVAL)
+        if min_interval is None:
+            min_interval = DEFAULT_MIN_INTERVALS.get(definition.get("device_class"), 0)
+        self._min_interval: float = min_interval
+        self._held: tuple[Any, PayloadContext] | None = None
+        self._timer_wheel: TorqueTimerWheel | None = None
+
         _LOGGER.debug(
             "Initialized sensor '%s' (PID: %s) for vehicle '%s'",
             self._attr_name,
@@ -384,6 +538,28 @@ class TorqueSensor(RestoreEntity, SensorEntity):
             self._vehicle_name,
         )
 
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self._entry_id, {})
+        self._entry_data = entry_data
+        self._metrics = entry_data.get("metrics")
+        self._flusher = entry_data.get("state_flusher")
+        if self._flusher is not None:
+            self.async_on_remove(partial(self._flusher.async_discard, self))
+        self._timer_wheel = entry_data.get("timer_wheel")
+        if self._timer_wheel is not None:
+            self.async_on_remove(
+                partial(self._timer_wheel.async_cancel, self._async_write_held)
+            )
+            self.async_on_remove(
+                partial(self._timer_wheel.async_cancel, self._async_heartbeat)
+            )
+        if self._statistics is not None:
+            self._statistics.async_register(
+                _normalize_pid(self._key),
+                self._attr_name,
+                self._attr_native_unit_of_measurement,
+                self._definition.get("device_class"),
+            )
+
         last_state = await self.async_get_last_state()
         if last_state is not None and last_state.state not in (
             None,
@@ -434,9 +610,10 @@ class TorqueSensor(RestoreEntity, SensorEntity):
             )
 
         self.async_on_remove(
-            async_dispatcher_connect(
+            async_register_pid_listener(
                 self.hass,
-                f"{DOMAIN}_{self._entry_id}_update",
+                self._entry_id,
+                self._lookup_keys,
                 self._handle_update,
             )
         )
@@ -448,41 +625,102 @@ class TorqueSensor(RestoreEntity, SensorEntity):
         if payload_key is None:
             return
 
-        value = data[payload_key]
-        old_value = self._attr_native_value
+        # Values arrive typed from the ingest stage, parsed once per payload
+        new_value: Any = data[payload_key]
+
+        now = time.monotonic()
+
+        # Every value counts towards the statistics, only some are written
+        if self._statistics is not None and isinstance(new_value, float):
+            self._statistics.async_record(_normalize_pid(self._key), new_value)
+            if self._last_write is not None and now - self._last_write < STATISTICS_STATE_INTERVAL:
+                return
+
+        # The ingest stage builds the payload's context once for all of its
+        # sensors; only updates from outside it build (or look up) their own
+        if (context := self._entry_data.get("context")) is None:
+            context = _payload_context(data)
+
+        # Hold values arriving within min_interval of the last write; the
+        # vehicle's timer wheel writes the newest one on the trailing edge
+        if (
+            self._timer_wheel is not None
+            and self._min_interval > 0
+            and self._last_write is not None
+            and (wait := self._last_write + self._min_interval - now) > 0
+        ):
+            self._held = (new_value, context)
+            self._timer_wheel.async_schedule(wait, self._async_write_held)
+            return
 
-        try:
-            converted_value = float(value)
-            if not math.isfinite(converted_value):
-                _LOGGER.debug(
-                    "Sensor '%s' received non-finite value '%s', setting to None",
-                    self._attr_name,
-                    value,
+        self._async_write_value(new_value, context, now)
+
+    @callback
+    def _async_write_held(self) -> None:
+        """Write the newest value held back by min_interval."""
+        if (held := self._held) is None:
+            return
+        new_value, context = held
+        self._async_write_value(new_value, context, time.monotonic())
+
+    @callback
+    def _async_heartbeat(self) -> None:
+        """Write the newest suppressed value once max_silence has passed."""
+        if (suppressed := self._suppressed) is None:
+            return
+        new_value, context = suppressed
+        self._async_write_value(new_value, context, time.monotonic())
+
+    @callback
+    def _async_write_value(
+        self, new_value: Any, context: PayloadContext, now: float
+    ) -> None:
+        """Write a new value unless it is within the deadband."""
+        self._held = None
+        old_value = self._attr_native_value
+        session = context.session
+        device_id = context.device_id
+
+        # Skip the state write entirely when nothing meaningful changed
+        if (
+            self._last_write is not None
+            and now - self._last_write < self._max_silence
+            and session == self._attr_extra_state_attributes.get("session")
+            and device_id == self._attr_extra_state_attributes.get("device_id")
+            and not _exceeds_deadband(
+                old_value, new_value, self._deadband, self._deadband_percent
+            )
+        ):
+            # Written by the heartbeat if no other write happens before
+            # max_silence, even when Torque stops uploading
+            self._suppressed = (new_value, context)
+            if self._timer_wheel is not None:
+                self._timer_wheel.async_schedule(
+                    self._last_write + self._max_silence - now, self._async_heartbeat
                 )
-                self._attr_native_value = None
-            else:
-                self._attr_native_value = converted_value
-        except (ValueError, TypeError):
-            self._attr_native_value = value
+            return
 
-        if old_value != self._attr_native_value:
+        self._suppressed = None
+        self._attr_native_value = new_value
+        if old_value != new_value:
             _LOGGER.debug(
                 "Sensor '%s' updated: %s -> %s",
                 self._attr_name,
                 old_value,
-                self._attr_native_value,
+                new_value,
             )
 
-        self._attr_extra_state_attributes = {
-            "last_update": dt_util.utcnow().isoformat(),
-        }
-
-        if "session" in data:
-            self._attr_extra_state_attributes["session"] = data["session"]
-
-        if "id" in data:
-            self._attr_extra_state_attributes["device_id"] = data["id"]
+        # Shared, read-only attributes of the payload (last_update, session,
+        # device_id), built once for all sensors it updates
+        self._attr_extra_state_attributes = context.attributes
 
+        self._last_write = now
+        # Written with the other sensors of the vehicle in the next flush
+        if self._flusher is not None:
+            self._flusher.async_mark_dirty(self)
+            return
+        if self._metrics is not None:
+            self._metrics.state_writes += 1
         self.async_write_ha_state()
 
 
@@ -629,3 +867,139 @@ class TorqueLastUpdateSensor(RestoreEntity, SensorEntity):
         """Update the sensor with the current timestamp when a push occurs."""
         self._attr_native_value = dt_util.utcnow()
         self.async_write_ha_state()
+
+
+class TorqueMetricSensor(SensorEntity):
+    """Diagnostic sensor exposing one of the vehicle's ingest metrics."""
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        vehicle_name: str,
+        metric: str,
+    ) -> None:
+        """Initialize the metric sensor."""
+        self.hass = hass
+        self._entry_id = entry_id
+        self._vehicle_name = vehicle_name
+        self._metric = metric
+
+        definition = METRIC_SENSOR_DEFINITIONS[metric]
+        self._attr_name = definition["name"]
+        self._attr_native_unit_of_measurement = definition["unit"]
+        self._attr_icon = definition["icon"]
+        self._attr_state_class = definition["state_class"]
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_metric_{metric}"
+        self._attr_native_value = None
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information about this Torque vehicle."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry_id)},
+            name=self._vehicle_name,
+            manufacturer="Torque",
+            model="OBD-II",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Handle entity which will be added."""
+        await super().async_added_to_hass()
+
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{DOMAIN}_{self._entry_id}_metrics",
+                self._handle_metrics,
+            )
+        )
+
+    @callback
+    def _handle_metrics(self, snapshot: dict[str, float]) -> None:
+        """Update the sensor from a published metrics snapshot."""
+        self._attr_native_value = snapshot.get(self._metric)
+        self.async_write_ha_state()
+
+
+class TorqueTripSummarySensor(RestoreEntity, SensorEntity):
+    """Sensor showing the duration and statistics of the last trip."""
+
+    _attr_should_poll = False
+    _attr_icon = "mdi:map-marker-distance"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_has_entity_name = True
+    # Per-PID statistics can be large and are already fired as an event
+    _unrecorded_attributes = frozenset({"pids"})
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        vehicle_name: str,
+    ) -> None:
+        """Initialize the trip summary sensor."""
+        self.hass = hass
+        self._entry_id = entry_id
+        self._vehicle_name = vehicle_name
+
+        self._attr_name = "Last Trip"
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_trip_summary"
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {}
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information about this Torque vehicle."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry_id)},
+            name=self._vehicle_name,
+            manufacturer="Torque",
+            model="OBD-II",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Handle entity which will be added."""
+        await super().async_added_to_hass()
+
+        last_state = await self.async_get_last_state()
+        if last_state is not None and last_state.state not in (
+            None,
+            STATE_UNKNOWN,
+            STATE_UNAVAILABLE,
+        ):
+            try:
+                self._attr_native_value = float(last_state.state)
+            except (ValueError, TypeError):
+                _LOGGER.debug(
+                    "Failed to restore the last trip of vehicle '%s'", self._vehicle_name
+                )
+            else:
+                self._attr_extra_state_attributes = {
+                    key: last_state.attributes[key]
+                    for key in TRIP_SUMMARY_ATTRIBUTES
+                    if key in last_state.attributes
+                }
+                self.async_write_ha_state()
+
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{DOMAIN}_{self._entry_id}_trip_summary",
+                self._handle_summary,
+            )
+        )
+
+    @callback
+    def _handle_summary(self, summary: dict[str, Any]) -> None:
+        """Show a finished trip."""
+        self._attr_native_value = round(summary["duration_s"] / 60, 1)
+        self._attr_extra_state_attributes = {
+            key: summary[key] for key in TRIP_SUMMARY_ATTRIBUTES
+        }
+        self.async_write_ha_state()
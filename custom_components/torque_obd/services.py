@@ -0,0 +1,138 @@
+"""Services for the Torque OBD-II integration."""
+from __future__ import annotations
+
+import logging
+import os
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    ATTR_ENTRY_ID,
+    ATTR_FILE,
+    ATTR_MAX_DURATION,
+    ATTR_REQUESTS,
+    ATTR_SPEED,
+    DEFAULT_PROFILE_MAX_DURATION,
+    DEFAULT_PROFILE_REQUESTS,
+    DEFAULT_REPLAY_SPEED,
+    DOMAIN,
+    SERVICE_IMPORT_TRACK_LOG,
+    SERVICE_PROFILE,
+    SERVICE_REPLAY,
+)
+from .profiler import TorqueProfiler
+from .replay import async_replay_file
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_REQUESTS, default=DEFAULT_PROFILE_REQUESTS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10000)
+        ),
+        vol.Optional(ATTR_MAX_DURATION, default=DEFAULT_PROFILE_MAX_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+    }
+)
+
+REPLAY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_FILE): cv.string,
+        vol.Optional(ATTR_SPEED, default=DEFAULT_REPLAY_SPEED): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+
+IMPORT_TRACK_LOG_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_FILE): cv.string,
+    }
+)
+
+
+def _resolve_file(hass: HomeAssistant, file: str) -> str:
+    """Resolve a file relative to the config directory and check access."""
+    path = os.path.abspath(hass.config.path(file))
+    config_dir = os.path.abspath(hass.config.config_dir)
+    if not (path.startswith(config_dir + os.sep) or hass.config.is_allowed_path(path)):
+        raise HomeAssistantError(f"Access to {file} is not allowed")
+    return path
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Torque OBD-II services."""
+
+    async def _async_profile(call: ServiceCall) -> None:
+        """Profile the ingest path for the next requests."""
+        domain_data = hass.data.get(DOMAIN, {})
+        if domain_data.get("view") is None:
+            raise HomeAssistantError("No Torque OBD-II vehicle is set up")
+
+        TorqueProfiler(
+            hass, call.data[ATTR_REQUESTS], call.data[ATTR_MAX_DURATION]
+        ).async_start()
+
+    async def _async_replay(call: ServiceCall) -> ServiceResponse:
+        """Replay a capture file through a vehicle's ingest pipeline."""
+        domain_data = hass.data.get(DOMAIN, {})
+        entry_id = call.data[ATTR_ENTRY_ID]
+        if entry_id not in domain_data or domain_data.get("view") is None:
+            raise HomeAssistantError(f"Torque OBD-II vehicle {entry_id} is not loaded")
+
+        path = _resolve_file(hass, call.data[ATTR_FILE])
+        try:
+            result = await async_replay_file(
+                hass, domain_data["view"], entry_id, path, call.data[ATTR_SPEED]
+            )
+        except (OSError, ValueError) as err:
+            raise HomeAssistantError(f"Cannot replay {call.data[ATTR_FILE]}: {err}") from err
+        return result.as_dict()
+
+    async def _async_import_track_log(call: ServiceCall) -> ServiceResponse:
+        """Import a Torque trackLog.csv into a vehicle's statistics."""
+        entry_data = hass.data.get(DOMAIN, {}).get(call.data[ATTR_ENTRY_ID])
+        if entry_data is None or "track_log_importer" not in entry_data:
+            raise HomeAssistantError(
+                f"Torque OBD-II vehicle {call.data[ATTR_ENTRY_ID]} is not loaded"
+            )
+
+        path = _resolve_file(hass, call.data[ATTR_FILE])
+        try:
+            return await entry_data["track_log_importer"].async_import(path)
+        except OSError as err:
+            raise HomeAssistantError(f"Cannot import {call.data[ATTR_FILE]}: {err}") from err
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, _async_profile, schema=PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPLAY,
+        _async_replay,
+        schema=REPLAY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_TRACK_LOG,
+        _async_import_track_log,
+        schema=IMPORT_TRACK_LOG_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    _LOGGER.debug("Registered %s services", DOMAIN)
@@ -0,0 +1,117 @@
+"""Opt-in raw upload recorder for Torque OBD-II sessions.
+
+Every upload of a vehicle is appended to a per-session file named after the
+Torque ``session`` field.  Records are length-prefixed JSON (4-byte big
+endian length followed by the UTF-8 JSON payload) inside a gzip stream.
+Each flush appends a new gzip member, which gzip readers handle as one
+continuous stream.  Files are rotated to a new part once they exceed the
+maximum size.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+_LENGTH_BYTES = 4
+_UNSAFE_SESSION_CHARS = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+class TorqueSessionRecorder:
+    """Buffer a vehicle's uploads and append them to session logs.
+
+    ``async_record`` only keeps a reference to the payload; encoding,
+    compression and disk I/O happen in the executor when the buffer is
+    flushed, either on a timer or once ``flush_batch`` uploads are pending.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        directory: str,
+        max_file_size: int,
+        flush_batch: int,
+    ) -> None:
+        """Initialize the recorder."""
+        self._hass = hass
+        self._directory = directory
+        self._max_file_size = max_file_size
+        self._flush_batch = flush_batch
+        self._pending: dict[str, list[dict[str, Any]]] = {}
+        self._pending_count = 0
+        # Only used from the executor
+        self._parts: dict[str, int] = {}
+        self._write_lock = threading.Lock()
+
+        self.recorded = 0
+
+    @callback
+    def async_record(self, payload: dict[str, Any]) -> None:
+        """Queue an upload for the log of its session."""
+        session = _UNSAFE_SESSION_CHARS.sub("", str(payload.get("session") or "")) or "unknown"
+        self._pending.setdefault(session, []).append(payload)
+        self._pending_count += 1
+        self.recorded += 1
+        if self._pending_count >= self._flush_batch:
+            self.async_flush()
+
+    @callback
+    def async_flush(self, now: datetime | None = None) -> None:
+        """Hand the buffered uploads to the executor for writing."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        self._pending_count = 0
+        self._hass.async_add_executor_job(self._write, pending)
+
+    def _path(self, session: str) -> str:
+        """Return the file the next records of a session go to."""
+        part = self._parts.get(session, 0)
+        while True:
+            path = os.path.join(self._directory, f"{session}.{part:03d}.gz")
+            if not os.path.exists(path) or os.path.getsize(path) < self._max_file_size:
+                break
+            part += 1
+        self._parts[session] = part
+        return path
+
+    def _write(self, pending: dict[str, list[dict[str, Any]]]) -> None:
+        """Append buffered uploads to their session logs (runs in the executor)."""
+        with self._write_lock:
+            os.makedirs(self._directory, exist_ok=True)
+            for session, payloads in pending.items():
+                path = self._path(session)
+                try:
+                    with gzip.open(path, "ab") as file:
+                        for payload in payloads:
+                            data = json.dumps(payload, separators=(",", ":")).encode()
+                            file.write(len(data).to_bytes(_LENGTH_BYTES, "big"))
+                            file.write(data)
+                except OSError as err:
+                    _LOGGER.error("Failed to write Torque session log %s: %s", path, err)
+                    continue
+                _LOGGER.debug("Appended %d upload(s) to %s", len(payloads), path)
+
+
+def iter_session_log(path: str) -> Iterator[dict[str, Any]]:
+    """Yield the uploads stored in a session log file, one at a time."""
+    with gzip.open(path, "rb") as file:
+        while header := file.read(_LENGTH_BYTES):
+            if len(header) < _LENGTH_BYTES:
+                break
+            length = int.from_bytes(header, "big")
+            data = file.read(length)
+            if len(data) < length:
+                _LOGGER.warning("Truncated record at the end of %s", path)
+                break
+            yield json.loads(data)
@@ -0,0 +1,189 @@
+"""Batched state writes for a vehicle's sensors.
+
+Sensors updated from a payload do not write their state themselves; they
+mark themselves dirty and the vehicle's ``TorqueStateFlusher`` writes every
+dirty sensor in one event loop pass.  An optional minimum interval between
+passes bounds the number of state machine bursts per second per vehicle,
+however often Torque uploads; a sensor updated several times in between is
+written once, with its latest value.
+
+Sensors with a ``min_interval`` hold values arriving within the interval
+and write the newest one on the trailing edge, and values suppressed by
+the deadband are written once ``max_silence`` has passed.  Those deferred
+writes run from one ``TorqueTimerWheel`` per vehicle: deadlines are rounded
+up to ``TIMER_WHEEL_RESOLUTION`` slots and only the earliest slot has an
+event loop timer, instead of one timer per sensor.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import heapq
+import logging
+import math
+import time
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+
+from .const import TIMER_WHEEL_RESOLUTION
+from .metrics import TorqueIngestMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TorqueStateFlusher:
+    """Write the state of a vehicle's dirty entities in batches."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        vehicle_name: str,
+        min_interval: float = 0.0,
+        metrics: TorqueIngestMetrics | None = None,
+    ) -> None:
+        """Initialize the flusher."""
+        self._loop = loop
+        self._vehicle_name = vehicle_name
+        self._min_interval = min_interval
+        self._metrics = metrics
+        # Insertion-ordered set of the entities to write
+        self._dirty: dict[Entity, None] = {}
+        self._handle: asyncio.Handle | None = None
+        self._last_flush = -min_interval
+
+        self.flushes = 0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of entities waiting to be written."""
+        return len(self._dirty)
+
+    @callback
+    def async_mark_dirty(self, entity: Entity) -> None:
+        """Write an entity's state in the next flush, scheduling one if needed."""
+        self._dirty[entity] = None
+        if self._handle is not None:
+            return
+
+        delay = self._last_flush + self._min_interval - time.monotonic()
+        if delay > 0:
+            self._handle = self._loop.call_later(delay, self.async_flush)
+        else:
+            self._handle = self._loop.call_soon(self.async_flush)
+
+    @callback
+    def async_discard(self, entity: Entity) -> None:
+        """Forget an entity that is being removed."""
+        self._dirty.pop(entity, None)
+
+    @callback
+    def async_flush(self) -> None:
+        """Write the state of every dirty entity."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+        self._last_flush = time.monotonic()
+        self.flushes += 1
+
+        for entity in dirty:
+            try:
+                entity.async_write_ha_state()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error writing state of %s", entity.entity_id)
+        if self._metrics is not None:
+            self._metrics.state_writes += len(dirty)
+        _LOGGER.debug("Flushed %d state(s) for '%s'", len(dirty), self._vehicle_name)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel the pending flush."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._dirty.clear()
+
+
+class TorqueTimerWheel:
+    """Run a vehicle's deferred actions from slots sharing one timer."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        resolution: float = TIMER_WHEEL_RESOLUTION,
+    ) -> None:
+        """Initialize the timer wheel."""
+        self._loop = loop
+        self._resolution = resolution
+        # Slot -> actions due in it (insertion-ordered set)
+        self._slots: dict[int, dict[Callable[[], None], None]] = {}
+        self._slot_heap: list[int] = []
+        # Action -> its slot, so an action is only ever scheduled once
+        self._scheduled: dict[Callable[[], None], int] = {}
+        self._handle: asyncio.TimerHandle | None = None
+        self._armed_slot: int | None = None
+
+    @property
+    def pending(self) -> int:
+        """Return the number of scheduled actions."""
+        return len(self._scheduled)
+
+    @callback
+    def async_schedule(self, delay: float, action: Callable[[], None]) -> None:
+        """Run ``action`` once, no sooner than ``delay`` seconds from now.
+
+        An action that is already scheduled keeps its slot.
+        """
+        if action in self._scheduled:
+            return
+        slot = math.ceil((self._loop.time() + delay) / self._resolution)
+        if (actions := self._slots.get(slot)) is None:
+            actions = self._slots[slot] = {}
+            heapq.heappush(self._slot_heap, slot)
+        actions[action] = None
+        self._scheduled[action] = slot
+        if self._armed_slot is None or slot < self._armed_slot:
+            self._arm(slot)
+
+    @callback
+    def async_cancel(self, action: Callable[[], None]) -> None:
+        """Unschedule an action (its slot stays until it comes up)."""
+        if (slot := self._scheduled.pop(action, None)) is not None:
+            self._slots[slot].pop(action, None)
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop every scheduled action."""
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = None
+        self._armed_slot = None
+        self._slots.clear()
+        self._slot_heap.clear()
+        self._scheduled.clear()
+
+    def _arm(self, slot: int) -> None:
+        """Set the single event loop timer for a slot."""
+        if self._handle is not None:
+            self._handle.cancel()
+        self._armed_slot = slot
+        self._handle = self._loop.call_at(slot * self._resolution, self._async_tick, slot)
+
+    @callback
+    def _async_tick(self, due_slot: int) -> None:
+        """Run the actions of every slot that is due and re-arm the timer."""
+        self._handle = None
+        self._armed_slot = None
+        heap = self._slot_heap
+        while heap and heap[0] <= due_slot:
+            for action in self._slots.pop(heapq.heappop(heap)):
+                del self._scheduled[action]
+                try:
+                    action()
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error running deferred action %s", action)
+        if heap:
+            self._arm(heap[0])
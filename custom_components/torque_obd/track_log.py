@@ -0,0 +1,281 @@
+"""Import Torque ``trackLog.csv`` exports into long-term statistics.
+
+Torque logs every drive to a CSV file: a header row of ``Name(unit)``
+columns followed by one row per log interval, with ``-`` for readings that
+were not available.  A new header row is written each time logging
+restarts.  The file is streamed row by row in the executor and reduced to
+hourly mean/min/max buckets per column, so memory grows with the number of
+columns and hours covered, never with the size of the file.  The buckets
+are written as the vehicle's long-term statistics, except for hours the
+recorder already has: existing statistics win over an imported log.  In
+statistics-only mode the hour being aggregated is merged with the import.
+"""
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, tzinfo
+import logging
+import os
+import re
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .long_term_statistics import (
+    async_add_statistics,
+    async_recorded_hours,
+    statistic_id,
+    statistic_metadata,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACK_LOG_TIME_COLUMN = "Device Time"
+TRACK_LOG_TIME_FORMAT = "%d-%b-%Y %H"
+
+# Columns that are not sensor readings
+_SKIPPED_COLUMNS = frozenset({"GPS Time", TRACK_LOG_TIME_COLUMN, "Longitude", "Latitude"})
+_MISSING_VALUES = frozenset({"", "-"})
+_UNIT_SUFFIX = re.compile(r"^(?P<name>.*?)\s*\((?P<unit>[^()]*)\)$")
+
+# Suffixes given to drop-folder files once they have been handled
+IMPORTED_SUFFIX = ".imported"
+FAILED_SUFFIX = ".failed"
+
+
+@dataclass(slots=True)
+class TrackLogColumn:
+    """Hourly aggregates of one CSV column."""
+
+    name: str
+    unit: str | None
+    # Hour start -> [sum, count, min, max]
+    buckets: dict[datetime, list[float]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class TrackLog:
+    """The aggregated contents of a track log."""
+
+    rows: int = 0
+    skipped_rows: int = 0
+    columns: dict[str, TrackLogColumn] = field(default_factory=dict)
+
+
+def split_column(header: str) -> tuple[str, str | None]:
+    """Split a ``Name(unit)`` column header into name and unit."""
+    header = header.strip()
+    if (match := _UNIT_SUFFIX.match(header)) is None:
+        return header, None
+    return match["name"], match["unit"].strip() or None
+
+
+def parse_track_log(path: str, time_zone: tzinfo) -> TrackLog:
+    """Stream a track log and aggregate every column per hour.
+
+    Runs in the executor.  ``Device Time`` is the phone's local time and is
+    interpreted in ``time_zone``; only its date and hour are parsed, once
+    per hour seen, as nothing finer is needed for the buckets.
+    """
+    track_log = TrackLog()
+    hours: dict[str, datetime | None] = {}
+    time_index: int | None = None
+    value_columns: list[tuple[int, TrackLogColumn]] = []
+
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as file:
+        for row in csv.reader(file):
+            if time_index is None or (
+                len(row) > time_index and row[time_index].strip() == TRACK_LOG_TIME_COLUMN
+            ):
+                header = [cell.strip() for cell in row]
+                if TRACK_LOG_TIME_COLUMN not in header:
+                    track_log.skipped_rows += 1
+                    continue
+                time_index = header.index(TRACK_LOG_TIME_COLUMN)
+                value_columns = []
+                for index, cell in enumerate(header):
+                    if not cell or cell in _SKIPPED_COLUMNS:
+                        continue
+                    column = track_log.columns.get(cell)
+                    if column is None:
+                        column = track_log.columns[cell] = TrackLogColumn(*split_column(cell))
+                    value_columns.append((index, column))
+                continue
+
+            if len(row) <= time_index:
+                track_log.skipped_rows += 1
+                continue
+            hour_text = row[time_index].strip().partition(":")[0]
+            if hour_text not in hours:
+                try:
+                    hours[hour_text] = datetime.strptime(
+                        hour_text, TRACK_LOG_TIME_FORMAT
+                    ).replace(tzinfo=time_zone)
+                except ValueError:
+                    hours[hour_text] = None
+            if (hour := hours[hour_text]) is None:
+                track_log.skipped_rows += 1
+                continue
+
+            track_log.rows += 1
+            for index, column in value_columns:
+                if index >= len(row) or (cell := row[index].strip()) in _MISSING_VALUES:
+                    continue
+                try:
+                    value = float(cell)
+                except ValueError:
+                    continue
+                if (bucket := column.buckets.get(hour)) is None:
+                    column.buckets[hour] = [value, 1, value, value]
+                    continue
+                bucket[0] += value
+                bucket[1] += 1
+                if value < bucket[2]:
+                    bucket[2] = value
+                elif value > bucket[3]:
+                    bucket[3] = value
+
+    return track_log
+
+
+class TorqueTrackLogImporter:
+    """Import a vehicle's track logs, on request or from a drop folder.
+
+    Any ``.csv`` file placed in the drop folder is imported on the next
+    scan and renamed with an ``.imported`` (or ``.failed``) suffix.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, directory: str) -> None:
+        """Initialize the importer."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self.directory = directory
+        self._scanning = False
+
+    def _column_pids(self) -> dict[str, str]:
+        """Map lower-case sensor names to the PID they belong to."""
+        domain_data = self._hass.data[DOMAIN]
+        names = {
+            definition["name"].lower(): pid
+            for pid, definition in domain_data.get("sensor_definitions", {}).items()
+            if definition.get("name")
+        }
+        # Names learned from the vehicle's uploads match its own CSV headers
+        for pid, learned in domain_data[self._entry_id].get("sensor_names", {}).items():
+            for name in (learned.get("short_name"), learned.get("full_name")):
+                if name:
+                    names[name.lower()] = pid
+        return names
+
+    async def async_import(self, path: str) -> dict[str, Any]:
+        """Import a track log and return a summary of what was written."""
+        if "recorder" not in self._hass.config.components:
+            raise HomeAssistantError("The recorder is required to import track logs")
+
+        entry_data = self._hass.data[DOMAIN][self._entry_id]
+        track_log = await self._hass.async_add_executor_job(
+            parse_track_log, path, dt_util.get_time_zone(self._hass.config.time_zone)
+        )
+
+        column_pids = self._column_pids()
+        sensor_definitions = self._hass.data[DOMAIN].get("sensor_definitions", {})
+        aggregator = entry_data.get("statistics_aggregator")
+        hours = 0
+        skipped_hours = 0
+        statistic_ids = []
+        for header, column in track_log.columns.items():
+            if not column.buckets:
+                continue
+            pid = column_pids.get(column.name.lower())
+            definition = sensor_definitions.get(pid, {}) if pid else {}
+            key = pid or column.name
+            statistic = statistic_id(entry_data["slug"], key)
+            metadata = statistic_metadata(
+                statistic,
+                f"{entry_data['vehicle_name']} {column.name}",
+                column.unit or definition.get("unit"),
+                definition.get("device_class"),
+            )
+            buckets = sorted(column.buckets.items())
+            recorded = await async_recorded_hours(
+                self._hass, statistic, buckets[0][0], buckets[-1][0] + timedelta(hours=1)
+            )
+            statistics = []
+            merged = 0
+            for start, bucket in buckets:
+                if aggregator is not None and aggregator.async_merge(
+                    key, start.timestamp(), bucket
+                ):
+                    merged += 1
+                elif start in recorded:
+                    skipped_hours += 1
+                else:
+                    total, count, minimum, maximum = bucket
+                    statistics.append(
+                        {
+                            "start": start,
+                            "mean": total / count,
+                            "min": minimum,
+                            "max": maximum,
+                        }
+                    )
+            if statistics:
+                async_add_statistics(self._hass, metadata, statistics)
+            if statistics or merged:
+                hours += len(statistics) + merged
+                statistic_ids.append(statistic)
+            _LOGGER.debug(
+                "Importing %d hour(s) of '%s' as %s (%d merged with live statistics)",
+                len(statistics) + merged,
+                header,
+                statistic,
+                merged,
+            )
+
+        _LOGGER.info(
+            "Imported %d row(s) of %s for '%s' into %d statistic(s)",
+            track_log.rows,
+            path,
+            entry_data["vehicle_name"],
+            len(statistic_ids),
+        )
+        return {
+            "rows": track_log.rows,
+            "skipped_rows": track_log.skipped_rows,
+            "statistics": statistic_ids,
+            "hours": hours,
+            "skipped_hours": skipped_hours,
+        }
+
+    def _pending_files(self) -> list[str]:
+        """Return the CSV files waiting in the drop folder (runs in the executor)."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            os.path.join(self.directory, name)
+            for name in names
+            if name.lower().endswith(".csv")
+        )
+
+    async def async_scan(self, now: datetime | None = None) -> None:
+        """Import every track log in the drop folder."""
+        if self._scanning or "recorder" not in self._hass.config.components:
+            return
+        self._scanning = True
+        try:
+            for path in await self._hass.async_add_executor_job(self._pending_files):
+                suffix = IMPORTED_SUFFIX
+                try:
+                    await self.async_import(path)
+                except (OSError, HomeAssistantError) as err:
+                    _LOGGER.error("Failed to import track log %s: %s", path, err)
+                    suffix = FAILED_SUFFIX
+                await self._hass.async_add_executor_job(os.replace, path, path + suffix)
+        finally:
+            self._scanning = False
@@ -0,0 +1,239 @@
+"""Streaming per-session trip summaries.
+
+Each numeric PID of the running Torque session is summarized in constant
+memory: count, min, max, mean and standard deviation are updated with
+Welford's algorithm and p50/p95/p99 are estimated with the P² algorithm
+(Jain & Chlamtac), which tracks a quantile with five markers instead of
+keeping the samples.  A ten-hour drive costs the same as a ten-minute one.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+import math
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_TRIP_SUMMARY = f"{DOMAIN}_trip_summary"
+
+TRIP_QUANTILES = (0.5, 0.95, 0.99)
+
+_MARKERS = 5
+
+
+class P2Quantile:
+    """Estimate a quantile of a stream with the P² algorithm."""
+
+    __slots__ = ("_quantile", "_heights", "_positions", "_desired", "_increments")
+
+    def __init__(self, quantile: float) -> None:
+        """Initialize the estimator."""
+        self._quantile = quantile
+        self._heights: list[float] = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * quantile, 1 + 4 * quantile, 3 + 2 * quantile, 5]
+        self._increments = [0, quantile / 2, quantile, (1 + quantile) / 2, 1]
+
+    def add(self, value: float) -> None:
+        """Add a value to the stream."""
+        heights = self._heights
+        if len(heights) < _MARKERS:
+            heights.append(value)
+            heights.sort()
+            return
+
+        positions = self._positions
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        for marker in range(cell + 1, _MARKERS):
+            positions[marker] += 1
+        desired = self._desired
+        for marker, increment in enumerate(self._increments):
+            desired[marker] += increment
+
+        # Move the middle markers towards their desired positions
+        for marker in (1, 2, 3):
+            offset = desired[marker] - positions[marker]
+            if (offset >= 1 and positions[marker + 1] - positions[marker] > 1) or (
+                offset <= -1 and positions[marker - 1] - positions[marker] < -1
+            ):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(marker, step)
+                if not heights[marker - 1] < height < heights[marker + 1]:
+                    height = heights[marker] + step * (
+                        heights[marker + step] - heights[marker]
+                    ) / (positions[marker + step] - positions[marker])
+                heights[marker] = height
+                positions[marker] += step
+
+    def _parabolic(self, marker: int, step: int) -> float:
+        """Return the piecewise-parabolic prediction of a marker's height."""
+        heights = self._heights
+        positions = self._positions
+        below = positions[marker] - positions[marker - 1]
+        above = positions[marker + 1] - positions[marker]
+        return heights[marker] + step / (below + above) * (
+            (below + step) * (heights[marker + 1] - heights[marker]) / above
+            + (above - step) * (heights[marker] - heights[marker - 1]) / below
+        )
+
+    @property
+    def value(self) -> float | None:
+        """Return the current estimate."""
+        heights = self._heights
+        if not heights:
+            return None
+        if len(heights) < _MARKERS:
+            return heights[round(self._quantile * (len(heights) - 1))]
+        return heights[2]
+
+
+class PidSummary:
+    """Running statistics of one PID."""
+
+    __slots__ = ("count", "mean", "_m2", "minimum", "maximum", "quantiles")
+
+    def __init__(self) -> None:
+        """Initialize the summary."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.quantiles = tuple(P2Quantile(quantile) for quantile in TRIP_QUANTILES)
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        for quantile in self.quantiles:
+            quantile.add(value)
+
+    def as_dict(self) -> dict[str, float | int | None]:
+        """Return the summary as event data."""
+        summary: dict[str, float | int | None] = {
+            "count": self.count,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": round(self.mean, 4),
+            "stddev": round(math.sqrt(self._m2 / self.count), 4),
+        }
+        for quantile, estimator in zip(TRIP_QUANTILES, self.quantiles):
+            summary[f"p{round(quantile * 100)}"] = estimator.value
+        return summary
+
+
+class TorqueTripSummarizer:
+    """Summarize a vehicle's Torque sessions.
+
+    A trip ends when an upload of another session arrives or when no upload
+    was received for ``idle_timeout`` seconds.  Its summary is fired as a
+    ``torque_obd_trip_summary`` event and sent to the trip summary sensor.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, vehicle_name: str, idle_timeout: float
+    ) -> None:
+        """Initialize the summarizer."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._vehicle_name = vehicle_name
+        self._idle_timeout = idle_timeout
+        self._session: str | None = None
+        self._pids: dict[str, PidSummary] = {}
+        self._payloads = 0
+        self._start: float | None = None
+        self._end: float | None = None
+        self._last_received = 0.0
+
+        self.last_summary: dict[str, Any] | None = None
+
+    @callback
+    def async_record(self, payload: dict[str, Any], values: dict[str, float]) -> None:
+        """Add an upload's numeric PID values to its session's trip."""
+        if (session := payload.get("session")) is None or not values:
+            return
+        session = str(session)
+        if session != self._session:
+            self.async_end_trip()
+            self._session = session
+
+        self._last_received = time.monotonic()
+        try:
+            timestamp = float(payload["time"]) / 1000
+        except (KeyError, TypeError, ValueError):
+            timestamp = time.time()
+        if self._start is None:
+            self._start = timestamp
+        self._end = timestamp
+        self._payloads += 1
+
+        pids = self._pids
+        for pid, value in values.items():
+            if (summary := pids.get(pid)) is None:
+                summary = pids[pid] = PidSummary()
+            summary.add(value)
+
+    @callback
+    def async_check_idle(self, now: datetime | None = None) -> None:
+        """End the trip once Torque stopped uploading."""
+        if (
+            self._session is not None
+            and time.monotonic() - self._last_received >= self._idle_timeout
+        ):
+            self.async_end_trip()
+
+    @callback
+    def async_end_trip(self) -> None:
+        """Emit the summary of the running trip and start over."""
+        if self._session is None or self._start is None or self._end is None:
+            return
+
+        summary = {
+            "entry_id": self._entry_id,
+            "vehicle": self._vehicle_name,
+            "session": self._session,
+            "start": datetime.fromtimestamp(self._start, timezone.utc).isoformat(),
+            "end": datetime.fromtimestamp(self._end, timezone.utc).isoformat(),
+            "duration_s": round(self._end - self._start, 1),
+            "payloads": self._payloads,
+            "pids": {pid: pid_summary.as_dict() for pid, pid_summary in self._pids.items()},
+        }
+        self._session = None
+        self._pids = {}
+        self._payloads = 0
+        self._start = self._end = None
+
+        self.last_summary = summary
+        _LOGGER.info(
+            "Trip %s of '%s' ended after %.0f s (%d uploads, %d PIDs)",
+            summary["session"],
+            self._vehicle_name,
+            summary["duration_s"],
+            summary["payloads"],
+            len(summary["pids"]),
+        )
+        self._hass.bus.async_fire(EVENT_TRIP_SUMMARY, summary)
+        async_dispatcher_send(self._hass, f"{DOMAIN}_{self._entry_id}_trip_summary", summary)
@@ -0,0 +1,162 @@
+"""Typed parsing of Torque PID values.
+
+Torque sends every value as a string.  Most PIDs are numbers, a few are
+text (``k03`` Fuel System Status) and some arrive as lists.  Instead of a
+``float()`` try/except per value and per entity, each PID's type is learned
+from its first values and the PID is then parsed with a cached converter
+that never raises: numbers are recognized with a regular expression before
+``float()`` is called, text is passed through untouched.  A learned type
+is dropped and learned again once a PID sends enough values of another
+type in a row, e.g. a numeric PID that reported ``-`` until the ECU
+answered.  Payloads are parsed once per key in the ingest stage, so
+sensors and the other consumers receive typed values.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+import math
+import re
+from typing import Any
+
+from .metrics import TorqueIngestMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+VALUE_TYPE_NUMERIC = "numeric"
+VALUE_TYPE_STRING = "string"
+VALUE_TYPE_LIST = "list"
+
+# A PID's type is fixed after this many consecutive values of the same type,
+# and learned again after this many consecutive values of another type
+VALUE_TYPE_SAMPLES = 3
+
+# Returned by a converter for a value that does not fit the learned type
+_MISMATCH = object()
+
+# Everything float() accepts that Torque can send, so float() cannot raise
+_NUMBER = re.compile(
+    r"\s*[+-]?(?:(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?|inf(?:inity)?|nan)\s*",
+    re.IGNORECASE,
+)
+
+
+def value_type(value: Any) -> str:
+    """Return the type of a single raw value."""
+    if isinstance(value, (list, tuple)):
+        return VALUE_TYPE_LIST
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return VALUE_TYPE_NUMERIC
+    if isinstance(value, str) and _NUMBER.fullmatch(value):
+        return VALUE_TYPE_NUMERIC
+    return VALUE_TYPE_STRING
+
+
+def parse_value(value: Any) -> Any:
+    """Parse a value of unknown type.
+
+    Numbers become a float (None if not finite), a list is reduced to its
+    first element and anything else is returned unchanged.
+    """
+    if isinstance(value, (list, tuple)):
+        return parse_value(value[0]) if value else None
+    if isinstance(value, str):
+        if not _NUMBER.fullmatch(value):
+            return value
+    elif not isinstance(value, (int, float)) or isinstance(value, bool):
+        return value
+    number = float(value)
+    return number if math.isfinite(number) else None
+
+
+class TorqueValueParser:
+    """Learn each PID's value type and parse its values accordingly."""
+
+    def __init__(self, metrics: TorqueIngestMetrics | None = None) -> None:
+        """Initialize the parser."""
+        self._metrics = metrics
+        self._converters: dict[str, Callable[[Any], Any]] = {}
+        # PID -> (type of its latest values, number of them in a row)
+        self._samples: dict[str, tuple[str, int]] = {}
+        self._types: dict[str, str] = {}
+        # PID -> number of values in a row that did not fit its learned type
+        self._mismatches: dict[str, int] = {}
+
+    @property
+    def types(self) -> dict[str, str]:
+        """Return the learned value type of each PID."""
+        return dict(self._types)
+
+    def parse(self, pid: str, value: Any) -> Any:
+        """Parse a value of a PID with the PID's converter."""
+        if (converter := self._converters.get(pid)) is not None:
+            parsed = converter(value)
+            if parsed is _MISMATCH:
+                return self._mismatch(pid, value)
+            if self._mismatches and pid in self._mismatches:
+                del self._mismatches[pid]
+            return parsed
+
+        # Still learning: parse generically and count the type streak
+        sample_type = value_type(value)
+        last_type, count = self._samples.get(pid, (sample_type, 0))
+        count = count + 1 if last_type == sample_type else 1
+        if count >= VALUE_TYPE_SAMPLES:
+            self._samples.pop(pid, None)
+            self._types[pid] = sample_type
+            self._converters[pid] = self._converter(sample_type)
+            _LOGGER.debug("Learned value type of PID '%s': %s", pid, sample_type)
+        else:
+            self._samples[pid] = (sample_type, count)
+        return self._count_malformed(parse_value(value), sample_type)
+
+    def _mismatch(self, pid: str, value: Any) -> Any:
+        """Parse a value that does not fit its PID's learned type.
+
+        Numeric PIDs report it as malformed (None) and text PIDs pass the
+        parsed value on; after VALUE_TYPE_SAMPLES such values in a row the
+        PID's type is learned again.
+        """
+        learned_type = self._types[pid]
+        count = self._mismatches.get(pid, 0) + 1
+        if count < VALUE_TYPE_SAMPLES:
+            self._mismatches[pid] = count
+            if learned_type == VALUE_TYPE_NUMERIC:
+                return self._count_malformed(None, VALUE_TYPE_NUMERIC)
+            return parse_value(value)
+
+        del self._mismatches[pid]
+        del self._converters[pid]
+        del self._types[pid]
+        _LOGGER.debug("Relearning value type of PID '%s' (was %s)", pid, learned_type)
+        return self.parse(pid, value)
+
+    def _converter(self, learned_type: str) -> Callable[[Any], Any]:
+        """Return the converter for a learned value type."""
+        if learned_type == VALUE_TYPE_NUMERIC:
+            return self._parse_number
+        if learned_type == VALUE_TYPE_LIST:
+            return parse_value
+        return _parse_text
+
+    def _parse_number(self, value: Any) -> Any:
+        """Parse a value of a numeric PID; None if it is not a finite number."""
+        number = parse_value(value)
+        if type(number) is float:
+            return number
+        if isinstance(number, str):
+            return _MISMATCH
+        return self._count_malformed(None, VALUE_TYPE_NUMERIC)
+
+    def _count_malformed(self, parsed: Any, expected_type: str) -> Any:
+        """Count a numeric value that did not parse to a finite number."""
+        if parsed is None and expected_type == VALUE_TYPE_NUMERIC and self._metrics is not None:
+            self._metrics.malformed_values += 1
+        return parsed
+
+
+def _parse_text(value: Any) -> Any:
+    """Return a value of a text PID unchanged, unless it is a number."""
+    if isinstance(value, str) and _NUMBER.fullmatch(value):
+        return _MISMATCH
+    return value
@@ -0,0 +1,193 @@
+"""WebSocket API for the Torque OBD-II integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import ATTR_ENTRY_ID, DEFAULT_SUBSCRIBE_MAX_RATE, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the Torque OBD-II WebSocket commands."""
+    websocket_api.async_register_command(hass, websocket_history)
+    websocket_api.async_register_command(hass, websocket_subscribe)
+    _LOGGER.debug("Registered %s WebSocket commands", DOMAIN)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/history",
+        vol.Required(ATTR_ENTRY_ID): str,
+        vol.Optional("pids"): [str],
+        vol.Optional("since"): vol.Coerce(float),
+        vol.Optional("max_points"): vol.All(vol.Coerce(int), vol.Range(min=2, max=10000)),
+    }
+)
+@callback
+def websocket_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the recent values of a vehicle's PIDs."""
+    entry_data = hass.data.get(DOMAIN, {}).get(msg[ATTR_ENTRY_ID])
+    if entry_data is None or entry_data.get("history") is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Torque OBD-II vehicle not loaded"
+        )
+        return
+
+    connection.send_result(
+        msg["id"],
+        {
+            "pids": entry_data["history"].series(
+                msg.get("pids"), msg.get("since"), msg.get("max_points")
+            )
+        },
+    )
+
+
+class TorqueSubscription:
+    """Coalesce a vehicle's PID values into rate-limited delta frames.
+
+    Values are merged per PID (latest wins) between frames.  A frame only
+    carries the PIDs whose value differs from what the client was sent
+    last, and frames are sent at most once per ``min_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        send: Callable[[dict[str, float]], None],
+        pids: set[str] | None,
+        min_interval: float,
+    ) -> None:
+        """Initialize the subscription."""
+        self._loop = loop
+        self._send = send
+        self._pids = pids
+        self._min_interval = min_interval
+        self._pending: dict[str, float] = {}
+        self._sent: dict[str, float] = {}
+        self._last_frame = -min_interval
+        self._timer: asyncio.TimerHandle | None = None
+
+    @callback
+    def async_update(self, values: dict[str, float]) -> None:
+        """Merge new values and send or schedule a frame."""
+        if self._pids is None:
+            self._pending.update(values)
+        else:
+            for pid, value in values.items():
+                if pid in self._pids:
+                    self._pending[pid] = value
+        if not self._pending or self._timer is not None:
+            return
+
+        delay = self._last_frame + self._min_interval - time.monotonic()
+        if delay <= 0:
+            self._async_send_frame()
+        else:
+            self._timer = self._loop.call_later(delay, self._async_send_frame)
+
+    @callback
+    def _async_send_frame(self) -> None:
+        """Send the values that changed since the last frame."""
+        self._timer = None
+        pending, self._pending = self._pending, {}
+        sent = self._sent
+        frame = {pid: value for pid, value in pending.items() if sent.get(pid) != value}
+        if not frame:
+            return
+        sent.update(frame)
+        self._last_frame = time.monotonic()
+        self._send(frame)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop sending frames."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+@callback
+def async_end_subscriptions(subscriptions: dict[TorqueSubscription, CALLBACK_TYPE]) -> None:
+    """End a vehicle's streams when it is unloaded, e.g. reloaded for new options.
+
+    Their clients get an error and can subscribe again, instead of waiting
+    on a stream the reloaded vehicle no longer feeds.
+    """
+    for end in list(subscriptions.values()):
+        end()
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required(ATTR_ENTRY_ID): str,
+        vol.Optional("pids"): [str],
+        vol.Optional("max_rate", default=DEFAULT_SUBSCRIBE_MAX_RATE): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=60)
+        ),
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream changed PID values of a vehicle as they arrive."""
+    entry_data = hass.data.get(DOMAIN, {}).get(msg[ATTR_ENTRY_ID])
+    if entry_data is None or entry_data.get("subscriptions") is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Torque OBD-II vehicle not loaded"
+        )
+        return
+
+    @callback
+    def _async_send(frame: dict[str, float]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], {"values": frame}))
+
+    subscriptions: dict[TorqueSubscription, CALLBACK_TYPE] = entry_data["subscriptions"]
+    subscription = TorqueSubscription(
+        hass.loop,
+        _async_send,
+        set(msg["pids"]) if "pids" in msg else None,
+        1 / msg["max_rate"],
+    )
+
+    @callback
+    def _async_unsubscribe() -> None:
+        subscriptions.pop(subscription, None)
+        subscription.async_cancel()
+
+    @callback
+    def _async_end() -> None:
+        """Tell the client its stream ended because the vehicle was unloaded."""
+        if connection.subscriptions.pop(msg["id"], None) is None:
+            return
+        _async_unsubscribe()
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Torque OBD-II vehicle unloaded"
+        )
+
+    subscriptions[subscription] = _async_end
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+
+    # Start the client off with the newest value of every PID
+    if (history := entry_data.get("history")) is not None:
+        subscription.async_update(history.latest())
@@ -0,0 +1,41 @@
+"""Smoke test for the ingest benchmark."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from benchmarks.bench_ingest import _run_cell, session_payloads
+from custom_components.torque_obd import TorqueView
+
+
+def test_session_payloads_follow_torque_session_shape() -> None:
+    """A session starts with the unit and name burst, then value pushes."""
+    payloads = list(session_payloads(vehicle=0, pid_count=3, pushes=2))
+
+    assert len(payloads) == 4
+    assert "defaultUnit00" in payloads[0]
+    assert payloads[1]["userFullName02"] == "Synthetic PID 02"
+    assert {key for key in payloads[2] if key.startswith("k")} == {"k00", "k01", "k02"}
+
+
+def test_benchmark_cell_reports_metrics() -> None:
+    """The smallest matrix cell runs and reports every metric."""
+    result = asyncio.run(_run_cell(pid_count=10, vehicles=2, pushes=3))
+
+    assert result["requests"] == 10
+    assert result["sensors"] == 20
+    assert 0 < result["state_writes_per_push"] <= 10
+    assert result["latency_p99_ms"] >= result["latency_p50_ms"]
+
+
+def test_benchmark_cell_fails_on_ingest_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A broken ingest path fails the run instead of being timed."""
+
+    async def _broken(*args: object) -> None:
+        raise AttributeError("broken")
+
+    monkeypatch.setattr(TorqueView, "_process_payload", _broken)
+
+    with pytest.raises(RuntimeError, match="error"):
+        asyncio.run(_run_cell(pid_count=10, vehicles=1, pushes=1))
@@ -3,11 +3,29 @@
 from __future__ import annotations
 
 import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+import voluptuous as vol
 
-from custom_components.torque_obd.config_flow import validate_input
-from custom_components.torque_obd.const import CONF_EMAIL, CONF_VEHICLE_NAME
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.torque_obd.config_flow import (
+    TorqueConfigFlow,
+    _options_schema,
+    validate_input,
+)
+from custom_components.torque_obd.const import (
+    CONF_DEVICE_ID,
+    CONF_EMAIL,
+    CONF_FLEET_MODE,
+    CONF_MAX_FLUSH_RATE,
+    CONF_RECORD_SESSIONS,
+    CONF_STATE_FLUSH_INTERVAL,
+    CONF_STATISTICS_ONLY,
+    CONF_VEHICLE_NAME,
+    DEFAULT_MAX_FLUSH_RATE,
+)
 
 
 def test_validate_input_accepts_stripped_vehicle_name() -> None:
@@ -54,3 +72,53 @@ def test_validate_input_rejects_invalid_email(email: str) -> None:
                 },
             )
         )
+
+
+def test_options_schema_defaults_and_validation() -> None:
+    """The options schema should default the options and reject bad values."""
+    schema = _options_schema({})
+
+    assert schema({}) == {
+        CONF_MAX_FLUSH_RATE: DEFAULT_MAX_FLUSH_RATE,
+        CONF_RECORD_SESSIONS: False,
+        CONF_STATISTICS_ONLY: False,
+        CONF_STATE_FLUSH_INTERVAL: 0.0,
+        CONF_FLEET_MODE: False,
+    }
+    assert schema({CONF_MAX_FLUSH_RATE: "0"})[CONF_MAX_FLUSH_RATE] == 0.0
+    assert _options_schema({CONF_MAX_FLUSH_RATE: 5.0})({})[CONF_MAX_FLUSH_RATE] == 5.0
+    assert _options_schema({CONF_RECORD_SESSIONS: True})({})[CONF_RECORD_SESSIONS] is True
+
+    with pytest.raises(vol.Invalid):
+        schema({CONF_STATE_FLUSH_INTERVAL: 120})
+    with pytest.raises(vol.Invalid):
+        schema({CONF_MAX_FLUSH_RATE: -1})
+
+
+def test_fleet_discovery_waits_for_confirmation() -> None:
+    """A discovered fleet phone is only added once the user confirms it."""
+    flow = TorqueConfigFlow()
+    flow.hass = MagicMock()
+    flow.context = {"source": "integration_discovery"}
+    discovery_info = {
+        CONF_VEHICLE_NAME: "Red Van",
+        CONF_DEVICE_ID: "8e86782620fd92ecd1dcd12203503fca",
+        CONF_EMAIL: "",
+    }
+
+    async def _run() -> tuple[dict, dict]:
+        with (
+            patch.object(flow, "async_set_unique_id", AsyncMock()) as set_unique_id,
+            patch.object(flow, "_abort_if_unique_id_configured"),
+        ):
+            form = await flow.async_step_integration_discovery(discovery_info)
+        set_unique_id.assert_awaited_once_with("red-van")
+        return form, await flow.async_step_confirm({})
+
+    form, entry = asyncio.run(_run())
+
+    assert form["type"] is FlowResultType.FORM
+    assert form["step_id"] == "confirm"
+    assert flow.context["title_placeholders"] == {"name": "Red Van"}
+    assert entry["type"] is FlowResultType.CREATE_ENTRY
+    assert entry["data"] == discovery_info
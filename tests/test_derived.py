@@ -0,0 +1,93 @@
+"""Tests for derived sensors."""
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.torque_obd import _classify_key
+from custom_components.torque_obd.const import CONF_EXPRESSION, load_sensor_definitions
+from custom_components.torque_obd.derived import DerivedExpression, TorqueDerivedSensors
+
+
+def test_expression_inputs_and_evaluation() -> None:
+    """Expressions expose their input PIDs and evaluate against values."""
+    expression = DerivedExpression("max(k0b - k33, 0) / 6.895")
+
+    assert expression.inputs == {"k0b", "k33"}
+    assert expression.evaluate({"k0b": 170.0, "k33": 101.0}) == pytest.approx(10.007, abs=1e-3)
+    assert expression.evaluate({"k0b": 90.0, "k33": 101.0}) == 0.0
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "__import__('os').system('true')",
+        "k0b.real",
+        "k0b ** 2",
+        "'a' * k0b",
+        "(lambda: 1)()",
+        "round(k0b, ndigits=1)",
+        "[k0b][0]",
+        "k0b if k33 else 0",
+        "min",
+        "1 + 2",
+        "k0b -",
+    ],
+)
+def test_expression_rejects_unsafe_input(text: str) -> None:
+    """Anything but arithmetic on PIDs and allowed functions is refused."""
+    with pytest.raises(ValueError):
+        DerivedExpression(text)
+
+
+def test_expression_undefined_results_are_none() -> None:
+    """Division by zero and math domain errors give no value."""
+    assert DerivedExpression("k10 / k0d").evaluate({"k10": 5.0, "k0d": 0.0}) is None
+    assert DerivedExpression("sqrt(k0b)").evaluate({"k0b": -1.0}) is None
+
+
+def test_derived_sensors_recompute_only_on_input_change() -> None:
+    """Values are recomputed when an input changes and reported when they change."""
+    derived = TorqueDerivedSensors(
+        {
+            "boost": DerivedExpression("k0b - k33"),
+            "load_x_rpm": DerivedExpression("k04 * k0c"),
+        },
+        lambda pid: _classify_key(pid).lookup_keys,
+    )
+    derived._expressions["load_x_rpm"] = MagicMock(wraps=derived._expressions["load_x_rpm"])
+    derived._expressions["load_x_rpm"].inputs = frozenset({"k04", "k0c"})
+
+    # Short payload keys are matched to the normalized input PIDs
+    assert derived.async_process({"kb": "170", "k33": "101", "k4": "50"}) == {"boost": 69.0}
+    assert derived.async_process({"kb": "170", "k33": "101"}) == {}
+    assert derived.async_process({"kb": "171", "k33": "102"}) == {}
+    assert derived.async_process({"kb": "172", "kc": "2000", "k4": "-"}) == {
+        "boost": 70.0,
+        "load_x_rpm": 100000.0,
+    }
+    derived._expressions["load_x_rpm"].evaluate.assert_called_once()
+
+
+def test_load_sensor_definitions_compiles_expressions(tmp_path: Path) -> None:
+    """Derived definitions are compiled at load and invalid ones skipped."""
+    (tmp_path / "torque_sensor_definitions.yaml").write_text(
+        "boost:\n"
+        "  name: Boost\n"
+        "  unit: kPa\n"
+        "  expression: k0b - k33\n"
+        "broken:\n"
+        "  name: Broken\n"
+        "  expression: open('/etc/passwd')\n",
+        encoding="utf-8",
+    )
+    hass = MagicMock()
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+
+    definitions = load_sensor_definitions(hass)
+
+    assert isinstance(definitions["boost"][CONF_EXPRESSION], DerivedExpression)
+    assert definitions["boost"]["state_class"] is None
+    assert "broken" not in definitions
@@ -0,0 +1,93 @@
+"""Tests for the Torque OBD-II diagnostics download."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from unittest.mock import MagicMock
+
+from custom_components.torque_obd.const import CONF_EMAIL, CONF_VEHICLE_NAME, DOMAIN
+from custom_components.torque_obd.diagnostics import (
+    _pid_update_rates,
+    async_get_config_entry_diagnostics,
+)
+from custom_components.torque_obd.metrics import LATENCY_BUCKETS_MS, TorqueIngestMetrics
+
+ENTRY_ID = "test_entry_abc"
+
+
+def _make_entry() -> MagicMock:
+    """Create a config entry mock."""
+    entry = MagicMock()
+    entry.entry_id = ENTRY_ID
+    entry.title = "Family Car"
+    entry.data = {CONF_VEHICLE_NAME: "Family Car", CONF_EMAIL: "user@example.com"}
+    entry.options = {}
+    return entry
+
+
+def test_pid_update_rates_over_recent_payloads() -> None:
+    """Rates are updates per minute across the ring's time window."""
+    payloads = [
+        (0.0, {"kd": "1", "kc": "800", "eml": "x"}),
+        (15.0, {"kd": "2"}),
+        (30.0, {"k0d": "3", "kc": "900"}),
+    ]
+
+    assert _pid_update_rates(payloads) == {"k0c": 4.0, "k0d": 6.0}
+
+
+def test_diagnostics_redacts_email_and_keeps_payload_references() -> None:
+    """Payloads are reported redacted without touching the stored dicts."""
+    payload = {"eml": "user@example.com", "kd": "50.0", "session": "1"}
+    metrics = TorqueIngestMetrics()
+    metrics.record_parse(0.0003)
+    hass = MagicMock()
+    hass.data = {
+        DOMAIN: {
+            ENTRY_ID: {
+                "added_sensors": {"kd", "k0d"},
+                "sensor_names": {"k0d": {}},
+                "recent_payloads": deque([(1760720979.2, payload)], maxlen=5),
+                "metrics": metrics,
+            }
+        }
+    }
+
+    diagnostics = asyncio.run(async_get_config_entry_diagnostics(hass, _make_entry()))
+
+    assert diagnostics["entry"]["data"][CONF_EMAIL] == "**REDACTED**"
+    assert diagnostics["recent_payloads"][0]["payload"]["eml"] == "**REDACTED**"
+    assert payload["eml"] == "user@example.com"
+    assert diagnostics["sensors"]["added_sensors"] == 2
+    assert diagnostics["sensors"]["sensor_names"] == 1
+    histograms = diagnostics["latency_histograms"]
+    assert len(histograms["parse"]) == len(LATENCY_BUCKETS_MS) + 1
+    assert histograms["parse"][LATENCY_BUCKETS_MS.index(0.5)] == 1
+
+
+def test_diagnostics_redacts_device_id_and_gps_data() -> None:
+    """The phone's device id and the vehicle's location never leave the house."""
+    payload = {
+        "id": "8f2a6c1e0b",
+        "session": "1",
+        "kd": "50.0",
+        "kff1006": "45.4642",
+        "kff1005": "9.1900",
+        "kff1001": "50.0",
+        "kff1010": "120.0",
+        "kff1007": "270.0",
+        "kff1239": "5.0",
+    }
+    hass = MagicMock()
+    hass.data = {
+        DOMAIN: {ENTRY_ID: {"recent_payloads": deque([(1760720979.2, payload)], maxlen=5)}}
+    }
+
+    diagnostics = asyncio.run(async_get_config_entry_diagnostics(hass, _make_entry()))
+
+    redacted = diagnostics["recent_payloads"][0]["payload"]
+    for key in ("id", "kff1006", "kff1005", "kff1001", "kff1010", "kff1007", "kff1239"):
+        assert redacted[key] == "**REDACTED**"
+    assert redacted["kd"] == "50.0"
+    assert redacted["session"] == "1"
+    assert payload["kff1006"] == "45.4642"
@@ -0,0 +1,193 @@
+"""Tests for Torque OBD-II fleet mode."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.torque_obd import TorqueFleetView, TorqueView
+from custom_components.torque_obd.const import (
+    CONF_DEVICE_ID,
+    CONF_VEHICLE_NAME,
+    DOMAIN,
+    FLEET_API_PATH,
+)
+from custom_components.torque_obd.fleet import TorqueFleetIndex, fleet_vehicle_name
+
+ENTRY_ID = "fleet_entry_abc"
+DEVICE_ID = "8e86782620fd92ecd1dcd12203503fca"
+EMAIL = "user@example.com"
+
+VALUE_PAYLOAD: dict[str, str] = {
+    "eml": EMAIL,
+    "session": "1760720944365",
+    "id": DEVICE_ID,
+    "time": "1760720979200",
+    "kd": "0.0",
+}
+
+
+def _make_index() -> TorqueFleetIndex:
+    """Create a fleet index with a mocked store."""
+    index = TorqueFleetIndex(MagicMock())
+    index._store = MagicMock()
+    return index
+
+
+def _make_request(data: dict[str, str], path: str = FLEET_API_PATH) -> MagicMock:
+    """Create a minimal aiohttp request mock carrying a Torque payload."""
+    request = MagicMock()
+    request.method = "GET"
+    request.path = path
+    request.query = data
+    return request
+
+
+def _make_hass(index: TorqueFleetIndex) -> MagicMock:
+    """Create a mock hass with one loaded vehicle and the fleet index."""
+    hass = MagicMock()
+    hass.data = {
+        DOMAIN: {
+            "routes": {"family-car": ENTRY_ID},
+            "fleet_index": index,
+            "fleet_entries": {ENTRY_ID},
+            ENTRY_ID: {"vehicle_name": "Family Car", "ingest_queue": MagicMock()},
+        }
+    }
+    hass.config_entries.async_entries.return_value = []
+    return hass
+
+
+def test_index_resolves_device_id_before_email() -> None:
+    """The device id wins; the email is only a fallback."""
+    index = _make_index()
+    index.async_learn("entry_a", device_id=DEVICE_ID)
+    index.async_learn("entry_b", email=EMAIL)
+
+    assert index.resolve(DEVICE_ID, EMAIL) == "entry_a"
+    assert index.resolve("other-device", EMAIL) == "entry_b"
+    assert index.resolve("other-device", None) is None
+
+
+def test_index_ignores_email_shared_by_several_vehicles() -> None:
+    """An account used for several vehicles cannot route unknown devices."""
+    index = _make_index()
+    index.async_learn("entry_a", device_id=DEVICE_ID, email=EMAIL)
+    index.async_learn("entry_b", device_id="other-device", email=EMAIL)
+
+    assert index.resolve(DEVICE_ID, EMAIL) == "entry_a"
+    assert index.resolve("new-device", EMAIL) is None
+
+    index.async_remove_entry("entry_a")
+    assert index.resolve("new-device", EMAIL) == "entry_b"
+    assert index._data_to_save()["emails"] == {EMAIL: ["entry_b"]}
+
+
+def test_index_saves_only_on_change() -> None:
+    """Re-learning the same mapping must not schedule another save."""
+    index = _make_index()
+    index.async_learn(ENTRY_ID, DEVICE_ID, EMAIL)
+    index.async_learn(ENTRY_ID, DEVICE_ID, EMAIL)
+
+    assert index._store.async_delay_save.call_count == 1
+
+
+def test_index_remove_entry() -> None:
+    """Removing an entry drops all of its mappings."""
+    index = _make_index()
+    index.async_learn(ENTRY_ID, DEVICE_ID, EMAIL)
+    index.async_learn("other_entry", "other-device")
+
+    index.async_remove_entry(ENTRY_ID)
+
+    assert index.resolve(DEVICE_ID, EMAIL) is None
+    assert index.resolve("other-device", None) == "other_entry"
+
+
+def test_index_load_keeps_entries_learned_meanwhile() -> None:
+    """Stored mappings never override mappings learned during the load."""
+    index = _make_index()
+    index._store.async_load = AsyncMock(
+        return_value={
+            "device_ids": {DEVICE_ID: "old_entry", "d2": "e2"},
+            "emails": {EMAIL: ["e2"]},
+        }
+    )
+    index.async_learn(ENTRY_ID, DEVICE_ID)
+
+    asyncio.run(index.async_load())
+
+    assert index.resolve(DEVICE_ID, None) == ENTRY_ID
+    assert index.resolve("d2", None) == "e2"
+    assert index.resolve(None, EMAIL) == "e2"
+
+
+def test_fleet_vehicle_name() -> None:
+    """Names come from the profile, the device id, and avoid collisions."""
+    assert fleet_vehicle_name({"id": DEVICE_ID, "profileName": "Red Van!"}, set()) == "Red Van"
+    assert fleet_vehicle_name({"id": DEVICE_ID}, set()) == "Torque 8e867826"
+    assert (
+        fleet_vehicle_name({"id": DEVICE_ID, "profileName": "Red Van"}, {"red-van"})
+        == "Red Van 8e867826"
+    )
+
+
+def test_fleet_request_routes_by_device_id() -> None:
+    """A known device's payload is queued on its vehicle."""
+    index = _make_index()
+    index.async_learn(ENTRY_ID, DEVICE_ID)
+    view = TorqueFleetView(_make_hass(index))
+
+    response = asyncio.run(view._handle_fleet_request(_make_request(VALUE_PAYLOAD)))
+
+    assert response.text == "OK!"
+    queue = view.hass.data[DOMAIN][ENTRY_ID]["ingest_queue"]
+    queue.async_enqueue.assert_called_once_with(VALUE_PAYLOAD)
+
+
+def test_fleet_request_provisions_unknown_device_rate_limited() -> None:
+    """Unknown devices start one discovery flow per provisioning interval."""
+    view = TorqueFleetView(_make_hass(_make_index()))
+
+    async def _run() -> None:
+        await view._handle_fleet_request(_make_request(VALUE_PAYLOAD))
+        await view._handle_fleet_request(_make_request({**VALUE_PAYLOAD, "id": "another"}))
+
+    with patch(
+        "custom_components.torque_obd.discovery_flow.async_create_flow"
+    ) as create_flow:
+        asyncio.run(_run())
+
+    create_flow.assert_called_once()
+    data = create_flow.call_args.kwargs["data"]
+    assert data[CONF_DEVICE_ID] == DEVICE_ID
+    assert data[CONF_VEHICLE_NAME] == "Torque 8e867826"
+
+
+def test_fleet_request_refused_without_fleet_mode() -> None:
+    """Without a vehicle opted in, the endpoint neither routes nor provisions."""
+    index = _make_index()
+    index.async_learn(ENTRY_ID, DEVICE_ID)
+    hass = _make_hass(index)
+    hass.data[DOMAIN]["fleet_entries"] = set()
+    view = TorqueFleetView(hass)
+
+    with patch(
+        "custom_components.torque_obd.discovery_flow.async_create_flow"
+    ) as create_flow:
+        response = asyncio.run(
+            view._handle_fleet_request(_make_request({**VALUE_PAYLOAD, "id": "another"}))
+        )
+
+    assert response.status == 404
+    create_flow.assert_not_called()
+    hass.data[DOMAIN][ENTRY_ID]["ingest_queue"].async_enqueue.assert_not_called()
+
+
+def test_slug_request_learns_device_id() -> None:
+    """Uploads on a vehicle's own endpoint teach the fleet index its phone."""
+    index = _make_index()
+    view = TorqueView(_make_hass(index))
+
+    asyncio.run(view._handle_request(_make_request(VALUE_PAYLOAD), "family-car"))
+
+    assert index.resolve(DEVICE_ID, None) == ENTRY_ID
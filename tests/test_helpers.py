@@ -6,7 +6,21 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from custom_components.torque_obd import _extract_name_from_value, _normalize_pid
+from custom_components.torque_obd import (
+    KEY_CLASSIFIER_CACHE_SIZE,
+    KEY_KIND_ATTRIBUTE,
+    KEY_KIND_DATA,
+    KEY_KIND_GPS,
+    KEY_KIND_METADATA,
+    KEY_KIND_NAME,
+    KEY_KIND_OTHER,
+    _classify_key,
+    _dispatch_pid_updates,
+    _extract_name_from_value,
+    _normalize_pid,
+    _payload_context,
+    async_register_pid_listener,
+)
 from custom_components.torque_obd.const import DOMAIN, SENSOR_DEFINITIONS
 from custom_components.torque_obd.sensor import (
     _build_lookup_keys,
@@ -43,6 +57,43 @@ def test_build_lookup_keys(key: str, expected: tuple[str, ...]) -> None:
     assert _build_lookup_keys(key) == expected
 
 
+@pytest.mark.parametrize(
+    ("key", "kind", "pid", "name_field"),
+    [
+        ("kd", KEY_KIND_DATA, "k0d", None),
+        ("k221e1c", KEY_KIND_DATA, "k221e1c", None),
+        ("kff1006", KEY_KIND_GPS, "kff1006", None),
+        ("userFullNameff1202", KEY_KIND_NAME, "kff1202", "full_name"),
+        ("userShortName0d", KEY_KIND_NAME, "k0d", "short_name"),
+        ("userShortName", KEY_KIND_METADATA, None, None),
+        ("defaultUnit0d", KEY_KIND_METADATA, None, None),
+        ("profileName", KEY_KIND_METADATA, None, None),
+        ("session", KEY_KIND_ATTRIBUTE, None, None),
+        ("eml", KEY_KIND_ATTRIBUTE, None, None),
+        ("unexpected", KEY_KIND_OTHER, None, None),
+    ],
+)
+def test_classify_key(key: str, kind: str, pid: str | None, name_field: str | None) -> None:
+    """Payload keys should be classified into their kind and normalized PID."""
+    record = _classify_key(key)
+
+    assert record.kind == kind
+    assert record.pid == pid
+    assert record.name_field == name_field
+
+
+def test_classify_key_is_memoized_and_bounded() -> None:
+    """Repeated keys hit the cache, which has a fixed upper bound."""
+    _classify_key.cache_clear()
+
+    first = _classify_key("kc")
+    second = _classify_key("kc")
+
+    assert first is second
+    assert _classify_key.cache_info().hits == 1
+    assert _classify_key.cache_info().maxsize == KEY_CLASSIFIER_CACHE_SIZE
+
+
 def test_extract_name_from_value_prefers_first_list_entry() -> None:
     """Name extraction should support both arrays and strings."""
     assert _extract_name_from_value(["Speed", "Vehicle Speed"]) == "Speed"
@@ -420,3 +471,97 @@ def test_migrate_entity_registry_names_handles_static_sensors() -> None:
         "sensor.2025_ford_escape_2025_ford_escape_last_torque_update",
         new_entity_id="sensor.2025_ford_escape_last_torque_update",
     )
+
+
+# ---------------------------------------------------------------------------
+# PID routing index tests
+# ---------------------------------------------------------------------------
+
+
+def test_pid_listener_receives_only_payloads_with_its_keys() -> None:
+    """Listeners are only called for pushes containing one of their keys."""
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"entry": {}}}
+    speed_updates: list[dict] = []
+    rpm_updates: list[dict] = []
+
+    async_register_pid_listener(hass, "entry", ("kd", "k0d"), speed_updates.append)
+    async_register_pid_listener(hass, "entry", ("kc", "k0c"), rpm_updates.append)
+    pid_listeners = hass.data[DOMAIN]["entry"]["pid_listeners"]
+
+    notified = _dispatch_pid_updates(pid_listeners, {"kd": "50.0", "session": "1"})
+
+    assert notified == 1
+    assert speed_updates == [{"kd": "50.0", "session": "1"}]
+    assert rpm_updates == []
+
+
+def test_pid_listener_called_once_when_aliases_share_a_payload() -> None:
+    """A listener indexed under both PID aliases is notified once per push."""
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"entry": {}}}
+    updates: list[dict] = []
+
+    async_register_pid_listener(hass, "entry", ("kd", "k0d"), updates.append)
+
+    _dispatch_pid_updates(
+        hass.data[DOMAIN]["entry"]["pid_listeners"], {"kd": "1", "k0d": "1"}
+    )
+
+    assert len(updates) == 1
+
+
+def test_pid_listener_removal_cleans_up_index() -> None:
+    """Removing a listener drops its keys from the routing index."""
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"entry": {}}}
+    updates: list[dict] = []
+
+    remove = async_register_pid_listener(hass, "entry", ("kd", "k0d"), updates.append)
+    remove()
+
+    pid_listeners = hass.data[DOMAIN]["entry"]["pid_listeners"]
+    assert pid_listeners == {}
+    assert _dispatch_pid_updates(pid_listeners, {"kd": "50.0"}) == 0
+    assert updates == []
+
+
+def test_unrouted_values_are_replayed_when_listener_registers() -> None:
+    """Values arriving before a sensor is added are replayed to it once."""
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"entry": {"data": {"session": "1", "eml": "a@b.c"}}}}
+    replay_buffer: dict = {}
+    updates: list[dict] = []
+
+    _dispatch_pid_updates({}, {"kd": "50.0", "session": "1", "kc": "900"}, replay_buffer)
+    hass.data[DOMAIN]["entry"]["replay_buffer"] = replay_buffer
+    async_register_pid_listener(hass, "entry", ("kd", "k0d"), updates.append)
+
+    assert updates == [{"session": "1", "kd": "50.0"}]
+    assert replay_buffer == {"kc": "900"}
+
+
+def test_payload_context_is_shared_per_payload() -> None:
+    """Sensors updated from one payload share one read-only context."""
+    payload = {"session": "1", "id": "device", "time": "1760720979200", "kd": "50.0"}
+
+    context = _payload_context(payload)
+
+    assert _payload_context({**payload, "kc": "900"}) is context
+    assert context.attributes == {
+        "last_update": "2025-10-17T17:09:39.200000+00:00",
+        "session": "1",
+        "device_id": "device",
+    }
+    with pytest.raises(TypeError):
+        context.attributes["session"] = "2"  # type: ignore[index]
+    assert _payload_context({**payload, "time": "1760720980200"}) is not context
+
+
+def test_payload_context_without_torque_time_uses_current_time() -> None:
+    """Payloads without a valid time are stamped when they are processed."""
+    context = _payload_context({"session": "1", "time": "not-a-time"})
+
+    assert context.device_id is None
+    assert set(context.attributes) == {"last_update", "session"}
+    assert context.timestamp.tzinfo is not None
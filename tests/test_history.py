@@ -0,0 +1,98 @@
+"""Tests for the in-memory PID history and its WebSocket command."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from custom_components.torque_obd.const import DOMAIN
+from custom_components.torque_obd.history import PidRingBuffer, TorqueHistory
+from custom_components.torque_obd.websocket import websocket_history
+
+
+def test_ring_buffer_overwrites_oldest_samples() -> None:
+    """A full ring keeps the newest samples in chronological order."""
+    ring = PidRingBuffer(3)
+    for second in range(5):
+        ring.append(1000.0 + second, float(second))
+
+    assert len(ring) == 3
+    assert ring.series() == [[1002.0, 2.0], [1003.0, 3.0], [1004.0, 4.0]]
+    assert ring.series(since=1003.0) == [[1003.0, 3.0], [1004.0, 4.0]]
+
+
+def test_ring_buffer_prunes_by_age() -> None:
+    """Pruning drops the oldest samples, also across the end of the ring."""
+    ring = PidRingBuffer(4)
+    for second in range(6):
+        ring.append(1000.0 + second, float(second))
+
+    ring.prune(1003.0)
+    assert ring.series() == [[1003.0, 3.0], [1004.0, 4.0], [1005.0, 5.0]]
+    ring.append(1006.0, 6.0)
+    ring.append(1007.0, 7.0)
+    assert ring.series() == [[1004.0, 4.0], [1005.0, 5.0], [1006.0, 6.0], [1007.0, 7.0]]
+    ring.prune(2000.0)
+    assert len(ring) == 0
+    assert ring.series() == []
+
+
+def test_ring_buffer_downsamples_by_averaging() -> None:
+    """Downsampling averages consecutive samples into at most max_points."""
+    ring = PidRingBuffer(10)
+    for second in range(6):
+        ring.append(float(second), float(second * 10))
+
+    assert ring.series(max_points=3) == [[0.5, 5.0], [2.5, 25.0], [4.5, 45.0]]
+    assert len(ring.series(max_points=4)) == 3
+
+
+def test_history_records_each_pid() -> None:
+    """Every PID of an upload gets its own ring, stamped with the receive time."""
+    history = TorqueHistory(60, 5)
+    with patch(
+        "custom_components.torque_obd.history.time.time",
+        side_effect=[1.0, 2.0, 3.0],
+    ):
+        history.record({"k0c": 800.0, "k0d": 0.0})
+        history.record({"k0c": 900.0})
+        series = history.series(["k0c", "k999"])
+
+    assert history.pids == ["k0c", "k0d"]
+    assert series == {"k0c": [[1.0, 800.0], [2.0, 900.0]]}
+
+
+def test_history_keeps_only_the_window() -> None:
+    """Samples older than the window are dropped, also for PIDs no longer sent."""
+    history = TorqueHistory(60, 1800)
+    with patch(
+        "custom_components.torque_obd.history.time.time",
+        side_effect=[1000.0, 1030.0, 1070.0, 1070.0, 1200.0],
+    ):
+        history.record({"k0c": 800.0, "k0d": 10.0})
+        history.record({"k0c": 900.0})
+        history.record({"k0c": 1000.0})
+        assert history.series() == {
+            "k0c": [[1030.0, 900.0], [1070.0, 1000.0]],
+            "k0d": [],
+        }
+        assert history.series() == {"k0c": [], "k0d": []}
+
+
+def test_websocket_history() -> None:
+    """The command answers with the series or an error for unknown vehicles."""
+    history = TorqueHistory(60, 5)
+    with patch("custom_components.torque_obd.history.time.time", return_value=1.0):
+        history.record({"k0c": 800.0})
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"entry": {"history": history}}}
+    connection = MagicMock()
+
+    with patch("custom_components.torque_obd.history.time.time", return_value=2.0):
+        websocket_history(
+            hass, connection, {"id": 1, "type": f"{DOMAIN}/history", "entry_id": "entry"}
+        )
+    websocket_history(
+        hass, connection, {"id": 2, "type": f"{DOMAIN}/history", "entry_id": "other"}
+    )
+
+    connection.send_result.assert_called_once_with(1, {"pids": {"k0c": [[1.0, 800.0]]}})
+    assert connection.send_error.call_args.args[:2] == (2, "not_found")
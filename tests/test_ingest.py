@@ -0,0 +1,131 @@
+"""Tests for the Torque OBD-II ingest queue."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from custom_components.torque_obd.ingest import TorqueIngestQueue, TorquePayloadWatermark
+
+VEHICLE_NAME = "Family Car"
+
+
+def test_queued_payloads_are_merged_latest_wins() -> None:
+    """Payloads queued before a flush are merged, later values win per key."""
+    processed: list[dict[str, Any]] = []
+
+    async def _process(payload: dict[str, Any]) -> None:
+        processed.append(payload)
+
+    async def _run() -> None:
+        queue = TorqueIngestQueue(VEHICLE_NAME, _process, 0, 10)
+        queue.async_enqueue({"kd": "10.0", "kc": "900.0"})
+        queue.async_enqueue({"kd": "20.0", "time": "2"})
+        task = asyncio.create_task(queue.async_run())
+        await asyncio.sleep(0)
+        task.cancel()
+
+    asyncio.run(_run())
+
+    assert processed == [{"kd": "20.0", "kc": "900.0", "time": "2"}]
+
+
+def test_full_queue_drops_oldest_payload() -> None:
+    """A full queue drops the oldest payload and counts it."""
+    processed: list[dict[str, Any]] = []
+
+    async def _process(payload: dict[str, Any]) -> None:
+        processed.append(payload)
+
+    async def _run() -> TorqueIngestQueue:
+        queue = TorqueIngestQueue(VEHICLE_NAME, _process, 0, 2)
+        queue.async_enqueue({"kd": "1.0", "k2f": "50.0"})
+        queue.async_enqueue({"kd": "2.0"})
+        queue.async_enqueue({"kd": "3.0"})
+        assert queue.pending == 2
+        task = asyncio.create_task(queue.async_run())
+        await asyncio.sleep(0)
+        task.cancel()
+        return queue
+
+    queue = asyncio.run(_run())
+
+    assert queue.enqueued == 3
+    assert queue.dropped == 1
+    assert processed == [{"kd": "3.0"}]
+
+
+def test_flush_rate_limits_processing() -> None:
+    """Payloads arriving faster than the flush rate are coalesced."""
+    processed: list[dict[str, Any]] = []
+
+    async def _process(payload: dict[str, Any]) -> None:
+        processed.append(payload)
+
+    async def _run() -> None:
+        queue = TorqueIngestQueue(VEHICLE_NAME, _process, 20, 10)
+        task = asyncio.create_task(queue.async_run())
+        for index in range(5):
+            queue.async_enqueue({"kd": str(index)})
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.1)
+        task.cancel()
+
+    asyncio.run(_run())
+
+    assert len(processed) == 2
+    assert processed[-1] == {"kd": "4"}
+
+
+def test_processing_errors_do_not_stop_the_worker() -> None:
+    """An exception while processing one payload does not kill the worker."""
+    processed: list[dict[str, Any]] = []
+
+    async def _process(payload: dict[str, Any]) -> None:
+        if payload.get("kd") == "bad":
+            raise ValueError("boom")
+        processed.append(payload)
+
+    async def _run() -> TorqueIngestQueue:
+        queue = TorqueIngestQueue(VEHICLE_NAME, _process, 0, 10)
+        task = asyncio.create_task(queue.async_run())
+        queue.async_enqueue({"kd": "bad"})
+        await asyncio.sleep(0)
+        queue.async_enqueue({"kd": "1.0"})
+        await asyncio.sleep(0)
+        task.cancel()
+        return queue
+
+    queue = asyncio.run(_run())
+
+    assert processed == [{"kd": "1.0"}]
+    assert queue.flushes == 2
+
+
+def test_watermark_drops_stale_and_duplicate_uploads() -> None:
+    """Older uploads and exact retries are rejected and counted."""
+    watermark = TorquePayloadWatermark(VEHICLE_NAME)
+    values = {"session": "1000", "time": "5000", "kd": "10.0"}
+    names = {"session": "1000", "time": "5000", "userFullNamed": "Speed"}
+
+    assert watermark.async_accept(values)
+    # Torque sends names and units with the same time as the values
+    assert watermark.async_accept(names)
+    assert not watermark.async_accept(dict(values))
+    assert not watermark.async_accept({**values, "time": "4000"})
+    assert watermark.async_accept({**values, "time": "6000"})
+    # An upload without a time cannot be ordered
+    assert watermark.async_accept({"kd": "12.0"})
+
+    assert watermark.watermark == (1000, 6000)
+    assert watermark.stale == 1
+    assert watermark.duplicates == 1
+
+
+def test_watermark_orders_sessions() -> None:
+    """A new session starts a new timeline; late uploads of an old one are stale."""
+    watermark = TorquePayloadWatermark(VEHICLE_NAME)
+
+    assert watermark.async_accept({"session": "1000", "time": "9000"})
+    assert watermark.async_accept({"session": "2000", "time": "3000"})
+    assert not watermark.async_accept({"session": "1000", "time": "9500"})
+    assert watermark.stale == 1
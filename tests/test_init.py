@@ -0,0 +1,215 @@
+"""Tests for the Torque OBD-II HTTP view."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.torque_obd import MAX_KEY_SIGNATURES, TorqueView
+from custom_components.torque_obd.const import DOMAIN
+from custom_components.torque_obd.ingest import TorquePayloadWatermark
+
+ENTRY_ID = "test_entry_abc"
+SLUG = "family-car"
+API_PATH = f"/api/torque-{SLUG}"
+
+VALUE_PAYLOAD: dict[str, str] = {
+    "eml": "user@example.com",
+    "session": "1760720944365",
+    "id": "8e86782620fd92ecd1dcd12203503fca",
+    "time": "1760720979200",
+    "kd": "0.0",
+    "kc": "650.0",
+}
+
+
+def _make_request(data: dict[str, str], method: str = "GET") -> MagicMock:
+    """Create a minimal aiohttp request mock carrying a Torque payload."""
+    request = MagicMock()
+    request.method = method
+    request.path = API_PATH
+    request.query = data
+    request.post = AsyncMock(return_value=data)
+    return request
+
+
+def _make_view() -> TorqueView:
+    """Create a TorqueView backed by a mock hass with one vehicle entry."""
+    hass = MagicMock()
+    hass.data = {
+        DOMAIN: {
+            "routes": {SLUG: ENTRY_ID},
+            ENTRY_ID: {
+                "vehicle_name": "Family Car",
+                "api_path": API_PATH,
+                "data": {},
+                "added_sensors": set(),
+                "pid_listeners": {},
+                "slug": SLUG,
+            },
+        }
+    }
+    return TorqueView(hass)
+
+
+def test_handle_request_stores_latest_payload() -> None:
+    """The latest payload should be stored in the entry data."""
+    view = _make_view()
+    view._create_sensors_for_new_data = AsyncMock(return_value=True)
+
+    response = asyncio.run(view._handle_request(_make_request(VALUE_PAYLOAD), SLUG))
+
+    assert response.text == "OK!"
+    assert view.hass.data[DOMAIN][ENTRY_ID]["data"] == VALUE_PAYLOAD
+
+
+def test_handle_request_skips_discovery_for_known_key_set() -> None:
+    """Discovery runs once per distinct key-set, not on every request."""
+    view = _make_view()
+    view._create_sensors_for_new_data = AsyncMock(return_value=True)
+
+    async def _run() -> None:
+        await view._handle_request(_make_request(VALUE_PAYLOAD), SLUG)
+        await view._handle_request(_make_request({**VALUE_PAYLOAD, "kd": "12.0"}), SLUG)
+        await view._handle_request(_make_request({**VALUE_PAYLOAD, "k2f": "50.0"}), SLUG)
+
+    asyncio.run(_run())
+
+    assert view._create_sensors_for_new_data.await_count == 2
+
+
+def test_handle_request_retries_incomplete_discovery() -> None:
+    """A key-set is only remembered once discovery completed."""
+    view = _make_view()
+    view._create_sensors_for_new_data = AsyncMock(side_effect=[False, True, True])
+
+    async def _run() -> None:
+        for _ in range(3):
+            await view._handle_request(_make_request(VALUE_PAYLOAD), SLUG)
+
+    asyncio.run(_run())
+
+    assert view._create_sensors_for_new_data.await_count == 2
+
+
+def test_key_signature_cache_is_bounded() -> None:
+    """The per-entry key-set cache is capped and forgets the oldest first."""
+    view = _make_view()
+    view._create_sensors_for_new_data = AsyncMock(return_value=True)
+
+    async def _run() -> None:
+        for index in range(MAX_KEY_SIGNATURES + 5):
+            await view._handle_request(_make_request({f"k{index:x}": "1.0"}), SLUG)
+
+    asyncio.run(_run())
+
+    key_signatures = list(view.hass.data[DOMAIN][ENTRY_ID]["key_signatures"])
+    assert len(key_signatures) == MAX_KEY_SIGNATURES
+    assert frozenset({"k0"}) not in key_signatures
+    assert frozenset({"k4"}) not in key_signatures
+    assert key_signatures[0] == frozenset({"k5"})
+    assert key_signatures[-1] == frozenset({f"k{MAX_KEY_SIGNATURES + 4:x}"})
+
+
+def test_handle_request_enqueues_and_answers_immediately() -> None:
+    """With an ingest queue the request only enqueues the payload."""
+    view = _make_view()
+    view._create_sensors_for_new_data = AsyncMock(return_value=True)
+    ingest_queue = MagicMock()
+    view.hass.data[DOMAIN][ENTRY_ID]["ingest_queue"] = ingest_queue
+
+    response = asyncio.run(view._handle_request(_make_request(VALUE_PAYLOAD, "POST"), SLUG))
+
+    assert response.text == "OK!"
+    ingest_queue.async_enqueue.assert_called_once_with(VALUE_PAYLOAD)
+    view._create_sensors_for_new_data.assert_not_awaited()
+
+
+def test_view_serves_every_vehicle_from_one_route() -> None:
+    """The shared view uses a single slug route for all vehicles."""
+    assert TorqueView.url == "/api/torque-{slug}"
+
+
+def test_handle_request_routes_by_slug() -> None:
+    """Requests are routed to the vehicle registered for the slug."""
+    view = _make_view()
+    view._create_sensors_for_new_data = AsyncMock(return_value=True)
+    view.hass.data[DOMAIN]["routes"]["other-car"] = "other_entry"
+    view.hass.data[DOMAIN]["other_entry"] = {"vehicle_name": "Other Car", "data": {}}
+
+    asyncio.run(view._handle_request(_make_request(VALUE_PAYLOAD), "other-car"))
+
+    assert view.hass.data[DOMAIN]["other_entry"]["data"] == VALUE_PAYLOAD
+    assert view.hass.data[DOMAIN][ENTRY_ID]["data"] == {}
+    view._create_sensors_for_new_data.assert_awaited_once_with("other_entry", VALUE_PAYLOAD)
+
+
+def test_handle_request_ignores_unknown_slug() -> None:
+    """Unknown or unloaded vehicles are answered with OK and not processed."""
+    view = _make_view()
+    view._create_sensors_for_new_data = AsyncMock(return_value=True)
+
+    response = asyncio.run(view._handle_request(_make_request(VALUE_PAYLOAD), "unknown"))
+
+    assert response.text == "OK!"
+    view._create_sensors_for_new_data.assert_not_awaited()
+
+
+def test_discovery_is_debounced_off_the_ingest_path() -> None:
+    """With a debouncer, new key-sets only schedule discovery."""
+    view = _make_view()
+    view._create_sensors_for_new_data = AsyncMock(return_value=True)
+    debouncer = MagicMock()
+    debouncer.async_call = AsyncMock()
+    view.hass.data[DOMAIN][ENTRY_ID]["discovery_debouncer"] = debouncer
+
+    async def _run() -> None:
+        await view._process_payload(ENTRY_ID, {"userFullNamed": "Speed", "session": "1"})
+        await view._process_payload(ENTRY_ID, VALUE_PAYLOAD)
+
+    asyncio.run(_run())
+
+    assert debouncer.async_call.await_count == 2
+    view._create_sensors_for_new_data.assert_not_awaited()
+    assert view.hass.data[DOMAIN][ENTRY_ID]["replay_buffer"] == {"kd": "0.0", "kc": "650.0"}
+
+
+def test_debounced_discovery_runs_once_over_merged_payloads() -> None:
+    """One discovery run covers every key-set collected since the last run."""
+    view = _make_view()
+    view._create_sensors_for_new_data = AsyncMock(return_value=True)
+    view.hass.data[DOMAIN][ENTRY_ID]["discovery_debouncer"] = MagicMock(async_call=AsyncMock())
+
+    async def _run() -> None:
+        await view._process_payload(ENTRY_ID, {"userFullNamed": "Speed", "session": "1"})
+        await view._process_payload(ENTRY_ID, VALUE_PAYLOAD)
+        await view._async_run_discovery(ENTRY_ID)
+
+    asyncio.run(_run())
+
+    view._create_sensors_for_new_data.assert_awaited_once_with(
+        ENTRY_ID, {"userFullNamed": "Speed", **VALUE_PAYLOAD}
+    )
+    assert len(view.hass.data[DOMAIN][ENTRY_ID]["key_signatures"]) == 2
+
+
+def test_handle_request_drops_stale_and_retried_uploads() -> None:
+    """Uploads behind the vehicle's watermark never reach the sensors."""
+    view = _make_view()
+    view._create_sensors_for_new_data = AsyncMock(return_value=True)
+    entry_data = view.hass.data[DOMAIN][ENTRY_ID]
+    entry_data["watermark"] = TorquePayloadWatermark("Family Car")
+    listener = MagicMock()
+    entry_data["pid_listeners"]["kd"] = [listener]
+
+    async def _run() -> None:
+        await view._handle_request(_make_request(VALUE_PAYLOAD), SLUG)
+        await view._handle_request(_make_request(VALUE_PAYLOAD), SLUG)
+        await view._handle_request(
+            _make_request({**VALUE_PAYLOAD, "time": "1760720978200", "kd": "5.0"}), SLUG
+        )
+
+    asyncio.run(_run())
+
+    listener.assert_called_once()
+    assert entry_data["data"] == VALUE_PAYLOAD
+    assert (entry_data["watermark"].stale, entry_data["watermark"].duplicates) == (1, 1)
@@ -0,0 +1,204 @@
+"""Tests for the long-term statistics of a vehicle."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.torque_obd.const import DOMAIN
+from homeassistant.components.recorder.models import StatisticMeanType
+
+from custom_components.torque_obd.long_term_statistics import (
+    TorqueStatisticsAggregator,
+    statistic_id,
+    statistic_metadata,
+)
+
+HOUR = datetime(2025, 10, 18, 10, tzinfo=timezone.utc).timestamp()
+
+
+class _MemoryStore:
+    """In-memory stand-in for a ``Store``, shared by key."""
+
+    saved: dict[str, Any] = {}
+
+    def __init__(self, hass: Any, version: int, key: str) -> None:
+        self._key = key
+
+    async def async_load(self) -> Any:
+        return self.saved.get(self._key)
+
+    async def async_save(self, data: Any) -> None:
+        self.saved[self._key] = data
+
+    def async_delay_save(self, data_func: Any, delay: float) -> None:
+        self.saved[self._key] = data_func()
+
+
+@pytest.fixture(autouse=True)
+def memory_store():
+    """Keep the stored statistics hours in memory."""
+    with patch(
+        "custom_components.torque_obd.long_term_statistics.Store", _MemoryStore
+    ), patch.dict(_MemoryStore.saved, clear=True):
+        yield _MemoryStore.saved
+
+
+@pytest.fixture
+def add_statistics():
+    """Capture the statistics handed to the recorder."""
+    with patch(
+        "custom_components.torque_obd.long_term_statistics.async_add_statistics"
+    ) as add_statistics:
+        yield add_statistics
+
+
+def _aggregator() -> TorqueStatisticsAggregator:
+    hass = MagicMock()
+    hass.config.components = {"recorder"}
+    aggregator = TorqueStatisticsAggregator(hass, "entry", "my-car", "My Car")
+    aggregator.async_register("k0c", "Engine RPM", "rpm")
+    return aggregator
+
+
+def _record(aggregator: TorqueStatisticsAggregator, at: float, value: float) -> None:
+    with patch(
+        "custom_components.torque_obd.long_term_statistics.time.time", return_value=at
+    ):
+        aggregator.async_record("k0c", value)
+
+
+def test_statistic_id_is_valid_external_id() -> None:
+    """Vehicle slugs and column names are reduced to a valid object id."""
+    assert statistic_id("my-car", "k0c") == f"{DOMAIN}:my_car_k0c"
+    assert statistic_id("my-car", "Speed (OBD)") == f"{DOMAIN}:my_car_speed_obd"
+
+
+def test_statistic_metadata_uses_mean_type_and_unit_class() -> None:
+    """Metadata sets mean_type and the unit class instead of has_mean."""
+    metadata = statistic_metadata(f"{DOMAIN}:my_car_k05", "My Car Coolant", "°C", "temperature")
+
+    assert metadata == {
+        "source": DOMAIN,
+        "statistic_id": f"{DOMAIN}:my_car_k05",
+        "name": "My Car Coolant",
+        "unit_of_measurement": "°C",
+        "unit_class": "temperature",
+        "mean_type": StatisticMeanType.ARITHMETIC,
+        "has_sum": False,
+    }
+    # Units without a converter (e.g. rpm) have no unit class
+    assert statistic_metadata(f"{DOMAIN}:my_car_k0c", "My Car RPM", "rpm")["unit_class"] is None
+
+
+def test_push_writes_running_aggregate_of_the_hour(add_statistics: MagicMock) -> None:
+    """Pushes write the hour so far and skip PIDs without new values."""
+    aggregator = _aggregator()
+    _record(aggregator, HOUR + 10, 800)
+    _record(aggregator, HOUR + 20, 2400)
+    _record(aggregator, HOUR + 30, 1000)
+
+    aggregator.async_push()
+    aggregator.async_push()
+
+    add_statistics.assert_called_once()
+    _, metadata, statistics = add_statistics.call_args.args
+    assert metadata["statistic_id"] == f"{DOMAIN}:my_car_k0c"
+    assert metadata["name"] == "My Car Engine RPM"
+    assert statistics == [
+        {
+            "start": datetime(2025, 10, 18, 10, tzinfo=timezone.utc),
+            "mean": pytest.approx(4200 / 3),
+            "min": 800,
+            "max": 2400,
+        }
+    ]
+
+
+def test_new_hour_writes_the_finished_hour(add_statistics: MagicMock) -> None:
+    """The first value of a new hour closes the previous one."""
+    aggregator = _aggregator()
+    _record(aggregator, HOUR + 3590, 800)
+    _record(aggregator, HOUR + 3610, 900)
+
+    _, _, statistics = add_statistics.call_args.args
+    assert statistics[0]["start"] == datetime(2025, 10, 18, 10, tzinfo=timezone.utc)
+    assert statistics[0]["mean"] == 800
+
+    aggregator.async_push()
+    _, _, statistics = add_statistics.call_args.args
+    assert statistics[0]["start"] == datetime(2025, 10, 18, 11, tzinfo=timezone.utc)
+    assert statistics[0]["mean"] == 900
+    assert aggregator.pushed == 2
+
+
+def test_statistics_only_metadata_keys(add_statistics: MagicMock) -> None:
+    """Statistics-only pushes describe the statistic without has_mean."""
+    aggregator = _aggregator()
+    aggregator.async_register("k0d", "Vehicle Speed", "km/h", "speed")
+    with patch(
+        "custom_components.torque_obd.long_term_statistics.time.time", return_value=HOUR
+    ):
+        aggregator.async_record("k0d", 50.0)
+
+    aggregator.async_push()
+
+    _, metadata, _ = add_statistics.call_args.args
+    assert set(metadata) == {
+        "source",
+        "statistic_id",
+        "name",
+        "unit_of_measurement",
+        "unit_class",
+        "mean_type",
+        "has_sum",
+    }
+    assert metadata["unit_class"] == "speed"
+    assert metadata["mean_type"] is StatisticMeanType.ARITHMETIC
+
+
+def test_reload_mid_hour_continues_the_hour(add_statistics: MagicMock) -> None:
+    """A reload keeps the values received earlier in the hour."""
+    aggregator = _aggregator()
+    _record(aggregator, HOUR + 10, 800)
+    _record(aggregator, HOUR + 20, 2400)
+    aggregator.async_push()
+    asyncio.run(aggregator.async_save())
+
+    reloaded = _aggregator()
+    asyncio.run(reloaded.async_load())
+    _record(reloaded, HOUR + 1800, 1000)
+    reloaded.async_push()
+
+    _, _, statistics = add_statistics.call_args.args
+    assert statistics == [
+        {
+            "start": datetime(2025, 10, 18, 10, tzinfo=timezone.utc),
+            "mean": pytest.approx(4200 / 3),
+            "min": 800,
+            "max": 2400,
+        }
+    ]
+
+
+def test_merge_adds_imported_values_to_the_current_hour(add_statistics: MagicMock) -> None:
+    """Imported values of the aggregated hour are merged with the live ones."""
+    aggregator = _aggregator()
+    _record(aggregator, HOUR + 10, 800)
+
+    with patch(
+        "custom_components.torque_obd.long_term_statistics.time.time",
+        return_value=HOUR + 20,
+    ):
+        assert aggregator.async_merge("k0c", HOUR, [3400, 2, 1000, 2400])
+        assert not aggregator.async_merge("k0c", HOUR - 3600, [1000, 1, 1000, 1000])
+        assert not aggregator.async_merge("k0d", HOUR, [1000, 1, 1000, 1000])
+    aggregator.async_push()
+
+    _, _, statistics = add_statistics.call_args.args
+    assert statistics[0]["mean"] == pytest.approx(4200 / 3)
+    assert statistics[0]["min"] == 800
+    assert statistics[0]["max"] == 2400
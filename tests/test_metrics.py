@@ -0,0 +1,94 @@
+"""Tests for the Torque OBD-II ingest metrics."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from custom_components.torque_obd import TorqueView
+from custom_components.torque_obd.const import DOMAIN
+from custom_components.torque_obd.metrics import (
+    METRIC_BYTES_RECEIVED,
+    METRIC_DISPATCH_TIME,
+    METRIC_PARSE_TIME,
+    METRIC_REQUESTS_PER_MINUTE,
+    METRIC_STATE_WRITES_PER_PUSH,
+    TorqueIngestMetrics,
+)
+from custom_components.torque_obd.sensor import TorqueMetricSensor, TorqueSensor
+
+ENTRY_ID = "test_entry_abc"
+
+
+def test_snapshot_turns_window_into_rates_and_resets_it() -> None:
+    """Window counters become rates; running totals survive the reset."""
+    with patch("custom_components.torque_obd.metrics.time.monotonic", return_value=0.0):
+        metrics = TorqueIngestMetrics()
+    metrics.requests = 30
+    metrics.parse_time = 0.03
+    metrics.pushes = 10
+    metrics.state_writes = 25
+    metrics.bytes_received = 4096
+
+    with patch("custom_components.torque_obd.metrics.time.monotonic", return_value=30.0):
+        snapshot = metrics.snapshot()
+
+    assert snapshot[METRIC_REQUESTS_PER_MINUTE] == 60.0
+    assert snapshot[METRIC_PARSE_TIME] == 1.0
+    assert snapshot[METRIC_STATE_WRITES_PER_PUSH] == 2.5
+    assert snapshot[METRIC_DISPATCH_TIME] == 0.0
+    assert metrics.requests == 0
+    assert metrics.bytes_received == 4096
+
+
+def test_view_records_request_and_push_metrics() -> None:
+    """The ingest path counts requests, bytes and pushes."""
+    hass = MagicMock()
+    metrics = TorqueIngestMetrics()
+    hass.data = {
+        DOMAIN: {
+            "routes": {"car": ENTRY_ID},
+            ENTRY_ID: {"vehicle_name": "Car", "key_signatures": {}, "metrics": metrics},
+        }
+    }
+    view = TorqueView(hass)
+    payload = {"kd": "10"}
+    hass.data[DOMAIN][ENTRY_ID]["key_signatures"][frozenset(payload)] = None
+    request = MagicMock(method="GET", query=payload, query_string="kd=10")
+
+    asyncio.run(view._handle_request(request, "car"))
+
+    assert metrics.requests == 1
+    assert metrics.pushes == 1
+    assert metrics.bytes_received == 5
+
+
+def test_sensor_counts_state_writes() -> None:
+    """Sensors count their state writes."""
+    metrics = TorqueIngestMetrics()
+    sensor = TorqueSensor(
+        MagicMock(),
+        ENTRY_ID,
+        "",
+        "Car",
+        "kff1238",
+        {"name": "Voltage", "unit": "V", "icon": None, "device_class": None, "state_class": None},
+    )
+    sensor.async_write_ha_state = MagicMock()
+    sensor._metrics = metrics
+
+    sensor._handle_update({"kff1238": "12.6"})
+    sensor._handle_update({"kff1238": "-"})
+
+    assert metrics.state_writes == 2
+
+
+def test_metric_sensor_publishes_its_snapshot_value() -> None:
+    """Metric sensors take their value from the published snapshot."""
+    sensor = TorqueMetricSensor(MagicMock(), ENTRY_ID, "Car", METRIC_BYTES_RECEIVED)
+    sensor.async_write_ha_state = MagicMock()
+
+    sensor._handle_metrics({METRIC_BYTES_RECEIVED: 1234, METRIC_PARSE_TIME: 0.5})
+
+    assert sensor.native_value == 1234
+    assert sensor.unique_id == f"{DOMAIN}_{ENTRY_ID}_metric_{METRIC_BYTES_RECEIVED}"
+    sensor.async_write_ha_state.assert_called_once()
@@ -0,0 +1,100 @@
+"""Tests for the Torque OBD-II ingest profiler."""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.torque_obd import TorqueView
+from custom_components.torque_obd.const import DOMAIN
+from custom_components.torque_obd.ingest import TorqueIngestQueue
+from custom_components.torque_obd.profiler import TorqueProfiler
+from custom_components.torque_obd.state_flush import TorqueStateFlusher
+
+ENTRY_ID = "test_entry_abc"
+
+
+def _make_hass() -> MagicMock:
+    """Create a mock hass with the shared view and one vehicle."""
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"routes": {"car": ENTRY_ID}}}
+    hass.data[DOMAIN]["view"] = TorqueView(hass)
+    hass.data[DOMAIN][ENTRY_ID] = {
+        "vehicle_name": "Car",
+        "ingest_queue": TorqueIngestQueue("Car", AsyncMock(), 0, 10),
+        "state_flusher": TorqueStateFlusher(MagicMock(), "Car"),
+    }
+    return hass
+
+
+def test_profiler_wraps_only_while_running() -> None:
+    """Handlers are wrapped for N requests and restored afterwards."""
+    hass = _make_hass()
+    view = hass.data[DOMAIN]["view"]
+    ingest_queue = hass.data[DOMAIN][ENTRY_ID]["ingest_queue"]
+    original_process = ingest_queue.process
+
+    state_flusher = hass.data[DOMAIN][ENTRY_ID]["state_flusher"]
+
+    TorqueProfiler(hass, 2, 300).async_start()
+    assert "_handle_request" in vars(view)
+    assert ingest_queue.process is not original_process
+    assert "async_flush" in vars(state_flusher)
+
+    async def _run() -> None:
+        for _ in range(2):
+            await view.get(MagicMock(method="GET", query={"kd": "1"}), "car")
+
+    asyncio.run(_run())
+
+    assert "_handle_request" not in vars(view)
+    assert ingest_queue.process is original_process
+    assert "async_flush" not in vars(state_flusher)
+    assert "profiler" not in hass.data[DOMAIN]
+    assert ingest_queue.pending == 2
+    hass.async_add_executor_job.assert_called_once()
+    hass.loop.call_later.return_value.cancel.assert_called_once()
+
+
+def test_profiler_stops_after_max_duration() -> None:
+    """A profile without enough requests is stopped by its timeout."""
+    hass = _make_hass()
+    view = hass.data[DOMAIN]["view"]
+
+    TorqueProfiler(hass, 100, 60).async_start()
+    delay, timeout = hass.loop.call_later.call_args.args
+    assert delay == 60
+
+    timeout()
+
+    assert "_handle_request" not in vars(view)
+    assert "profiler" not in hass.data[DOMAIN]
+    hass.async_add_executor_job.assert_called_once()
+
+
+def test_profiler_rejects_a_second_start() -> None:
+    """Starting while a profile runs would stack the wrappers."""
+    hass = _make_hass()
+    profiler = TorqueProfiler(hass, 1, 300)
+    profiler.async_start()
+
+    with pytest.raises(HomeAssistantError):
+        TorqueProfiler(hass, 1, 300).async_start()
+    assert hass.data[DOMAIN]["profiler"] is profiler
+
+
+def test_profiler_writes_stats(tmp_path: Path) -> None:
+    """The pstats dump and the text summary are written."""
+    profiler = TorqueProfiler(_make_hass(), 1, 300)
+    profiler._profile.enable()
+    sum(range(100))
+    profiler._profile.disable()
+
+    profiler._write_stats(str(tmp_path / "profile"))
+
+    assert (tmp_path / "profile.prof").stat().st_size > 0
+    assert "function calls" in (tmp_path / "profile.txt").read_text()
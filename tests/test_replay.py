@@ -0,0 +1,89 @@
+"""Tests for replaying captured Torque uploads."""
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from homeassistant.exceptions import HomeAssistantError
+
+from benchmarks.bench_ingest import session_payloads, setup_vehicles
+from benchmarks.replay import async_replay
+from custom_components.torque_obd.const import DOMAIN
+from custom_components.torque_obd.replay import async_replay_file, iter_payload_file
+from custom_components.torque_obd.services import _resolve_file
+
+
+def _write_capture(path: Path, pushes: int = 5) -> list[dict]:
+    """Write a JSON-lines capture of a synthetic session."""
+    payloads = list(session_payloads(vehicle=0, pid_count=4, pushes=pushes))
+    path.write_text("\n".join(json.dumps(payload) for payload in payloads) + "\n")
+    return payloads
+
+
+def test_iter_payload_file_reads_json_lines(tmp_path: Path) -> None:
+    """Blank lines are skipped and every payload is returned in order."""
+    capture = tmp_path / "drive.jsonl"
+    payloads = _write_capture(capture)
+    capture.write_text(capture.read_text() + "\n\n")
+
+    assert list(iter_payload_file(str(capture))) == payloads
+
+
+def test_replay_reports_throughput_and_state_writes(tmp_path: Path) -> None:
+    """An as-fast-as-possible replay drives every payload through the view."""
+    capture = tmp_path / "drive.jsonl"
+    _write_capture(capture, pushes=5)
+
+    result = asyncio.run(async_replay(str(capture), speed=0))
+
+    assert result["payloads"] == 7
+    assert result["sensors"] == 4
+    assert 0 < result["state_writes"] <= 20
+    assert result["payloads_per_s"] > 0
+
+
+def test_replay_leaves_live_ingest_state_alone(tmp_path: Path) -> None:
+    """A replay is neither recorded nor ordered against the live uploads."""
+    capture = tmp_path / "drive.jsonl"
+    _write_capture(capture, pushes=3)
+    view, _ = setup_vehicles(1)
+    entry_data = view.hass.data[DOMAIN]["bench_0"]
+    recorder = entry_data["session_recorder"] = MagicMock()
+    watermark = entry_data["watermark"]
+    assert watermark.async_accept({"session": "9999999999999", "time": "9999999999999"})
+
+    result = asyncio.run(async_replay_file(view.hass, view, "bench_0", str(capture), 0))
+
+    assert result.state_writes > 0
+    assert entry_data["session_recorder"] is recorder
+    recorder.async_record.assert_not_called()
+    assert watermark.watermark == (9999999999999, 9999999999999)
+
+
+def test_replay_keeps_scaled_original_timing(tmp_path: Path) -> None:
+    """With a speed factor the payload time gaps are replayed scaled down."""
+    capture = tmp_path / "drive.jsonl"
+    _write_capture(capture, pushes=3)
+
+    result = asyncio.run(async_replay(str(capture), speed=100))
+
+    # Three pushes spaced 1 s apart at 100x take at least 30 ms
+    assert result["duration_s"] >= 0.03
+
+
+def test_replay_file_must_be_inside_config_dir() -> None:
+    """Files outside the config directory need to be allow-listed."""
+    hass = MagicMock()
+    hass.config.config_dir = "/config"
+    hass.config.path = lambda *parts: "/".join(("/config", *parts))
+    hass.config.is_allowed_path.return_value = False
+
+    assert _resolve_file(hass, "torque_obd_sessions/car/1.000.gz") == (
+        "/config/torque_obd_sessions/car/1.000.gz"
+    )
+    with pytest.raises(HomeAssistantError):
+        _resolve_file(hass, "../etc/passwd")
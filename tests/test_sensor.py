@@ -0,0 +1,217 @@
+"""Tests for the Torque OBD-II sensor entities."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from homeassistant.components.sensor import SensorDeviceClass
+
+from custom_components.torque_obd import _payload_context
+from custom_components.torque_obd.const import SENSOR_DEFINITIONS
+from custom_components.torque_obd.sensor import TorqueSensor, _exceeds_deadband
+from custom_components.torque_obd.state_flush import TorqueTimerWheel
+
+ENTRY_ID = "test_entry_abc"
+VEHICLE_NAME = "2025 Ford Escape"
+
+
+def _make_sensor(key: str = "kd", definition: dict | None = None) -> TorqueSensor:
+    """Create a TorqueSensor with a mocked state writer."""
+    if definition is None:
+        definition = SENSOR_DEFINITIONS["k0d"].copy()
+    sensor = TorqueSensor(MagicMock(), ENTRY_ID, "", VEHICLE_NAME, key, definition)
+    sensor.async_write_ha_state = MagicMock()
+    return sensor
+
+
+@pytest.mark.parametrize(
+    ("old_value", "new_value", "deadband", "deadband_percent", "expected"),
+    [
+        (50.0, 50.0, 0.0, 0.0, False),
+        (50.0, 50.5, 0.0, 0.0, True),
+        (50.0, 50.05, 0.1, 0.0, False),
+        (50.0, 50.2, 0.1, 0.0, True),
+        (100.0, 100.9, 0.0, 1.0, False),
+        (100.0, 101.5, 0.0, 1.0, True),
+        (100.0, 100.5, 1.0, 0.1, False),
+        (None, 50.0, 0.1, 0.0, True),
+        (50.0, None, 0.1, 0.0, True),
+        ("Closed loop", "Closed loop", 0.0, 0.0, False),
+        ("Closed loop", "Open loop", 0.0, 0.0, True),
+    ],
+)
+def test_exceeds_deadband(
+    old_value: object,
+    new_value: object,
+    deadband: float,
+    deadband_percent: float,
+    expected: bool,
+) -> None:
+    """Deadbands should use the larger of the absolute and relative thresholds."""
+    assert _exceeds_deadband(old_value, new_value, deadband, deadband_percent) is expected
+
+
+def test_deadband_defaults_by_device_class() -> None:
+    """Sensors without an explicit deadband fall back to their device class default."""
+    speed_sensor = _make_sensor()
+    generic_sensor = _make_sensor("k999", {"name": "PID k999", "device_class": None})
+
+    assert SENSOR_DEFINITIONS["k0d"]["device_class"] == SensorDeviceClass.SPEED
+    assert speed_sensor._deadband == pytest.approx(0.1)
+    assert generic_sensor._deadband == 0.0
+
+
+def test_handle_update_writes_first_value() -> None:
+    """The first value after startup is always written."""
+    sensor = _make_sensor()
+
+    sensor._handle_update({"kd": 50.0, "session": "1", "id": "device"})
+
+    assert sensor._attr_native_value == pytest.approx(50.0)
+    assert sensor._attr_extra_state_attributes["session"] == "1"
+    assert sensor._attr_extra_state_attributes["device_id"] == "device"
+    sensor.async_write_ha_state.assert_called_once()
+
+
+def test_handle_update_uses_the_context_of_the_ingest_stage() -> None:
+    """Sensors share the context stored for the payload instead of building one."""
+    sensor = _make_sensor()
+    context = _payload_context({"session": "1", "id": "device", "time": "1760720540100"})
+    sensor._entry_data = {"context": context}
+
+    with patch("custom_components.torque_obd.sensor._payload_context") as payload_context:
+        sensor._handle_update({"kd": 50.0, "session": "1", "id": "device"})
+
+    payload_context.assert_not_called()
+    assert sensor._attr_extra_state_attributes is context.attributes
+
+
+def test_handle_update_suppresses_unchanged_values() -> None:
+    """Unchanged values and changes inside the deadband cost no state write."""
+    sensor = _make_sensor()
+
+    sensor._handle_update({"kd": 50.0, "session": "1"})
+    sensor._handle_update({"kd": 50.0, "session": "1"})
+    sensor._handle_update({"kd": 50.05, "session": "1"})
+
+    assert sensor._attr_native_value == pytest.approx(50.0)
+    sensor.async_write_ha_state.assert_called_once()
+
+
+def test_handle_update_writes_changed_values() -> None:
+    """Changes outside the deadband are written."""
+    sensor = _make_sensor()
+
+    sensor._handle_update({"kd": 50.0, "session": "1"})
+    sensor._handle_update({"kd": 51.0, "session": "1"})
+
+    assert sensor._attr_native_value == pytest.approx(51.0)
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+def test_handle_update_writes_on_new_session() -> None:
+    """A new Torque session forces a write so the session attribute is current."""
+    sensor = _make_sensor()
+
+    sensor._handle_update({"kd": 50.0, "session": "1"})
+    sensor._handle_update({"kd": 50.0, "session": "2"})
+
+    assert sensor._attr_extra_state_attributes["session"] == "2"
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+def test_handle_update_heartbeat_after_max_silence() -> None:
+    """An unchanged value is written once max_silence has elapsed."""
+    definition = SENSOR_DEFINITIONS["k0d"].copy()
+    definition["max_silence"] = 60.0
+    sensor = _make_sensor(definition=definition)
+
+    with patch(
+        "custom_components.torque_obd.sensor.time.monotonic",
+        side_effect=[1000.0, 1030.0, 1061.0],
+    ):
+        sensor._handle_update({"kd": 50.0})
+        sensor._handle_update({"kd": 50.0})
+        sensor._handle_update({"kd": 50.0})
+
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+def test_heartbeat_writes_suppressed_value_after_uploads_stop() -> None:
+    """The newest suppressed value is written after max_silence without uploads."""
+    sensor = _make_sensor("kd", {**SENSOR_DEFINITIONS["k0d"], "max_silence": 0.05})
+
+    async def _run() -> None:
+        sensor._timer_wheel = TorqueTimerWheel(asyncio.get_running_loop(), 0.01)
+        sensor._handle_update({"kd": 50.0, "time": "1000"})
+        sensor._handle_update({"kd": 50.05, "time": "2000"})
+        assert sensor.async_write_ha_state.call_count == 1
+        assert sensor._timer_wheel.pending == 1
+        await asyncio.sleep(0.1)
+
+    asyncio.run(_run())
+
+    assert sensor._attr_native_value == pytest.approx(50.05)
+    assert sensor.async_write_ha_state.call_count == 2
+    assert sensor._timer_wheel.pending == 0
+
+
+def test_statistics_only_records_every_value_and_throttles_writes() -> None:
+    """In statistics-only mode every value is aggregated, states are throttled."""
+    statistics = MagicMock()
+    sensor = TorqueSensor(
+        MagicMock(),
+        ENTRY_ID,
+        "",
+        VEHICLE_NAME,
+        "kd",
+        SENSOR_DEFINITIONS["k0d"].copy(),
+        statistics=statistics,
+    )
+    sensor.async_write_ha_state = MagicMock()
+
+    with patch(
+        "custom_components.torque_obd.sensor.time.monotonic",
+        side_effect=[1000.0, 1010.0, 1061.0],
+    ):
+        sensor._handle_update({"kd": 50.0})
+        sensor._handle_update({"kd": 80.0})
+        sensor._handle_update({"kd": 60.0})
+
+    assert sensor.state_class is None
+    assert [call.args for call in statistics.async_record.call_args_list] == [
+        ("k0d", 50.0),
+        ("k0d", 80.0),
+        ("k0d", 60.0),
+    ]
+    assert sensor.async_write_ha_state.call_count == 2
+    assert sensor.native_value == 60.0
+
+
+def test_min_interval_defaults_by_device_class() -> None:
+    """Slow quantities are rate limited by default, fast ones are not."""
+    assert _make_sensor("k05", SENSOR_DEFINITIONS["k05"].copy())._min_interval == 30
+    assert _make_sensor("k2f", SENSOR_DEFINITIONS["k2f"].copy())._min_interval == 30
+    assert _make_sensor()._min_interval == 0
+    assert _make_sensor("kd", {**SENSOR_DEFINITIONS["k0d"], "min_interval": 2.0})._min_interval == 2.0
+
+
+def test_min_interval_writes_newest_held_value_on_trailing_edge() -> None:
+    """Values within min_interval are held and the newest one written later."""
+    sensor = _make_sensor("kd", {**SENSOR_DEFINITIONS["k0d"], "min_interval": 0.05})
+
+    async def _run() -> None:
+        sensor._timer_wheel = TorqueTimerWheel(asyncio.get_running_loop(), 0.01)
+        sensor._handle_update({"kd": 50.0})
+        sensor._handle_update({"kd": 60.0})
+        sensor._handle_update({"kd": 70.0})
+        assert sensor._attr_native_value == 50.0
+        assert sensor._timer_wheel.pending == 1
+        await asyncio.sleep(0.1)
+
+    asyncio.run(_run())
+
+    assert sensor._attr_native_value == 70.0
+    assert sensor.async_write_ha_state.call_count == 2
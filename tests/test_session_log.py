@@ -0,0 +1,67 @@
+"""Tests for the Torque OBD-II session log recorder."""
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from custom_components.torque_obd.session_log import (
+    TorqueSessionRecorder,
+    iter_session_log,
+)
+
+
+def _make_recorder(directory: Path, max_file_size: int = 1024 * 1024) -> TorqueSessionRecorder:
+    """Create a recorder whose executor jobs run synchronously."""
+    hass = MagicMock()
+    hass.async_add_executor_job = lambda func, *args: func(*args)
+    return TorqueSessionRecorder(hass, str(directory), max_file_size, flush_batch=3)
+
+
+def test_recorder_batches_per_session_and_round_trips(tmp_path: Path) -> None:
+    """Uploads are written per session once the batch is full."""
+    recorder = _make_recorder(tmp_path)
+    payloads = [
+        {"session": "1760720944365", "time": "1", "kd": "10"},
+        {"session": "1760720944365", "time": "2", "kd": "11"},
+        {"session": "1760720999999", "time": "3", "kc": "900"},
+    ]
+
+    recorder.async_record(payloads[0])
+    recorder.async_record(payloads[1])
+    assert not list(tmp_path.iterdir())
+
+    recorder.async_record(payloads[2])
+
+    assert list(iter_session_log(str(tmp_path / "1760720944365.000.gz"))) == payloads[:2]
+    assert list(iter_session_log(str(tmp_path / "1760720999999.000.gz"))) == payloads[2:]
+
+
+def test_recorder_appends_across_flushes(tmp_path: Path) -> None:
+    """Later flushes append a gzip member to the same session file."""
+    recorder = _make_recorder(tmp_path)
+    for value in ("10", "11"):
+        recorder.async_record({"session": "1", "kd": value})
+        recorder.async_flush()
+
+    assert [payload["kd"] for payload in iter_session_log(str(tmp_path / "1.000.gz"))] == ["10", "11"]
+
+
+def test_recorder_rotates_by_size(tmp_path: Path) -> None:
+    """A new part is started once a file exceeds the size limit."""
+    recorder = _make_recorder(tmp_path, max_file_size=1)
+    for value in ("10", "11"):
+        recorder.async_record({"session": "1", "kd": value})
+        recorder.async_flush()
+
+    assert list(iter_session_log(str(tmp_path / "1.000.gz"))) == [{"session": "1", "kd": "10"}]
+    assert list(iter_session_log(str(tmp_path / "1.001.gz"))) == [{"session": "1", "kd": "11"}]
+
+
+def test_recorder_sanitizes_session_file_names(tmp_path: Path) -> None:
+    """Session values never escape the recorder directory."""
+    recorder = _make_recorder(tmp_path)
+    recorder.async_record({"session": "../../etc"})
+    recorder.async_record({})
+    recorder.async_flush()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["etc.000.gz", "unknown.000.gz"]
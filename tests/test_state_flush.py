@@ -0,0 +1,122 @@
+"""Tests for batched sensor state writes."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+from custom_components.torque_obd.metrics import TorqueIngestMetrics
+from custom_components.torque_obd.sensor import TorqueSensor
+from custom_components.torque_obd.state_flush import TorqueStateFlusher, TorqueTimerWheel
+
+VEHICLE_NAME = "Family Car"
+
+
+def test_dirty_entities_are_written_in_one_pass() -> None:
+    """Entities marked dirty are written once each, in a single flush."""
+    metrics = TorqueIngestMetrics()
+    speed, rpm = MagicMock(), MagicMock()
+
+    async def _run() -> TorqueStateFlusher:
+        flusher = TorqueStateFlusher(asyncio.get_running_loop(), VEHICLE_NAME, metrics=metrics)
+        flusher.async_mark_dirty(speed)
+        flusher.async_mark_dirty(rpm)
+        flusher.async_mark_dirty(speed)
+        speed.async_write_ha_state.assert_not_called()
+        assert flusher.pending == 2
+        await asyncio.sleep(0)
+        return flusher
+
+    flusher = asyncio.run(_run())
+
+    speed.async_write_ha_state.assert_called_once()
+    rpm.async_write_ha_state.assert_called_once()
+    assert flusher.flushes == 1
+    assert metrics.state_writes == 2
+
+
+def test_min_interval_bounds_flushes() -> None:
+    """Entities dirtied within the minimum interval wait for the next flush."""
+    entity, removed = MagicMock(), MagicMock()
+
+    async def _run() -> TorqueStateFlusher:
+        flusher = TorqueStateFlusher(asyncio.get_running_loop(), VEHICLE_NAME, 0.05)
+        flusher.async_mark_dirty(entity)
+        await asyncio.sleep(0)
+        assert entity.async_write_ha_state.call_count == 1
+
+        flusher.async_mark_dirty(entity)
+        flusher.async_mark_dirty(removed)
+        flusher.async_discard(removed)
+        await asyncio.sleep(0)
+        assert entity.async_write_ha_state.call_count == 1
+        await asyncio.sleep(0.1)
+
+        flusher.async_mark_dirty(entity)
+        flusher.async_cancel()
+        await asyncio.sleep(0.1)
+        return flusher
+
+    flusher = asyncio.run(_run())
+
+    assert entity.async_write_ha_state.call_count == 2
+    removed.async_write_ha_state.assert_not_called()
+    assert flusher.flushes == 2
+
+
+def test_sensor_marks_itself_dirty_instead_of_writing() -> None:
+    """Sensors with a flusher leave the state write to it."""
+    flusher = MagicMock()
+    sensor = TorqueSensor(
+        MagicMock(),
+        "entry",
+        "",
+        VEHICLE_NAME,
+        "kd",
+        {"name": "Speed", "unit": "km/h", "icon": None, "device_class": None, "state_class": None},
+    )
+    sensor.async_write_ha_state = MagicMock()
+    sensor._flusher = flusher
+
+    sensor._handle_update({"kd": 50.0})
+    sensor._handle_update({"kd": 50.0})
+
+    flusher.async_mark_dirty.assert_called_once_with(sensor)
+    sensor.async_write_ha_state.assert_not_called()
+    assert sensor._attr_native_value == 50.0
+
+
+def test_timer_wheel_runs_actions_from_one_timer() -> None:
+    """Actions due in the same slot share one event loop timer."""
+    ran: list[str] = []
+    first = lambda: ran.append("first")  # noqa: E731
+    second = lambda: ran.append("second")  # noqa: E731
+    later = lambda: ran.append("later")  # noqa: E731
+    cancelled = lambda: ran.append("cancelled")  # noqa: E731
+
+    async def _run() -> None:
+        loop = asyncio.get_running_loop()
+        wheel = TorqueTimerWheel(loop, 0.02)
+        original_call_at = loop.call_at
+        loop.call_at = MagicMock(side_effect=original_call_at)  # type: ignore[method-assign]
+
+        wheel.async_schedule(0.001, first)
+        wheel.async_schedule(0.001, second)
+        wheel.async_schedule(0.001, first)
+        wheel.async_schedule(0.06, later)
+        wheel.async_schedule(0.06, cancelled)
+        wheel.async_cancel(cancelled)
+        assert wheel.pending == 3
+        assert loop.call_at.call_count == 1
+
+        await asyncio.sleep(0.03)
+        assert ran == ["first", "second"]
+        loop.call_at = original_call_at  # type: ignore[method-assign]
+        await asyncio.sleep(0.08)
+
+        wheel.async_schedule(0.01, cancelled)
+        wheel.async_stop()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(_run())
+
+    assert ran == ["first", "second", "later"]
@@ -0,0 +1,209 @@
+"""Tests for importing Torque track logs into statistics."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.torque_obd.const import DOMAIN
+from custom_components.torque_obd.track_log import (
+    TorqueTrackLogImporter,
+    parse_track_log,
+    split_column,
+)
+
+HEADER = (
+    "GPS Time, Device Time, Longitude, Latitude,Engine RPM(rpm),"
+    "Speed (OBD)(km/h),Boost Pressure(psi)\n"
+)
+
+TRACK_LOG = (
+    HEADER
+    + "Sat Oct 18 10:59:58 GMT 2025,18-Oct-2025 10:59:58.100,9.1,45.4,800,0,-\n"
+    + "Sat Oct 18 10:59:59 GMT 2025,18-Oct-2025 10:59:59.100,9.1,45.4,2400,30,-\n"
+    # Logging restarted: Torque writes the header again
+    + HEADER
+    + "Sat Oct 18 11:00:00 GMT 2025,18-Oct-2025 11:00:00.100,9.1,45.4,1000,35,4.5\n"
+    + "Sat Oct 18 11:00:01 GMT 2025,not a time,9.1,45.4,1200,35,4.5\n"
+)
+
+
+def _write_track_log(path: Path) -> str:
+    path.write_text(TRACK_LOG, encoding="utf-8")
+    return str(path)
+
+
+def test_split_column() -> None:
+    """The last parenthesised part of a header is its unit."""
+    assert split_column(" Engine RPM(rpm)") == ("Engine RPM", "rpm")
+    assert split_column("Speed (OBD)(km/h)") == ("Speed (OBD)", "km/h")
+    assert split_column("Fuel Status") == ("Fuel Status", None)
+
+
+def test_parse_track_log_aggregates_per_hour(tmp_path: Path) -> None:
+    """Rows are bucketed per hour; missing values and bad rows are skipped."""
+    track_log = parse_track_log(_write_track_log(tmp_path / "trackLog.csv"), timezone.utc)
+
+    assert track_log.rows == 3
+    assert track_log.skipped_rows == 1
+    assert set(track_log.columns) == {
+        "Engine RPM(rpm)",
+        "Speed (OBD)(km/h)",
+        "Boost Pressure(psi)",
+    }
+
+    ten = datetime(2025, 10, 18, 10, tzinfo=timezone.utc)
+    eleven = datetime(2025, 10, 18, 11, tzinfo=timezone.utc)
+    rpm = track_log.columns["Engine RPM(rpm)"]
+    assert rpm.name == "Engine RPM"
+    assert rpm.unit == "rpm"
+    assert rpm.buckets == {ten: [3200, 2, 800, 2400], eleven: [1000, 1, 1000, 1000]}
+    assert list(track_log.columns["Boost Pressure(psi)"].buckets) == [eleven]
+
+
+@pytest.fixture
+def add_statistics():
+    """Capture the statistics handed to the recorder."""
+    with patch(
+        "custom_components.torque_obd.track_log.async_add_statistics"
+    ) as add_statistics:
+        yield add_statistics
+
+
+@pytest.fixture(autouse=True)
+def recorded_hours():
+    """Stand in for the hours the recorder already has (none by default)."""
+    with patch(
+        "custom_components.torque_obd.track_log.async_recorded_hours",
+        AsyncMock(return_value=set()),
+    ) as recorded_hours:
+        yield recorded_hours
+
+
+def _importer(tmp_path: Path) -> tuple[TorqueTrackLogImporter, MagicMock]:
+    hass = MagicMock()
+    hass.config.components = {"recorder"}
+    hass.config.time_zone = "UTC"
+    hass.data = {
+        DOMAIN: {
+            "sensor_definitions": {"k0c": {"name": "Engine RPM", "unit": "RPM"}},
+            "entry": {
+                "slug": "my-car",
+                "vehicle_name": "My Car",
+                "sensor_names": {"k0d": {"full_name": "Speed (OBD)", "short_name": "Speed"}},
+            },
+        }
+    }
+
+    async def _executor(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = _executor
+    return TorqueTrackLogImporter(hass, "entry", str(tmp_path / "import")), hass
+
+
+def test_import_maps_columns_to_pids(tmp_path: Path, add_statistics: MagicMock) -> None:
+    """Columns matching a definition or learned name use the PID as id."""
+    importer, _ = _importer(tmp_path)
+
+    result = asyncio.run(importer.async_import(_write_track_log(tmp_path / "trackLog.csv")))
+
+    assert result == {
+        "rows": 3,
+        "skipped_rows": 1,
+        "statistics": [
+            f"{DOMAIN}:my_car_k0c",
+            f"{DOMAIN}:my_car_k0d",
+            f"{DOMAIN}:my_car_boost_pressure",
+        ],
+        "hours": 5,
+        "skipped_hours": 0,
+    }
+    _, metadata, statistics = add_statistics.call_args_list[0].args
+    assert metadata["statistic_id"] == f"{DOMAIN}:my_car_k0c"
+    assert metadata["name"] == "My Car Engine RPM"
+    assert metadata["unit_of_measurement"] == "rpm"
+    assert statistics[0] == {
+        "start": datetime(2025, 10, 18, 10, tzinfo=timezone.utc),
+        "mean": 1600,
+        "min": 800,
+        "max": 2400,
+    }
+
+
+def test_import_requires_recorder(tmp_path: Path) -> None:
+    """Without the recorder there is nowhere to write statistics to."""
+    importer, hass = _importer(tmp_path)
+    hass.config.components = set()
+
+    with pytest.raises(HomeAssistantError):
+        asyncio.run(importer.async_import(_write_track_log(tmp_path / "trackLog.csv")))
+
+
+def test_scan_imports_and_renames_dropped_files(
+    tmp_path: Path, add_statistics: MagicMock
+) -> None:
+    """Dropped CSV files are imported once and marked as handled."""
+    importer, _ = _importer(tmp_path)
+    drop_folder = tmp_path / "import"
+    drop_folder.mkdir()
+    _write_track_log(drop_folder / "trackLog.csv")
+    (drop_folder / "broken.csv").mkdir()
+
+    asyncio.run(importer.async_scan())
+    asyncio.run(importer.async_scan())
+
+    assert sorted(path.name for path in drop_folder.iterdir()) == [
+        "broken.csv.failed",
+        "trackLog.csv.imported",
+    ]
+    assert add_statistics.call_count == 3
+
+
+def test_import_keeps_hours_the_recorder_has(
+    tmp_path: Path, add_statistics: MagicMock, recorded_hours: AsyncMock
+) -> None:
+    """Hours with existing statistics are not replaced by the import."""
+    importer, _ = _importer(tmp_path)
+    recorded_hours.return_value = {datetime(2025, 10, 18, 10, tzinfo=timezone.utc)}
+
+    result = asyncio.run(importer.async_import(_write_track_log(tmp_path / "trackLog.csv")))
+
+    assert result["hours"] == 3
+    assert result["skipped_hours"] == 2
+    _, _, statistics = add_statistics.call_args_list[0].args
+    assert [row["start"] for row in statistics] == [
+        datetime(2025, 10, 18, 11, tzinfo=timezone.utc)
+    ]
+
+
+def test_import_merges_the_hour_being_aggregated(
+    tmp_path: Path, add_statistics: MagicMock, recorded_hours: AsyncMock
+) -> None:
+    """In statistics-only mode the live hour is merged, not overwritten."""
+    importer, hass = _importer(tmp_path)
+    aggregator = MagicMock()
+    aggregator.async_merge.side_effect = lambda key, start, bucket: (
+        key == "k0c" and start == datetime(2025, 10, 18, 11, tzinfo=timezone.utc).timestamp()
+    )
+    hass.data[DOMAIN]["entry"]["statistics_aggregator"] = aggregator
+    recorded_hours.return_value = {datetime(2025, 10, 18, 11, tzinfo=timezone.utc)}
+
+    result = asyncio.run(importer.async_import(_write_track_log(tmp_path / "trackLog.csv")))
+
+    aggregator.async_merge.assert_any_call(
+        "k0c", datetime(2025, 10, 18, 11, tzinfo=timezone.utc).timestamp(), [1000, 1, 1000, 1000]
+    )
+    _, metadata, statistics = add_statistics.call_args_list[0].args
+    assert metadata["statistic_id"] == f"{DOMAIN}:my_car_k0c"
+    assert [row["start"] for row in statistics] == [
+        datetime(2025, 10, 18, 10, tzinfo=timezone.utc)
+    ]
+    # RPM and speed 10:00 written, RPM 11:00 merged, the other 11:00 hours kept
+    assert result["hours"] == 3
+    assert result["skipped_hours"] == 2
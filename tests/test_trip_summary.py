@@ -0,0 +1,154 @@
+"""Tests for the streaming trip summaries."""
+from __future__ import annotations
+
+import asyncio
+import random
+import statistics
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from homeassistant.core import State
+from homeassistant.helpers.restore_state import RestoreEntity
+
+from custom_components.torque_obd import _numeric_pid_values
+from custom_components.torque_obd.sensor import TorqueTripSummarySensor
+from custom_components.torque_obd.trip_summary import (
+    EVENT_TRIP_SUMMARY,
+    P2Quantile,
+    PidSummary,
+    TorqueTripSummarizer,
+)
+
+
+@pytest.mark.parametrize("quantile", [0.5, 0.95, 0.99])
+def test_p2_quantile_tracks_the_exact_quantile(quantile: float) -> None:
+    """The P² estimate stays close to the exact quantile with five markers."""
+    rng = random.Random(42)
+    values = [rng.gauss(2000, 400) for _ in range(20000)]
+    estimator = P2Quantile(quantile)
+    for value in values:
+        estimator.add(value)
+
+    exact = sorted(values)[int(quantile * (len(values) - 1))]
+    assert estimator.value == pytest.approx(exact, rel=0.02)
+    assert len(estimator._heights) == 5
+
+
+def test_p2_quantile_small_samples() -> None:
+    """With fewer than five values the sorted samples are used."""
+    estimator = P2Quantile(0.5)
+    assert estimator.value is None
+    for value in (3.0, 1.0, 2.0):
+        estimator.add(value)
+    assert estimator.value == 2.0
+
+
+def test_pid_summary_moments() -> None:
+    """Mean and standard deviation match the population statistics."""
+    values = [12.1, 12.6, 13.9, 14.2, 14.1, 13.8, 12.4]
+    summary = PidSummary()
+    for value in values:
+        summary.add(value)
+
+    result = summary.as_dict()
+    assert result["count"] == 7
+    assert result["min"] == 12.1
+    assert result["max"] == 14.2
+    assert result["mean"] == pytest.approx(statistics.fmean(values), abs=1e-4)
+    assert result["stddev"] == pytest.approx(statistics.pstdev(values), abs=1e-4)
+    assert result["p50"] == pytest.approx(13.8, abs=0.5)
+
+
+def test_numeric_pid_values_skips_metadata_and_garbage() -> None:
+    """Only finite numbers of PID keys are summarized, by normalized PID."""
+    payload = {
+        "session": "1",
+        "kc": "2400",
+        "kd": "-",
+        "k5": "nan",
+        "userFullNamec": "Engine RPM",
+        "kff1006": "45.4",
+    }
+
+    assert _numeric_pid_values(payload) == {"k0c": 2400.0}
+
+
+def _summarizer() -> tuple[TorqueTripSummarizer, MagicMock]:
+    hass = MagicMock()
+    return TorqueTripSummarizer(hass, "entry", "My Car", idle_timeout=300), hass
+
+
+def test_new_session_ends_the_trip() -> None:
+    """A different session fires the summary of the previous one."""
+    summarizer, hass = _summarizer()
+    with patch("custom_components.torque_obd.trip_summary.async_dispatcher_send") as send:
+        summarizer.async_record({"session": "1", "time": "1760720540000"}, {"k0c": 800.0})
+        summarizer.async_record({"session": "1", "time": "1760720600000"}, {"k0c": 2400.0})
+        hass.bus.async_fire.assert_not_called()
+
+        summarizer.async_record({"session": "2", "time": "1760721000000"}, {"k0c": 900.0})
+
+    event, summary = hass.bus.async_fire.call_args.args
+    assert event == EVENT_TRIP_SUMMARY
+    assert summary["session"] == "1"
+    assert summary["duration_s"] == 60.0
+    assert summary["payloads"] == 2
+    assert summary["pids"]["k0c"]["mean"] == 1600.0
+    assert send.call_args.args[1:] == ("torque_obd_entry_trip_summary", summary)
+    assert summarizer.last_summary is summary
+
+
+def test_idle_timeout_ends_the_trip() -> None:
+    """A trip ends once no upload was received for the idle timeout."""
+    summarizer, hass = _summarizer()
+    with patch(
+        "custom_components.torque_obd.trip_summary.time.monotonic",
+        side_effect=[1000.0, 1200.0, 1300.0],
+    ), patch("custom_components.torque_obd.trip_summary.async_dispatcher_send"):
+        summarizer.async_record({"session": "1"}, {"k0c": 800.0})
+        summarizer.async_check_idle()
+        hass.bus.async_fire.assert_not_called()
+        summarizer.async_check_idle()
+
+    hass.bus.async_fire.assert_called_once()
+    summarizer.async_check_idle()
+    hass.bus.async_fire.assert_called_once()
+
+
+def test_trip_summary_sensor_restores_only_trip_attributes() -> None:
+    """Only the trip keys of the last state are restored as attributes."""
+    sensor = TorqueTripSummarySensor(MagicMock(), "entry", "Escape")
+    sensor.async_write_ha_state = MagicMock()
+    last_state = State(
+        "sensor.escape_last_trip",
+        "12.5",
+        {
+            "session": "1",
+            "start": "2025-01-01T10:00:00+00:00",
+            "end": "2025-01-01T10:12:30+00:00",
+            "payloads": 750,
+            "friendly_name": "Escape Last Trip",
+            "unit_of_measurement": "min",
+            "icon": "mdi:map-marker-distance",
+            "device_class": "duration",
+        },
+    )
+
+    with patch.object(
+        RestoreEntity, "async_added_to_hass", AsyncMock()
+    ), patch.object(
+        sensor, "async_get_last_state", AsyncMock(return_value=last_state)
+    ), patch(
+        "custom_components.torque_obd.sensor.async_dispatcher_connect"
+    ):
+        asyncio.run(sensor.async_added_to_hass())
+
+    assert sensor.native_value == 12.5
+    assert sensor.extra_state_attributes == {
+        "session": "1",
+        "start": "2025-01-01T10:00:00+00:00",
+        "end": "2025-01-01T10:12:30+00:00",
+        "payloads": 750,
+    }
+    sensor.async_write_ha_state.assert_called_once()
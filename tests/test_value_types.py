@@ -0,0 +1,146 @@
+"""Tests for typed PID value parsing."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.torque_obd import TorqueView, _parse_payload
+from custom_components.torque_obd.const import DOMAIN
+from custom_components.torque_obd.metrics import TorqueIngestMetrics
+from custom_components.torque_obd.value_types import (
+    VALUE_TYPE_LIST,
+    VALUE_TYPE_NUMERIC,
+    VALUE_TYPE_STRING,
+    TorqueValueParser,
+    parse_value,
+    value_type,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("12.5", 12.5),
+        (" -3 ", -3.0),
+        (".5e2", 50.0),
+        (7, 7.0),
+        ("nan", None),
+        ("-Infinity", None),
+        ("1e999", None),
+        ("-", "-"),
+        ("Open loop", "Open loop"),
+        ("1_000", "1_000"),
+        (["42", "x"], 42.0),
+        ([], None),
+        (True, True),
+    ],
+)
+def test_parse_value(value: object, expected: object) -> None:
+    """Numbers become floats, anything else is left as it is."""
+    assert parse_value(value) == expected
+
+
+def test_value_type() -> None:
+    """Single values are classified as numeric, string or list."""
+    assert value_type("12.5") == VALUE_TYPE_NUMERIC
+    assert value_type("nan") == VALUE_TYPE_NUMERIC
+    assert value_type("Closed loop") == VALUE_TYPE_STRING
+    assert value_type(["1", "2"]) == VALUE_TYPE_LIST
+
+
+def test_parser_learns_types_and_counts_malformed_numbers() -> None:
+    """A PID's type is fixed after a few values; bad numbers are counted."""
+    metrics = TorqueIngestMetrics()
+    parser = TorqueValueParser(metrics)
+
+    for _ in range(3):
+        assert parser.parse("k0d", "50") == 50.0
+        assert parser.parse("k03", "Closed loop") == "Closed loop"
+    assert parser.types == {"k0d": VALUE_TYPE_NUMERIC, "k03": VALUE_TYPE_STRING}
+    assert metrics.malformed_values == 0
+
+    # Numeric PIDs give None for values that are not numbers; numbers sent
+    # by text PIDs are parsed
+    assert parser.parse("k0d", "-") is None
+    assert parser.parse("k0d", "inf") is None
+    assert parser.parse("k03", "12") == 12.0
+    assert metrics.malformed_values == 2
+
+
+def test_parser_relearns_a_type_after_consecutive_mismatches() -> None:
+    """A numeric PID learned as text from placeholders becomes numeric again."""
+    parser = TorqueValueParser()
+    for _ in range(3):
+        assert parser.parse("k0c", "-") == "-"
+    assert parser.types == {"k0c": VALUE_TYPE_STRING}
+
+    # Numbers are parsed right away and fix the type once they persist
+    assert parser.parse("k0c", "800") == 800.0
+    assert parser.parse("k0c", "810") == 810.0
+    assert parser.types == {"k0c": VALUE_TYPE_STRING}
+    assert parser.parse("k0c", "820") == 820.0
+    assert parser.parse("k0c", "830") == 830.0
+    assert parser.parse("k0c", "840") == 840.0
+    assert parser.types == {"k0c": VALUE_TYPE_NUMERIC}
+
+    # A single placeholder in between does not change the type
+    assert parser.parse("k0c", "-") is None
+    assert parser.parse("k0c", "850") == 850.0
+    assert parser.parse("k0c", "-") is None
+    assert parser.parse("k0c", "-") is None
+    assert parser.types == {"k0c": VALUE_TYPE_NUMERIC}
+
+
+def test_parser_restarts_learning_when_the_type_changes() -> None:
+    """Only consecutive values of one type fix a PID's type."""
+    parser = TorqueValueParser()
+
+    parser.parse("k0c", "-")
+    parser.parse("k0c", "-")
+    parser.parse("k0c", "800")
+    assert parser.types == {}
+    parser.parse("k0c", "810")
+    parser.parse("k0c", "820")
+    assert parser.types == {"k0c": VALUE_TYPE_NUMERIC}
+
+
+def test_parse_payload_types_only_pid_values() -> None:
+    """PID values are typed; names, units and attributes are left as sent."""
+    payload = {
+        "session": "1760720944365",
+        "time": "1760720979200",
+        "userFullName0d": "Speed",
+        "kd": "42.0",
+        "k3": "Open loop",
+        "kff1006": "45.1",
+    }
+
+    parsed, values = _parse_payload(TorqueValueParser(), payload)
+
+    assert parsed == {**payload, "kd": 42.0, "kff1006": 45.1}
+    assert values == {"k0d": 42.0}
+    assert payload["kd"] == "42.0"
+
+
+def test_ingest_dispatches_typed_values() -> None:
+    """The view parses uploads before they are dispatched to sensors."""
+    hass = MagicMock()
+    listener = MagicMock()
+    hass.data = {
+        DOMAIN: {
+            "routes": {"car": "entry"},
+            "entry": {
+                "vehicle_name": "Car",
+                "key_signatures": {frozenset({"kd", "k3"}): None},
+                "pid_listeners": {"kd": [listener]},
+                "value_parser": TorqueValueParser(),
+            },
+        }
+    }
+    request = MagicMock(method="GET", query={"kd": "12", "k3": "Open loop"}, query_string="")
+
+    asyncio.run(TorqueView(hass)._handle_request(request, "car"))
+
+    listener.assert_called_once_with({"kd": 12.0, "k3": "Open loop"})
@@ -0,0 +1,101 @@
+"""Tests for the torque_obd/subscribe WebSocket stream."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+from custom_components.torque_obd.const import DOMAIN
+from custom_components.torque_obd.history import TorqueHistory
+from custom_components.torque_obd.websocket import (
+    TorqueSubscription,
+    async_end_subscriptions,
+    websocket_subscribe,
+)
+
+
+def test_subscription_sends_only_changed_values() -> None:
+    """Frames carry the PIDs whose value changed since the last frame."""
+    frames: list[dict[str, float]] = []
+
+    async def _run() -> None:
+        subscription = TorqueSubscription(
+            asyncio.get_running_loop(), frames.append, None, min_interval=0
+        )
+        subscription.async_update({"k0c": 800.0, "k0d": 0.0})
+        subscription.async_update({"k0c": 800.0, "k0d": 5.0})
+
+    asyncio.run(_run())
+
+    assert frames == [{"k0c": 800.0, "k0d": 0.0}, {"k0d": 5.0}]
+
+
+def test_subscription_coalesces_between_frames() -> None:
+    """Updates arriving faster than the frame rate are merged, latest wins."""
+    frames: list[dict[str, float]] = []
+
+    async def _run() -> None:
+        subscription = TorqueSubscription(
+            asyncio.get_running_loop(), frames.append, {"k0c"}, min_interval=0.05
+        )
+        subscription.async_update({"k0c": 800.0, "k0d": 0.0})
+        for rpm in (900.0, 1000.0, 1100.0):
+            subscription.async_update({"k0c": rpm})
+        assert frames == [{"k0c": 800.0}]
+        # Well past the trailing frame, so the next update is sent at once
+        await asyncio.sleep(0.2)
+
+        subscription.async_update({"k0c": 1200.0})
+        subscription.async_update({"k0c": 1300.0})
+        subscription.async_cancel()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(_run())
+
+    assert frames == [{"k0c": 800.0}, {"k0c": 1100.0}, {"k0c": 1200.0}]
+
+
+def _subscribe(history: TorqueHistory) -> tuple[dict, MagicMock]:
+    """Subscribe a mocked connection to a vehicle with ``history``."""
+    subscriptions: dict = {}
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"entry": {"history": history, "subscriptions": subscriptions}}}
+    connection = MagicMock()
+    connection.subscriptions = {}
+
+    websocket_subscribe(
+        hass,
+        connection,
+        {"id": 7, "type": f"{DOMAIN}/subscribe", "entry_id": "entry", "max_rate": 5.0},
+    )
+    return subscriptions, connection
+
+
+def test_websocket_subscribe_registers_and_unsubscribes() -> None:
+    """Subscribing sends the latest values and unsubscribing removes the stream."""
+    history = TorqueHistory(60, 5)
+    history.record({"k0c": 800.0})
+    subscriptions, connection = _subscribe(history)
+
+    connection.send_result.assert_called_once_with(7)
+    assert len(subscriptions) == 1
+    event = connection.send_message.call_args.args[0]
+    assert event["id"] == 7
+    assert event["event"] == {"values": {"k0c": 800.0}}
+
+    connection.subscriptions[7]()
+    assert not subscriptions
+
+
+def test_unloading_the_vehicle_ends_its_streams() -> None:
+    """On unload clients get an error instead of a silently stale stream."""
+    subscriptions, connection = _subscribe(TorqueHistory(60, 5))
+    subscription = next(iter(subscriptions))
+    subscription._timer = timer = MagicMock()
+
+    async_end_subscriptions(subscriptions)
+
+    assert not subscriptions
+    assert 7 not in connection.subscriptions
+    timer.cancel.assert_called_once()
+    connection.send_error.assert_called_once()
+    assert connection.send_error.call_args.args[0] == 7